@@ -14,6 +14,7 @@ from .arity import *  # noqa: F401, F403
 from .assignonce import *  # noqa: F401, F403
 from .collections import *  # noqa: F401, F403
 from .conditions import *  # noqa: F401, F403
+from .diskmemo import *  # noqa: F401, F403
 from .dispatch import *  # noqa: F401, F403
 from .dynassign import *  # noqa: F401, F403
 from .ec import *  # noqa: F401, F403
@@ -38,6 +39,7 @@ from .llist import *  # noqa: F401, F403
 from .mathseq import *  # noqa: F401, F403
 from .misc import *  # noqa: F401, F403
 from .seq import *  # noqa: F401, F403
+from .sharedmemo import *  # noqa: F401, F403
 from .singleton import *  # noqa: F401, F403
 from .slicing import *  # noqa: F401, F403
 from .symbol import *  # noqa: F401, F403
@@ -17,6 +17,7 @@ from inspect import signature, Parameter, Signature, ismethod, BoundArguments, _
 import itertools
 import operator
 from typing import Any, Literal
+from weakref import WeakKeyDictionary
 
 # TODO: When floor bumps to 3.12, use `type _FuncKind = ...` (PEP 695).
 _FuncKind = Literal["function", "instancemethod", "classmethod", "staticmethod"]
@@ -416,13 +417,7 @@ def resolve_bindings(f: Callable[..., Any], *args: Any, **kwargs: Any) -> BoundA
     return _resolve_bindings(f, args, kwargs, _partial=False)
 
 def _resolve_bindings(f: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any], *, _partial: bool) -> BoundArguments:
-    thesignature = signature(f)
-    if _partial:
-        bound_arguments = thesignature.bind_partial(*args, **kwargs)
-    else:
-        bound_arguments = thesignature.bind(*args, **kwargs)
-    bound_arguments.apply_defaults()
-    return bound_arguments
+    return _get_binder(f).bind(args, kwargs, partial=_partial)
 
 def tuplify_bindings(bound_arguments: BoundArguments) -> tuple[tuple[str, Any], ...]:
     """Convert the return value of `resolve_bindings` into a hashable form.
@@ -464,6 +459,194 @@ def tuplify_bindings(bound_arguments: BoundArguments) -> tuple[tuple[str, Any],
 
     return tuplify(thearguments)
 
+class _Binder:
+    """Precompiled parameter binder for a callable.
+
+    Equivalent to `inspect.Signature.bind` (or `bind_partial`) followed by
+    `BoundArguments.apply_defaults`, but the signature of the callable is
+    analyzed only once, the first time the binder is used.
+
+    Create one at decoration time with `_Binder(f)`, or get a shared one for
+    any callable with `_get_binder(f)`. A shared binder is analyzed right away,
+    and does not keep a reference to the callable.
+
+    If the given arguments cannot be bound, the binding is re-done with the
+    standard implementation, so that it raises the usual `TypeError`.
+    """
+    __slots__ = ("f", "_signature", "positional", "nposonly", "varargs", "kwonly", "varkw",
+                 "defaults", "parameter_names", "nrequired", "kwonly_required")
+
+    def __init__(self, f: Callable[..., Any]) -> None:
+        self.f = f
+        self._signature: Signature | None = None  # analyzed lazily, so that creating a binder never raises
+
+    @property
+    def signature(self) -> Signature:
+        """The `inspect.Signature` of the callable."""
+        if self._signature is None:
+            self._analyze()
+        return self._signature
+
+    def _analyze(self) -> None:
+        thesignature = signature(self.f)  # may raise, like `inspect.signature` does.
+        positional = []
+        nposonly = 0
+        varargs = None
+        kwonly = []
+        varkw = None
+        defaults = {}
+        for parameter in thesignature.parameters.values():
+            if parameter.kind is Parameter.POSITIONAL_ONLY:
+                positional.append(parameter.name)
+                nposonly += 1
+            elif parameter.kind is Parameter.POSITIONAL_OR_KEYWORD:
+                positional.append(parameter.name)
+            elif parameter.kind is Parameter.VAR_POSITIONAL:
+                varargs = parameter.name
+            elif parameter.kind is Parameter.KEYWORD_ONLY:
+                kwonly.append(parameter.name)
+            else:  # Parameter.VAR_KEYWORD
+                varkw = parameter.name
+            if parameter.default is not Parameter.empty:
+                defaults[parameter.name] = parameter.default
+        self.positional = tuple(positional)
+        self.nposonly = nposonly
+        self.varargs = varargs
+        self.kwonly = tuple(kwonly)
+        self.varkw = varkw
+        self.defaults = defaults
+        self.parameter_names = frozenset(positional[nposonly:] + kwonly)  # bindable by name
+        # Positional parameters with a default come after those without one,
+        # so binding the first `nrequired` positionally binds all required ones.
+        self.nrequired = max((j + 1 for j, name in enumerate(positional) if name not in defaults), default=0)
+        self.kwonly_required = tuple(name for name in kwonly if name not in defaults)
+        self._signature = thesignature
+
+    def arguments(self, args: tuple[Any, ...], kwargs: dict[str, Any], *, partial: bool = False) -> dict[str, Any]:
+        """Bind `args` and `kwargs`, and return the `arguments` dict of the resulting bindings.
+
+        The result is the same as `inspect.BoundArguments.arguments` after `apply_defaults`.
+        """
+        if self._signature is None:
+            self._analyze()
+        positional = self.positional
+        npositional = len(positional)
+        if len(args) > npositional and self.varargs is None:
+            return self._fallback(args, kwargs, partial)
+
+        bound = dict(zip(positional, args))
+        extra_kwargs = {}
+        if kwargs:
+            parameter_names = self.parameter_names
+            for name, value in kwargs.items():
+                if name in parameter_names and name not in bound:
+                    bound[name] = value
+                elif self.varkw is not None and name not in parameter_names and name not in positional:
+                    extra_kwargs[name] = value
+                else:  # multiple values, unexpected kwarg, or positional-only parameter passed by name
+                    return self._fallback(args, kwargs, partial)
+
+        # Build the result in parameter order, as `apply_defaults` does.
+        defaults = self.defaults
+        arguments = {}
+        for name in positional:
+            if name in bound:
+                arguments[name] = bound[name]
+            elif name in defaults:
+                arguments[name] = defaults[name]
+            elif not partial:
+                return self._fallback(args, kwargs, partial)
+        if self.varargs is not None:
+            arguments[self.varargs] = args[npositional:]
+        for name in self.kwonly:
+            if name in bound:
+                arguments[name] = bound[name]
+            elif name in defaults:
+                arguments[name] = defaults[name]
+            elif not partial:
+                return self._fallback(args, kwargs, partial)
+        if self.varkw is not None:
+            arguments[self.varkw] = extra_kwargs
+        return arguments
+
+    def saturated(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> bool:
+        """Return whether `args` and `kwargs` bind all parameters, with nothing left over.
+
+        That is, whether `arguments(args, kwargs)` would succeed without falling back
+        to the standard implementation. This builds no bindings, so it is cheap.
+        """
+        if self._signature is None:
+            self._analyze()
+        positional = self.positional
+        nargs = len(args)
+        if nargs > len(positional) and self.varargs is None:
+            return False
+        if not kwargs:
+            return nargs >= self.nrequired and not self.kwonly_required
+        parameter_names = self.parameter_names
+        bound = set(positional[:nargs])
+        for name in kwargs:
+            if name in parameter_names and name not in bound:
+                bound.add(name)
+            elif not (self.varkw is not None and name not in parameter_names and name not in positional):
+                return False
+        defaults = self.defaults
+        return (all(name in bound or name in defaults for name in positional[nargs:]) and
+                all(name in bound for name in self.kwonly_required))
+
+    def _fallback(self, args: tuple[Any, ...], kwargs: dict[str, Any], partial: bool) -> dict[str, Any]:
+        # Let the standard implementation handle (and usually, raise on) the cases we didn't.
+        if partial:
+            bound_arguments = self.signature.bind_partial(*args, **kwargs)
+        else:
+            bound_arguments = self.signature.bind(*args, **kwargs)
+        bound_arguments.apply_defaults()
+        return bound_arguments.arguments
+
+    def bind(self, args: tuple[Any, ...], kwargs: dict[str, Any], *, partial: bool = False) -> BoundArguments:
+        """Like `resolve_bindings` (or `resolve_bindings_partial`), but with precompiled analysis."""
+        arguments = self.arguments(args, kwargs, partial=partial)
+        return BoundArguments(self.signature, arguments)
+
+    def key(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
+        """Like `tuplify_bindings(resolve_bindings(f, *args, **kwargs))`, but faster.
+
+        Useful as a memo key.
+        """
+        arguments = self.arguments(args, kwargs)
+        if self.varkw is not None:
+            arguments[self.varkw] = tuple(arguments[self.varkw].items())
+        return tuple(arguments.items())
+
+# Shared binders, for callers that don't keep their own. Weak keys, so that
+# we don't keep alive e.g. closures that were only ever called a few times.
+_binders: WeakKeyDictionary = WeakKeyDictionary()
+_method_binders: WeakKeyDictionary = WeakKeyDictionary()
+
+def _get_binder(f: Callable[..., Any]) -> _Binder:
+    """Return a `_Binder` for callable `f`, reusing a previously created one if possible."""
+    # A bound method is a new object each time it is looked up, but its signature
+    # is determined by the underlying function, so cache on that instead.
+    if ismethod(f):
+        cache, k = _method_binders, f.__func__
+    else:
+        cache, k = _binders, f
+    try:
+        return cache[k]
+    except KeyError:
+        binder = _Binder(f)
+        try:
+            binder._analyze()
+        except (TypeError, ValueError):  # no signature; raise when the binder is used, like an uncached one
+            return binder
+        # Drop the reference to `f`, so that the binder does not keep alive the weak
+        # key of the cache (or, for a bound method, the instance it is bound to).
+        binder.f = None
+        cache[k] = binder
+        return binder
+    except TypeError:  # unhashable, or not weakly referenceable (e.g. a builtin)
+        return _Binder(f)
+
 # This is `inspect.Signature._bind` from Python 3.14, modified for our purposes so we can determine
 # unbound *and extra* arguments (both positional and by-name) without raising a `TypeError`.
 # We need this for kwargs support in `curry`, because we want to pass through unmatched args and kwargs
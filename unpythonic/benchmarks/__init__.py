@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for performance-critical parts of ``unpythonic``.
+
+These are development tools, not part of the public API, and are not included
+in the distribution. Run them from the top level of the source tree.
+
+The loop and TCO benchmarks are run by a common runner, which reports time,
+memory retained, and peak memory per case, and can save and compare JSON
+baselines; see ``unpythonic.benchmarks.runner``::
+
+    python -m unpythonic.benchmarks --help
+
+Other benchmarks are standalone modules, e.g.::
+
+    python -m unpythonic.benchmarks.dispatch
+"""
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""Run the benchmark suites. See ``unpythonic.benchmarks.runner``."""
+
+import sys
+
+from .runner import main
+
+sys.exit(main())
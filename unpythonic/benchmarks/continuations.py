@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the per-iteration cost of the ``tco`` and ``continuations`` macros.
+
+Like in ``unpythonic.benchmarks.loops``, each case sums ``range(n)``.
+
+This module uses macros, so it must be imported with ``mcpyrate`` active.
+The benchmark runner takes care of that::
+
+    python -m unpythonic.benchmarks continuations
+"""
+
+from ..syntax import macros, tco, continuations, call_cc  # noqa: F401
+
+def expected(n):
+    """The result each case must produce."""
+    return n * (n - 1) // 2
+
+def tco_def(n):
+    with tco:
+        def count(i, acc):
+            if i == n:
+                return acc
+            return count(i + 1, acc + i)
+    return lambda: count(0, 0)
+
+def tco_selfloops(n):
+    with tco[selfloops]:  # noqa: F821, `selfloops` is a macro option.
+        def count(i, acc):
+            if i == n:
+                return acc
+            return count(i + 1, acc + i)
+    return lambda: count(0, 0)
+
+def call_cc_chain(n):
+    # One `call_cc` per iteration; the rest of `count` is the continuation.
+    with continuations:
+        def succ(i, cc):
+            return i + 1
+        def count(i, acc):
+            if i == n:
+                return acc
+            j = call_cc[succ(i)]
+            return count(j, acc + i)
+    return lambda: count(0, 0)
+
+cases = {"tco": tco_def,
+         "tco_selfloops": tco_selfloops,
+         "call_cc": call_cc_chain}
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the per-iteration cost of TCO and FP loop constructs.
+
+Each case sums ``range(n)``, so the work done per iteration is the same, and
+what is measured is the overhead of the looping construct. The plain Python
+``for`` and ``while`` loops are the reference.
+
+Run via the benchmark runner::
+
+    python -m unpythonic.benchmarks loops
+"""
+
+from ..dynassign import dyn
+import operator
+
+from ..fploop import looped, breakably_looped, looped_over, fast_looped_over
+from ..gtco import gtco, gtrampolined
+from ..tco import trampolined, jump
+
+def expected(n):
+    """The result each case must produce."""
+    return n * (n - 1) // 2
+
+def python_for(n):
+    def run():
+        acc = 0
+        for i in range(n):
+            acc += i
+        return acc
+    return run
+
+def python_while(n):
+    def run():
+        acc = 0
+        i = 0
+        while i < n:
+            acc += i
+            i += 1
+        return acc
+    return run
+
+def _make_trampolined(n):
+    @trampolined
+    def count(i, acc):
+        if i == n:
+            return acc
+        return jump(count, i + 1, acc + i)
+    return lambda: count(0, 0)
+
+def trampolined_strict(n):
+    return _make_trampolined(n)
+
+def trampolined_lazy(n):
+    # The lazify-aware trampoline, as built for code inside a `with lazify` block.
+    with dyn.let(_build_lazy_trampoline=True):
+        return _make_trampolined(n)
+
+def fploop_looped(n):
+    def run():
+        @looped
+        def result(loop, i=0, acc=0):
+            if i == n:
+                return acc
+            return loop(i + 1, acc + i)
+        return result
+    return run
+
+def fploop_breakably_looped(n):
+    def run():
+        @breakably_looped
+        def result(loop, brk, i=0, acc=0):
+            if i == n:
+                return brk(acc)
+            return loop(i + 1, acc + i)
+        return result
+    return run
+
+def fploop_looped_over(n):
+    def run():
+        @looped_over(range(n), acc=0)
+        def result(loop, x, acc):
+            return loop(acc + x)
+        return result
+    return run
+
+def fploop_fast_looped_over(n):
+    def run():
+        @fast_looped_over(range(n), acc=0)
+        def result(loop, x, acc):
+            return loop(acc + x)
+        return result
+    return run
+
+def fploop_fast_looped_over_reduction(n):
+    return lambda: fast_looped_over(range(n), acc=0)(operator.add)
+
+def gtco_chain(n):
+    # Each iteration yields one item, and tail-chains to a new generator.
+    def gen(i):
+        yield i
+        if i + 1 < n:
+            return gen(i + 1)
+    return lambda: sum(gtco(gen(0)))
+
+def gtrampolined_chain(n):
+    # Like `gtco_chain`, but each generator hands off to a `@gtrampolined` one.
+    @gtrampolined
+    def gen(i):
+        yield i
+        if i + 1 < n:
+            return gen(i + 1)
+    return lambda: sum(gen(0))
+
+def gtrampolined_flat_chain(n):
+    @gtrampolined(flat=True)
+    def gen(i):
+        yield i
+        if i + 1 < n:
+            return gen(i + 1)
+    return lambda: sum(gen(0))
+
+cases = {"python_for": python_for,
+         "python_while": python_while,
+         "trampolined": trampolined_strict,
+         "trampolined_lazy": trampolined_lazy,
+         "looped": fploop_looped,
+         "breakably_looped": fploop_breakably_looped,
+         "looped_over": fploop_looped_over,
+         "fast_looped_over": fploop_fast_looped_over,
+         "fast_looped_over_reduction": fploop_fast_looped_over_reduction,
+         "gtco": gtco_chain,
+         "gtrampolined": gtrampolined_chain,
+         "gtrampolined_flat": gtrampolined_flat_chain}
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Benchmark runner: per-iteration cost, memory use, and JSON baselines.
+
+A *suite* is a module in this package that has a ``cases`` dictionary,
+``{name: setup}``. Calling ``setup(n)`` prepares a case, and returns a
+zero-argument function that runs ``n`` iterations and returns the result.
+If the suite has a function ``expected(n)``, each result is checked against it.
+
+For each case, we report:
+
+  - Time per iteration, best of several runs, with the garbage collector
+    disabled during timing (like ``timeit`` does).
+
+  - Memory retained per iteration, in bytes, as traced by ``tracemalloc``.
+    This should be zero; anything else is a leak, or a cache filling up.
+
+  - Peak memory traced during one run, above what was allocated before it.
+    A construct that builds up stack-like state per iteration shows here.
+
+``tracemalloc`` only tracks live memory blocks, so allocations that are freed
+within the same iteration show up in the peak, not as a count.
+
+Results can be saved as a JSON baseline, and a later run can be compared
+against it, to catch regressions between releases. Baselines are specific to
+the machine and the Python version they were recorded on.
+
+Usage::
+
+    python -m unpythonic.benchmarks                     # run all suites
+    python -m unpythonic.benchmarks loops               # run one suite
+    python -m unpythonic.benchmarks 'loops.looped*'     # run matching cases
+    python -m unpythonic.benchmarks --save base.json    # record a baseline
+    python -m unpythonic.benchmarks --compare base.json # compare against it
+
+With ``--compare``, the exit status is nonzero if any case is slower than
+in the baseline by more than the tolerance.
+"""
+
+import argparse
+import fnmatch
+import gc
+import importlib
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+suites = ("loops", "continuations")
+
+def collect_cases(patterns=()):
+    """Return a list of ``(fullname, setup, expected)`` for cases matching any of `patterns`.
+
+    A pattern may be a suite name, or an ``fnmatch`` pattern matched against
+    ``suite.case``. No patterns means all cases.
+    """
+    import mcpyrate.activate  # noqa: F401, some suites use macros.
+    out = []
+    for suite in suites:
+        module = importlib.import_module(f"{__package__}.{suite}")
+        expected = getattr(module, "expected", None)
+        for name, setup in module.cases.items():
+            fullname = f"{suite}.{name}"
+            if patterns and not any(pattern == suite or fnmatch.fnmatchcase(fullname, pattern)
+                                    for pattern in patterns):
+                continue
+            out.append((fullname, setup, expected))
+    return out
+
+def measure(setup, n, *, repeat=5, expected=None):
+    """Measure one case. Return a `dict` of the results.
+
+    `n`: iterations per run.
+    `repeat`: number of timed runs; the best one is reported.
+    `expected`: optional function, `expected(n)` is the correct result.
+    """
+    run = setup(n)
+    result = run()  # warm up, and check
+    if expected is not None and result != expected(n):
+        raise AssertionError(f"expected {expected(n)!r}, got {result!r}")
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter_ns()
+            run()
+            times.append(time.perf_counter_ns() - t0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        run()
+        gc.collect()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"ns_per_iter": min(times) / n,
+            "retained_bytes_per_iter": (after - before) / n,
+            "peak_bytes": peak - before}
+
+def run_cases(cases, n, *, repeat=5, out=sys.stdout):
+    """Measure each of `cases` (as returned by `collect_cases`), printing progress. Return the results."""
+    results = {}
+    for fullname, setup, expected in cases:
+        results[fullname] = measure(setup, n, repeat=repeat, expected=expected)
+        r = results[fullname]
+        print(f"{fullname:<36} {r['ns_per_iter']:>12.1f} {r['retained_bytes_per_iter']:>12.2f} {r['peak_bytes'] / 1024:>10.1f}",
+              file=out)
+    return results
+
+def make_baseline(results, n):
+    """Wrap `results` into a JSON-serializable baseline, with information on the environment."""
+    from .. import __version__
+    return {"unpythonic": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "iterations": n,
+            "results": results}
+
+def compare(results, baseline, *, tolerance=0.25, out=sys.stdout):
+    """Compare `results` against a `baseline` (as made by `make_baseline`).
+
+    Print the ratio of time per iteration for each case present in both.
+    Return the names of the cases slower than the baseline by more than `tolerance`
+    (a fraction; e.g. 0.25 means 25% slower).
+    """
+    old = baseline["results"]
+    print(f"\nCompared to baseline (unpythonic {baseline['unpythonic']}, "
+          f"{baseline['implementation']} {baseline['python']}):", file=out)
+    regressions = []
+    for fullname, r in results.items():
+        if fullname not in old:
+            print(f"{fullname:<36} (not in baseline)", file=out)
+            continue
+        ratio = r["ns_per_iter"] / old[fullname]["ns_per_iter"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(fullname)
+        print(f"{fullname:<36} {ratio:>8.2f}x{flag}", file=out)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m unpythonic.benchmarks",
+                                     description="Measure the per-iteration cost of unpythonic's looping constructs.")
+    parser.add_argument("patterns", nargs="*", metavar="PATTERN",
+                        help="suite name, or fnmatch pattern for 'suite.case' (default: all)")
+    parser.add_argument("-n", "--iterations", type=int, default=100000,
+                        help="iterations per run (default: %(default)s)")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="timed runs per case; the best is reported (default: %(default)s)")
+    parser.add_argument("--list", action="store_true",
+                        help="list the cases and exit")
+    parser.add_argument("--save", metavar="FILE",
+                        help="save the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="compare the results against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="with --compare, slowdown that counts as a regression (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    cases = collect_cases(args.patterns)
+    if args.list:
+        for fullname, _, _ in cases:
+            print(fullname)
+        return 0
+
+    print(f"{'case':<36} {'ns/iter':>12} {'retained B':>12} {'peak KiB':>10}")
+    results = run_cases(cases, args.iterations, repeat=args.repeat)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(make_baseline(results, args.iterations), f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, tolerance=args.tolerance):
+            return 1
+    return 0
@@ -10,11 +10,11 @@ from ...test.fixtures import session, testset
 from ...syntax import macros, continuations, call_cc, tco  # noqa: F401, F811
 from ...syntax import macros, monadic_do  # noqa: F401, F811
 from ...monads import Maybe, Writer, List
+from ...fun import iscurried
 from ...funutil import Values
 from ...misc import timer
 
 from math import sqrt
-from types import FunctionType
 from operator import add, mul
 
 def runtests():
@@ -26,9 +26,10 @@ def runtests():
             return a + b + c
 
         a = add3(1)
-        test[isinstance(the[a], FunctionType)]
+        test[iscurried(the[a]) and callable(a)]
+        test[a.__name__ == "add3"]
         a = a(2)
-        test[isinstance(the[a], FunctionType)]
+        test[iscurried(the[a]) and callable(a)]
         a = a(3)
         test[isinstance(the[a], int)]
 
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""Persistent memo storage on disk, for `memoize`, `gmemoize` and `fimemoize`.
+
+A *memo store* is any object that has the `dict` methods `__getitem__` (raising
+`KeyError` for a missing key), `__setitem__`, `__len__` and `clear`. A plain
+`dict` is one. This module provides one that keeps the memo in files, so that
+memoized results survive restarts of the program, and can be shared between
+processes on the same machine.
+"""
+
+__all__ = ["DiskMemo"]
+
+from contextlib import contextmanager
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import threading
+from typing import Any, Iterator
+import weakref
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover, not a POSIX system
+    fcntl = None
+
+# Index file: header, then a hash table of `capacity` slots, with linear probing.
+# Each slot is (key hash, log offset + 1); an offset of 0 marks an empty slot.
+_INDEX_MAGIC = b"UNPYMIDX"
+_index_header = struct.Struct("<8sQQ")  # magic, capacity, count
+_slot = struct.Struct("<QQ")
+# Log file: magic, then records of (key length, value length, key, value).
+_LOG_MAGIC = b"UNPYMLOG"
+_record_header = struct.Struct("<II")
+
+_KEY_PROTOCOL = 4  # fixed, so that the same key always serializes the same way
+
+def _keyhash(k: Any) -> tuple[bytes, int]:
+    """Serialize memo key `k`, and hash it. Return `(keybytes, hash)`.
+
+    The hash is stable across runs of the program and across processes,
+    unlike the builtin `hash`.
+    """
+    keybytes = pickle.dumps(k, protocol=_KEY_PROTOCOL)
+    h = int.from_bytes(hashlib.blake2b(keybytes, digest_size=8).digest(), "little")
+    return keybytes, h
+
+class DiskMemo:
+    """A memo store that keeps the memo on disk.
+
+    Usage::
+
+        from unpythonic import memoize, DiskMemo
+
+        @memoize(store=DiskMemo("cache/expensive"))
+        def expensive(x):
+            ...
+
+    `path`: Base path of the files. The store consists of two files, `path + ".log"`
+            and `path + ".idx"`, created if they do not exist. If they do exist,
+            the memo is loaded from them.
+
+    `serializer`: An object with the functions `dumps(obj) -> bytes` and `loads(bytes) -> obj`,
+                  used for the values. Default is the `pickle` module.
+
+    `capacity`: Initial number of slots in the index. The index grows automatically.
+
+    The values are appended to a log file, and never overwritten. The index file
+    is a hash table mapping a stable hash of each key to the position of its latest
+    value in the log. The index is memory-mapped, so a lookup reads one slot (or a
+    few, on a hash collision) and one record from the log.
+
+    Keys are serialized with `pickle` for hashing, so they must be picklable, and
+    for a key to be found again in another run of the program, it must serialize
+    to the same bytes (true of e.g. numbers, strings, and tuples of them). The full
+    serialized key is stored too, and compared on lookup, so hash collisions cannot
+    return a wrong value.
+
+    Several processes on the same machine can use the same files at the same time;
+    access is serialized with `fcntl.flock`. (On systems without `fcntl`, only
+    threads of one process are serialized.)
+
+    Use a separate store for each memoized function, since the memo keys do not
+    identify the function.
+
+    To reclaim the space taken by superseded values, `clear` the store.
+
+    Close the store with `close` when done, or use it as a context manager.
+    A store that is garbage collected without being closed closes its files then.
+    """
+    def __init__(self, path: str, *, serializer: Any = pickle, capacity: int = 1024) -> None:
+        if capacity < 1 or capacity & (capacity - 1):
+            raise ValueError(f"`capacity` must be a positive power of two, got {capacity}")
+        self.path = path
+        self.serializer = serializer
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()  # `flock` does not serialize threads of the same process
+        # Unbuffered, so that we always see what other processes have written.
+        self._log = open(path + ".log", "a+b", buffering=0)  # noqa: SIM115 -- stays open until `close()`
+        self._index_fd = os.open(path + ".idx", os.O_RDWR | os.O_CREAT, 0o644)
+        self._index = None
+        self._finalizer = weakref.finalize(self, _close_files, self._log, self._index_fd, None)
+        with self._locked(exclusive=True, remap=False):
+            if os.fstat(self._log.fileno()).st_size == 0:
+                self._log.write(_LOG_MAGIC)
+            if os.fstat(self._index_fd).st_size == 0:
+                os.ftruncate(self._index_fd, _index_header.size + capacity * _slot.size)
+                self._map()
+                _index_header.pack_into(self._index, 0, _INDEX_MAGIC, capacity, 0)
+            else:
+                self._map()
+                if self._index[:len(_INDEX_MAGIC)] != _INDEX_MAGIC:
+                    raise ValueError(f"{path}.idx is not a DiskMemo index file")
+
+    def __repr__(self) -> str:
+        return f"<DiskMemo at {self.path!r}>"
+
+    def close(self) -> None:
+        """Close the files. The store cannot be used after this."""
+        with self._lock:
+            if self._index is not None:
+                self._index = None
+                self._finalizer()
+
+    def __enter__(self) -> "DiskMemo":
+        return self
+
+    def __exit__(self, exctype: Any, excvalue: Any, traceback: Any) -> None:
+        self.close()
+
+    # --------------------------------------------------------------------------------
+    # The memo store API
+
+    def __getitem__(self, k: Any) -> Any:
+        keybytes, h = self._hash(k)
+        with self._locked(exclusive=False):
+            _, offset, value = self._find(keybytes, h)
+            if offset is None:
+                raise KeyError(k)
+        return self.serializer.loads(value)
+
+    def __setitem__(self, k: Any, value: Any) -> None:
+        keybytes, h = self._hash(k)
+        valuebytes = self.serializer.dumps(value)
+        with self._locked(exclusive=True):
+            j, offset, _ = self._find(keybytes, h, read_value=False)
+            _, capacity, count = _index_header.unpack_from(self._index, 0)
+            isnew = offset is None
+            if isnew and 2 * (count + 1) > capacity:  # keep the load factor at most 1/2
+                self._grow(2 * capacity)
+                j, _, _ = self._find(keybytes, h, read_value=False)
+            offset = self._log.seek(0, os.SEEK_END)
+            self._log.write(_record_header.pack(len(keybytes), len(valuebytes)) + keybytes + valuebytes)
+            # Update the index only after the record is complete.
+            _slot.pack_into(self._index, _index_header.size + j * _slot.size, h, offset + 1)
+            if isnew:
+                _index_header.pack_into(self._index, 0, _INDEX_MAGIC, self._capacity(), count + 1)
+
+    def __contains__(self, k: Any) -> bool:
+        keybytes, h = self._hash(k)
+        with self._locked(exclusive=False):
+            _, offset, _ = self._find(keybytes, h, read_value=False)
+        return offset is not None
+
+    def __len__(self) -> int:
+        with self._locked(exclusive=False):
+            _, _, count = _index_header.unpack_from(self._index, 0)
+        return count
+
+    def clear(self) -> None:
+        """Delete all entries, and truncate the log."""
+        with self._locked(exclusive=True):
+            self._log.truncate(len(_LOG_MAGIC))
+            capacity = self._capacity()
+            self._index[_index_header.size:] = bytes(capacity * _slot.size)
+            _index_header.pack_into(self._index, 0, _INDEX_MAGIC, capacity, 0)
+
+    # --------------------------------------------------------------------------------
+    # Internal
+
+    def _hash(self, k: Any) -> tuple[bytes, int]:
+        return _keyhash(k)
+
+    def _capacity(self) -> int:
+        _, capacity, _ = _index_header.unpack_from(self._index, 0)
+        return capacity
+
+    @contextmanager
+    def _locked(self, exclusive: bool, remap: bool = True) -> Iterator[None]:
+        with self._lock:
+            if self._index is None and remap:
+                raise ValueError(f"{self!r} is closed")
+            if fcntl is not None:
+                fcntl.flock(self._index_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                # Another process may have grown the index since we last looked.
+                if remap and _index_header.size + self._capacity() * _slot.size > len(self._index):
+                    self._map()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._index_fd, fcntl.LOCK_UN)
+
+    def _map(self) -> None:
+        if self._index is not None:
+            self._index.close()
+        self._index = mmap.mmap(self._index_fd, os.fstat(self._index_fd).st_size)
+        # The finalizer must close the current map, so register it again.
+        self._finalizer.detach()
+        self._finalizer = weakref.finalize(self, _close_files, self._log, self._index_fd, self._index)
+
+    def _find(self, keybytes: bytes, h: int, read_value: bool = True) -> tuple[int | None, int | None, bytes | None]:
+        """Look up a key. Return `(slot, offset, value)`.
+
+        If the key is not in the index, `offset` and `value` are `None`,
+        and `slot` is the empty slot where it would go.
+        """
+        index = self._index
+        mask = self._capacity() - 1
+        j = h & mask
+        while True:
+            slot_hash, offset = _slot.unpack_from(index, _index_header.size + j * _slot.size)
+            if offset == 0:
+                return j, None, None
+            if slot_hash == h:
+                self._log.seek(offset - 1)
+                keylen, valuelen = _record_header.unpack(self._log.read(_record_header.size))
+                if self._log.read(keylen) == keybytes:
+                    value = self._log.read(valuelen) if read_value else None
+                    return j, offset - 1, value
+            j = (j + 1) & mask
+
+    def _grow(self, capacity: int) -> None:
+        """Rebuild the index with `capacity` slots."""
+        index = self._index
+        old_capacity = self._capacity()
+        entries = [_slot.unpack_from(index, _index_header.size + j * _slot.size) for j in range(old_capacity)]
+        # A mapped file cannot be resized on Windows, so unmap it first.
+        index.close()
+        self._index = None
+        os.ftruncate(self._index_fd, _index_header.size + capacity * _slot.size)
+        self._map()
+        index = self._index
+        index[_index_header.size:] = bytes(capacity * _slot.size)
+        _, _, count = _index_header.unpack_from(index, 0)
+        _index_header.pack_into(index, 0, _INDEX_MAGIC, capacity, count)
+        mask = capacity - 1
+        for slot_hash, offset in entries:
+            if offset == 0:
+                continue
+            j = slot_hash & mask
+            while _slot.unpack_from(index, _index_header.size + j * _slot.size)[1] != 0:
+                j = (j + 1) & mask
+            _slot.pack_into(index, _index_header.size + j * _slot.size, slot_hash, offset)
+
+def _close_files(log: Any, index_fd: int, index: mmap.mmap | None) -> None:
+    """Close the files of a `DiskMemo`. Its finalizer; also called by `close`."""
+    if index is not None:
+        index.close()
+    os.close(index_fd)
+    log.close()
@@ -24,19 +24,29 @@ Here the implementations are given in the multimethod bodies.
 # TODO: OTOH, `singledispatch` does handle the specific case of ABCs, via the subtype hooks.
 
 __all__ = ["isgeneric", "generic", "augment", "typed",
-           "methods", "format_methods", "list_methods"]
+           "methods", "format_methods", "list_methods",
+           "enable_dispatch_stats", "disable_dispatch_stats", "dispatch_stats"]
 
+import abc
 from functools import partial, wraps
 from itertools import chain
 import inspect
+from time import perf_counter_ns
+import types
 import typing
 
 from .arity import getfunc, _resolve_bindings
-from .typecheck import isoftype
+from .misc import safeissubclass
+from .typecheck import isoftype, compile_typecheck, _is_type_determined
 from .regutil import register_decorator
 
 _dispatcher_registry = {}
 
+# Bumped whenever a multimethod is registered anywhere. Dispatch caches compare
+# against this, so that a registration invalidates also the caches of dispatchers
+# that see the new multimethod only indirectly, through an OOP MRO lookup.
+_registration_generation = 0
+
 # Not strictly part of "the" public API, but stealthily public (with the usual
 # public-API guarantees) because, although unlikely, an occasional user may
 # need to customize this.
@@ -73,7 +83,7 @@ def isgeneric(f):
 # TODO: dispatcher to connect that to, other than having a registry that maps the
 # TODO: fullname of each already-existing generic function to its dispatcher object.
 @register_decorator(priority=98)
-def generic(f):
+def generic(f=None, *, compiled=False, specificity=False):
     """Decorator. Make `f` a generic function (in the sense of CLOS or Julia).
 
     Multiple dispatch solves *the expression problem*:
@@ -171,13 +181,72 @@ def generic(f):
           Note the key type for the `**kwargs` dict is always `str`.
 
     **The first multimethod that matches wins, in most-recently-registered order.**
-    (This is unlike in Julia, which matches the most specific applicable multimethod.)
+    (This is unlike in Julia, which matches the most specific applicable multimethod.
+    For that, see *Most-specific dispatch* below.)
 
     In other words, later multimethod definitions override earlier ones. So specify
     the implementation with the most generic types first, and then move on to the
     more specific ones. The mnemonic is, "the function is generally defined like
     this, except if the arguments match these particular types..."
 
+    Each generic function caches its dispatch decisions, keyed on the concrete
+    types of the arguments and the shape of the argument list. When all
+    multimethods tried for a given call have only plain classes (or `typing.Any`)
+    in their type signatures, later calls with the same argument types skip the
+    lookup entirely. Parametric specifications such as `List[int]` are always
+    checked against the actual values, because the concrete type `list` alone
+    does not determine a match. Registering a new multimethod empties the cache.
+
+    **Compiled dispatch**:
+
+    By default, on a cache miss the dispatcher tries the multimethods one by one,
+    so the cost of a lookup grows as O(methods × params). For generic functions
+    with many multimethods, use `@generic(compiled=True)` instead of `@generic`.
+    This enables the compiled mode for the whole generic function; it is enough
+    to say so on any one of its definitions.
+
+    In compiled mode, the dispatcher builds a discrimination index from the type
+    signatures of the multimethods: for each shape of argument list, which
+    multimethods accept it, and for each argument position, which multimethods
+    accept an argument of a given concrete type. A lookup then intersects one
+    precomputed set per argument, which costs about O(params). The semantics
+    are the same; the first match still wins.
+
+    Parameters whose type specification is not a plain class or a `Union` of
+    plain classes (e.g. `List[int]`, `Literal[...]`, or a `*args` parameter)
+    cannot be indexed by type; multimethods that have any such parameters are
+    checked in full, as in the default mode, if they remain candidates after
+    the indexed parameters have been checked.
+
+    **Most-specific dispatch**:
+
+    With `@generic(specificity=True)`, the most specific matching multimethod wins,
+    regardless of registration order. Like the compiled mode, this applies to the
+    whole generic function, and it is enough to say so on any one of its definitions.
+
+    Multimethod A is more specific than B, if A and B have the same shape of
+    parameter list (the same kinds of parameters, in the same order, and the same
+    keyword-only parameter names), and each parameter type of A is a subtype of
+    the corresponding parameter type of B, but not the other way around. For
+    example, `bool` is more specific than `int`, `List[int]` more specific than
+    `Sequence[int]` or `List[Any]`, and everything more specific than `Any`.
+    The subtype analysis is conservative; when it cannot tell, the types are
+    considered unrelated. Unrelated multimethods (including ones with different
+    parameter lists) are tried in most-recently-registered order.
+
+    The ordering is computed when a multimethod is registered, so calls pay
+    nothing extra for it. The first match in that order is the most specific
+    one: any multimethod more specific than it was tried before, and did not match.
+
+    On OOP methods, the ordering applies to the multimethods of each class
+    separately; the classes are still tried in MRO order.
+
+    **Profiling**:
+
+    To see which multimethods win, how often the dispatch cache hits, and how
+    much time goes into resolution versus the multimethod bodies, see
+    `enable_dispatch_stats` and `dispatch_stats`.
+
     **Differences to tools in the standard library**:
 
     Unlike in `functools.singledispatch`, there is no "master" definition and
@@ -239,7 +308,9 @@ def generic(f):
     because all arguments of each function call will be wrapped in a promise
     (`unpythonic.lazyutil.Lazy`) that carries no type information on its contents.
     """
-    return _setup(_function_fullname(f), f)
+    if f is None:  # parametric form, `@generic(compiled=...)`
+        return partial(generic, compiled=compiled, specificity=specificity)
+    return _setup(_function_fullname(f), f, compiled=compiled, specificity=specificity)
 
 @register_decorator(priority=98)
 def augment(target):
@@ -291,7 +362,7 @@ def augment(target):
     return partial(_setup, _function_fullname(target))
 
 @register_decorator(priority=98)
-def typed(f):
+def typed(f=None, *, policy=None):
     """Decorator. Restrict allowed argument types to one combination only.
 
     This can be used to eliminate `isinstance` boilerplate code in the
@@ -304,14 +375,31 @@ def typed(f):
     Once a `@typed` function has been created, no more multimethods can be
     attached to it.
 
+    Calls that pass all arguments positionally take a fast path: the type
+    checks for each parameter are compiled when the function is created, and
+    when they pass, the function is called directly. Only other calls (using
+    keyword arguments, or failing the type check) go through the general
+    multiple-dispatch machinery, which also produces the error message.
+
+    `policy`: `unpythonic.typecheck.CheckPolicy`, how much of container arguments
+              (such as a `List[int]`) to check against the element type. For example,
+              `@typed(policy=CheckPolicy("first", k=10))` checks the first 10 elements.
+              If `None` (default), use the dynvar `typecheck_policy`, which by default
+              checks every element.
+
     **CAUTION**:
 
     Code using the `with lazify` macro cannot usefully use `@generic` or `@typed`,
     because all arguments of each function call will be wrapped in a promise
     (`unpythonic.lazyutil.Lazy`) that carries no type information on its contents.
     """
-    s = generic(f)
+    if f is None:
+        return partial(typed, policy=policy)
+    s = _setup(_function_fullname(f), f, _typed=True)
     del s._register  # remove the ability to register more methods
+    s._typecheck_policy = policy
+    if hasattr(s, "_fastpath"):
+        s._fastpath = _make_typed_fastpath(*s._method_registry[0], policy)
     return s
 
 def methods(f):
@@ -416,7 +504,113 @@ def list_methods(f):
     # in those cases, there's no `self`/`cls`. (Technically, an unbound method has
     # a parameter to receive it, but no value has been set yet.)
     self_or_cls = f.__self__ if hasattr(f, "__self__") else None
-    return _list_multimethods(function, self_or_cls)
+    return list(_list_multimethods(function, self_or_cls))
+
+def enable_dispatch_stats(f):
+    """Start collecting dispatch statistics for the generic function `f`.
+
+    `f`: a callable that has been declared `@generic` or `@typed`. Bound methods
+         are resolved to the underlying function. For OOP methods, note that each
+         class has its own dispatcher; statistics are collected for calls that
+         go through the dispatcher of `f` (also when the winning multimethod is
+         found in a parent class).
+
+    If statistics were already being collected for `f`, they are reset.
+
+    While statistics are not enabled, a call to a generic function pays just one
+    attribute check for the possibility. See `dispatch_stats` for what is recorded.
+    """
+    _get_dispatcher(f)._stats = _DispatchStats()
+
+def disable_dispatch_stats(f):
+    """Stop collecting dispatch statistics for the generic function `f`, and discard them."""
+    _get_dispatcher(f)._stats = None
+
+def dispatch_stats(f):
+    """Return the dispatch statistics collected for the generic function `f`.
+
+    See `enable_dispatch_stats`. If statistics are not enabled for `f`,
+    return `None`.
+
+    Otherwise, the return value is a snapshot of the statistics, as a `dict`:
+
+        `calls`:                number of calls to `f` (excluding partial
+                                applications by `curry`, which do not dispatch).
+        `failures`:             number of calls for which no multimethod matched.
+        `methods`:              `{callable: count}`, how many times each multimethod
+                                won the dispatch.
+        `cache_hits`:           number of dispatch decisions answered by the cache.
+        `cache_misses`:         number of dispatch decisions computed from scratch.
+                                Note that decisions that depend on argument values,
+                                not only types, are never cached.
+        `resolution_ns`:        total time spent resolving which multimethod
+                                to call, in nanoseconds.
+        `resolution_histogram`: `{t: count}`, how many resolutions took time
+                                `t/2 < dt <= t` nanoseconds (logarithmic bins).
+        `body_ns`:              total time spent in the multimethods themselves,
+                                in nanoseconds. This includes any nested calls.
+
+    Counts may be slightly off if `f` is called concurrently from several threads.
+    """
+    stats = _get_dispatcher(f)._stats
+    if stats is None:
+        return None
+    return stats.snapshot()
+
+def _get_dispatcher(f):
+    function, _ = getfunc(f)
+    if not isgeneric(function):
+        raise TypeError(f"{_function_fullname(function)} is not a generic function, it has no dispatcher.")
+    return function
+
+class _DispatchStats:
+    """Dispatch statistics of one dispatcher; see `dispatch_stats`."""
+    __slots__ = ("calls", "failures", "methods", "cache_hits", "cache_misses",
+                 "resolution_ns", "resolution_histogram", "body_ns")
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.methods = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.resolution_ns = 0
+        self.resolution_histogram = {}  # bin index (bit length of dt) -> count
+        self.body_ns = 0
+
+    def record_resolution(self, dt):
+        self.calls += 1
+        self.resolution_ns += dt
+        b = dt.bit_length()
+        self.resolution_histogram[b] = self.resolution_histogram.get(b, 0) + 1
+
+    def snapshot(self):
+        return {"calls": self.calls,
+                "failures": self.failures,
+                "methods": dict(self.methods),
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "resolution_ns": self.resolution_ns,
+                "resolution_histogram": {2**b: count for b, count in sorted(self.resolution_histogram.items())},
+                "body_ns": self.body_ns}
+
+def _dispatch_with_stats(dispatcher, args, kwargs):
+    """Like the body of a dispatcher, but record statistics to `dispatcher._stats`."""
+    stats = dispatcher._stats
+    t0 = perf_counter_ns()
+    thecallable = _resolve_multimethod(dispatcher, args, kwargs, _stats=stats)
+    t1 = perf_counter_ns()
+    stats.record_resolution(t1 - t0)
+    if not thecallable:
+        stats.failures += 1
+        _raise_multiple_dispatch_error(dispatcher, args, kwargs,
+                                       candidates=_list_multimethods(dispatcher,
+                                                                     _extract_self_or_cls(dispatcher, args)))
+    stats.methods[thecallable] = stats.methods.get(thecallable, 0) + 1
+    try:
+        return thecallable(*args, **kwargs)
+    finally:
+        stats.body_ns += perf_counter_ns() - t1
 
 # --------------------------------------------------------------------------------
 
@@ -445,13 +639,32 @@ def _list_multimethods(dispatcher, self_or_cls=None):
     `self_or_cls`: If `dispatcher` is installed on an instance method
                    or on a `@classmethod`, set this to perform MRO
                    lookups to find linked dispatchers.
+
+    The returned list is shared; do not modify it.
     """
     # TODO: Compute closest candidates, like Julia does? (see `methods`, `MethodError` in Julia)
     # TODO: (If we do that, we need to look at the bound arguments. When just listing multimethods
     # TODO: in the REPL, the current ordering is probably fine.)
 
     # For regular functions, ours is the only registry we need to look at:
-    relevant_registries = [reversed(dispatcher._method_registry)]
+    cls = _mro_class(self_or_cls)
+    if cls is None:
+        return dispatcher._priority_order
+
+    # For methods, the result depends only on the class, so we cache the flattened
+    # list per class. Registering a multimethod anywhere may change the result, since
+    # it may be registered on a class in the MRO. A newly created class is just a new
+    # key, so it needs no invalidation.
+    entry = dispatcher._mro_cache.get(cls, None)
+    if entry is not None and entry[0] == _registration_generation:
+        return entry[1]
+    multimethods = _walk_mro(dispatcher, cls)
+    dispatcher._mro_cache[cls] = (_registration_generation, multimethods)
+    return multimethods
+
+def _walk_mro(dispatcher, cls):
+    """Collect the multimethods of `dispatcher` and its linked dispatchers in the MRO of `cls`."""
+    relevant_registries = [dispatcher._priority_order]
 
     # But if this dispatcher is installed on a method, we must
     # look up multimethods also in the class's MRO.
@@ -463,24 +676,26 @@ def _list_multimethods(dispatcher, self_or_cls=None):
     # See discussions on interaction between `@staticmethod` and `super` in Python:
     #   https://bugs.python.org/issue31118
     #   https://stackoverflow.com/questions/26788214/super-and-staticmethod-interaction/26807879
-    if self_or_cls:
-        if isinstance(self_or_cls, type):
-            cls = self_or_cls
-        elif hasattr(self_or_cls, "__class__"):
-            cls = self_or_cls.__class__
-        else:
-            assert False
-
-        for base in cls.__mro__[1:]:  # skip the class itself in the MRO
-            if hasattr(base, dispatcher.__name__):  # does this particular super have f?
-                base_oop_method = getattr(base, dispatcher.__name__)
-                base_raw_function, _ = getfunc(base_oop_method)
-                if isgeneric(base_raw_function):  # it's @generic or @typed
-                    base_registry = getattr(base_raw_function, "_method_registry")
-                    relevant_registries.append(reversed(base_registry))
+    for base in cls.__mro__[1:]:  # skip the class itself in the MRO
+        if hasattr(base, dispatcher.__name__):  # does this particular super have f?
+            base_oop_method = getattr(base, dispatcher.__name__)
+            base_raw_function, _ = getfunc(base_oop_method)
+            if isgeneric(base_raw_function):  # it's @generic or @typed
+                relevant_registries.append(base_raw_function._priority_order)
 
     return list(chain.from_iterable(relevant_registries))
 
+def _mro_class(self_or_cls):
+    """Return the class whose MRO to look up for the value `self_or_cls`, or `None`."""
+    if not self_or_cls:
+        return None
+    if isinstance(self_or_cls, type):
+        return self_or_cls
+    elif hasattr(self_or_cls, "__class__"):
+        return self_or_cls.__class__
+    else:
+        assert False
+
 # TODO: move this utility to `unpythonic.fun`? Belongs there, but doing so introduces a circular dependency.
 def _format_callable(thecallable):
     """Format, as a string, a human-readable description of a callable.
@@ -503,7 +718,7 @@ def _format_callable(thecallable):
     source, firstlineno = inspect.getsourcelines(function)
     return f"{thecallable.__qualname__}{str(thesignature)} from {filename}:{firstlineno}"
 
-def _resolve_multimethod(dispatcher, args, kwargs, *, _partial=False):
+def _resolve_multimethod(dispatcher, args, kwargs, *, _partial=False, _stats=None):
     """Return the first matching multimethod on `dispatcher` for the given `args` and `kwargs`.
 
     If `_partial` is `True`, allow leaving some parameters of the function unbound,
@@ -518,18 +733,261 @@ def _resolve_multimethod(dispatcher, args, kwargs, *, _partial=False):
     the remaining not-yet-passed `args` or `kwargs` may cause the search to match a
     different multimethod. In partial mode, this function says only that there is
     *at least one* match when given those partial arguments.
+
+    `_stats`: if not `None`, a `_DispatchStats` to record cache hits and misses in.
     """
+    if not _partial:
+        cache = dispatcher._dispatch_cache
+        key = _dispatch_cache_key(args, kwargs)
+        thecallable = cache.lookup(key)
+        if _stats is not None:
+            if thecallable is not None:
+                _stats.cache_hits += 1
+            else:
+                _stats.cache_misses += 1
+        if thecallable is not None:
+            return thecallable
+
+        if dispatcher._compiled is not None:
+            thecallable, cacheable = dispatcher._compiled.resolve(dispatcher, args, kwargs)
+            if thecallable is not None and cacheable:
+                cache.store(key, thecallable)
+            return thecallable
+
+    # The decision can be cached only if it depends on nothing but the types of the
+    # arguments. Binding depends only on the shape of the argument list, which is part
+    # of the cache key, so only the type signatures of the multimethods actually
+    # type-checked against the arguments (up to and including the winner) matter.
+    cacheable = not _partial
     multimethods = _list_multimethods(dispatcher, _extract_self_or_cls(dispatcher, args))
     for thecallable, type_signature in multimethods:
         try:
             bound_arguments = _resolve_bindings(thecallable, args, kwargs, _partial=_partial)
-            if not _get_argument_type_mismatches(type_signature, bound_arguments):
+            if cacheable and not _is_type_determined_signature(type_signature):
+                cacheable = False
+            if not _get_argument_type_mismatches(type_signature, bound_arguments,
+                                                 policy=dispatcher._typecheck_policy):
+                if cacheable:
+                    cache.store(key, thecallable)
                 return thecallable
         except TypeError:  # could not accept the given arguments; this isn't the multimethod we're looking for.
             continue
     return None
 
-def _get_argument_type_mismatches(type_signature, bound_arguments, *, skip_unannotated=False):
+class _DispatchCache:
+    """Per-dispatcher cache of dispatch decisions.
+
+    Maps a key computed by `_dispatch_cache_key` to the winning multimethod.
+    Only decisions that depend solely on the concrete types of the arguments
+    are stored; see `_is_type_determined`.
+
+    The cache empties itself when a multimethod is registered anywhere, and when
+    an ABC gains a virtual subclass (`abc.ABCMeta.register`), since the latter
+    can change the result of `isinstance` for an already seen type.
+    """
+    __slots__ = ("entries", "generation", "abc_token")
+
+    def __init__(self):
+        self.entries = {}
+        self.generation = _registration_generation
+        self.abc_token = abc.get_cache_token()
+
+    def _validate(self):
+        abc_token = abc.get_cache_token()
+        if self.generation != _registration_generation or self.abc_token != abc_token:
+            self.entries.clear()
+            self.generation = _registration_generation
+            self.abc_token = abc_token
+
+    def lookup(self, key):
+        """Return the cached multimethod for `key`, or `None` if there is none."""
+        self._validate()
+        return self.entries.get(key, None)
+
+    def store(self, key, thecallable):
+        self._validate()
+        self.entries[key] = thecallable
+
+class _CompiledDispatch:
+    """Compiled-mode resolver of a dispatcher; see `generic`.
+
+    Holds one `_DiscriminationIndex` per class in whose MRO the multimethods
+    are looked up (`None` for regular functions and static methods). The
+    indices are rebuilt when a multimethod is registered anywhere.
+    """
+    __slots__ = ("indices", "generation")
+
+    def __init__(self):
+        self.indices = {}
+        self.generation = _registration_generation
+
+    def resolve(self, dispatcher, args, kwargs):
+        """Return `(thecallable, cacheable)` for a call to `dispatcher`.
+
+        `thecallable` is `None` if no multimethod matched. `cacheable` tells
+        whether the decision depended only on the types of the arguments.
+        """
+        if self.generation != _registration_generation:
+            self.indices.clear()
+            self.generation = _registration_generation
+        self_or_cls = _extract_self_or_cls(dispatcher, args)
+        cls = _mro_class(self_or_cls)
+        index = self.indices.get(cls, None)
+        if index is None:
+            index = self.indices[cls] = _DiscriminationIndex(_list_multimethods(dispatcher, self_or_cls))
+        return index.resolve(args, kwargs, dispatcher._typecheck_policy)
+
+class _DiscriminationIndex:
+    """Discrimination index over a fixed list of multimethods, in priority order.
+
+    Multimethod number `i` in the list is represented by bit `i` of an `int` bitmask.
+    The lowest set bit in a mask of candidates is the one to try first.
+
+    Which multimethods can bind a given argument list depends only on its shape,
+    so the index is built lazily, one `_ShapeTable` per shape encountered.
+    """
+    __slots__ = ("multimethods", "tables")
+
+    def __init__(self, multimethods):
+        self.multimethods = multimethods
+        self.tables = {}
+
+    def resolve(self, args, kwargs, policy):
+        shape = (len(args), tuple(kwargs))
+        table = self.tables.get(shape, None)
+        if table is None:
+            table = self.tables[shape] = _ShapeTable(self.multimethods, *shape)
+        return table.resolve(args, kwargs, policy)
+
+class _Slot:
+    """Placeholder for the argument at position `index` of an argument list, for analyzing bindings."""
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+
+class _ShapeTable:
+    """Part of a `_DiscriminationIndex` for argument lists of one particular shape.
+
+    Each argument of the call is a *slot*: first the positional ones, then the
+    named ones in the order they were passed.
+
+    `candidates`:     bitmask of multimethods that can bind an argument list of this shape.
+    `verify`:         bitmask of multimethods that must be type-checked in full, because
+                      some of their type specifications cannot be indexed.
+    `discriminators`: per slot, a list of `(bit, pred)`, where `pred` is the compiled
+                      type check (see `compile_typecheck`) for the type-determined
+                      specification (see `_is_type_determined`) of the parameter that
+                      multimethod `bit` binds that slot to.
+    `masks`:          per slot, `{type: bitmask}`, the candidates that accept an argument
+                      of the given concrete type in that slot. Filled in lazily.
+    """
+    __slots__ = ("multimethods", "nargs", "candidates", "verify", "discriminators", "active", "masks")
+
+    def __init__(self, multimethods, nargs, kwnames):
+        slots = [_Slot(j) for j in range(nargs + len(kwnames))]
+        probe_args = tuple(slots[:nargs])
+        probe_kwargs = dict(zip(kwnames, slots[nargs:]))
+
+        candidates = 0
+        verify = 0
+        discriminators = [[] for _ in slots]
+        for i, (thecallable, type_signature) in enumerate(multimethods):
+            bit = 1 << i
+            try:
+                bound_arguments = _resolve_bindings(thecallable, probe_args, probe_kwargs, _partial=False)
+            except TypeError:  # cannot accept an argument list of this shape
+                continue
+            parameters = bound_arguments.signature.parameters
+            for parameter, value in bound_arguments.arguments.items():
+                T = type_signature[parameter]
+                if T is typing.Any:
+                    continue
+                if not _is_type_determined(T) or parameters[parameter].kind in (inspect.Parameter.VAR_POSITIONAL,
+                                                                                  inspect.Parameter.VAR_KEYWORD):
+                    verify |= bit
+                elif isinstance(value, _Slot):
+                    discriminators[value.index].append((bit, compile_typecheck(T)))
+                elif not isoftype(value, T):  # a default value, so the result is the same for every call.
+                    break
+            else:
+                candidates |= bit
+
+        self.multimethods = multimethods
+        self.nargs = nargs
+        self.candidates = candidates
+        self.verify = verify
+        self.discriminators = discriminators
+        self.active = [j for j, ds in enumerate(discriminators) if ds]
+        self.masks = [{} for _ in slots]
+
+    def _compute_mask(self, j, value):
+        mask = self.candidates
+        for bit, pred in self.discriminators[j]:
+            if not pred(value):
+                mask &= ~bit
+        self.masks[j][type(value)] = mask
+        return mask
+
+    def resolve(self, args, kwargs, policy):
+        """Return `(thecallable, cacheable)`; see `_CompiledDispatch.resolve`.
+
+        `policy` is the container check policy for the multimethods that must be
+        type-checked in full; see `typed`.
+        """
+        mask = self.candidates
+        if kwargs:
+            args = args + tuple(kwargs.values())
+        masks = self.masks
+        for j in self.active:
+            value = args[j]
+            m = masks[j].get(type(value), None)
+            if m is None:
+                m = self._compute_mask(j, value)
+            mask &= m
+            if not mask:
+                return None, True
+
+        cacheable = True
+        while mask:
+            lowest = mask & -mask
+            thecallable, type_signature = self.multimethods[lowest.bit_length() - 1]
+            if not (self.verify & lowest):
+                return thecallable, cacheable
+            cacheable = False
+            try:
+                bound_arguments = _resolve_bindings(thecallable, args[:self.nargs], kwargs, _partial=False)
+                if not _get_argument_type_mismatches(type_signature, bound_arguments, policy=policy):
+                    return thecallable, False
+            except TypeError:
+                pass
+            mask ^= lowest
+        return None, cacheable
+
+def _dispatch_cache_key(args, kwargs):
+    """Compute the dispatch cache key for a call with `args` and `kwargs`.
+
+    The key consists of the concrete types of the arguments, and the shape of
+    the argument list (the number of positional arguments, and the names and
+    order of the named ones).
+
+    If the first positional argument is a class, the class itself is included,
+    too. In an OOP `@classmethod`, the value of `cls` determines the MRO,
+    but its type (the metaclass) does not.
+    """
+    first = args[0] if args and isinstance(args[0], type) else None
+    if kwargs:
+        return (tuple(map(type, args)), tuple((k, type(v)) for k, v in kwargs.items()), first)
+    return (tuple(map(type, args)), None, first)
+
+def _is_type_determined_signature(type_signature):
+    """Return whether all type specifications in `type_signature` are type-determined.
+
+    See `_is_type_determined`.
+    """
+    return all(_is_type_determined(T) for T in type_signature.values())
+
+def _get_argument_type_mismatches(type_signature, bound_arguments, *, skip_unannotated=False, policy=None):
     """Match bound arguments against the given type signature.
 
     Return a list of type mismatches. If it is empty, everything is ok.
@@ -557,6 +1015,9 @@ def _get_argument_type_mismatches(type_signature, bound_arguments, *, skip_unann
                       by other parts of `unpythonic`.
 
     `bound_arguments`: see `unpythonic.arity.resolve_bindings`.
+
+    `policy`: `unpythonic.typecheck.CheckPolicy`, how much of containers to check.
+              If `None`, use the dynvar `typecheck_policy`.
     """
     mismatches = []
     for parameter, value in bound_arguments.arguments.items():
@@ -565,7 +1026,7 @@ def _get_argument_type_mismatches(type_signature, bound_arguments, *, skip_unann
                 continue
             raise ValueError(f"type_signature has no item for parameter {parameter}, which was supplied in `bound_arguments`. If that was intended, please use `skip_unannotated=True`.")
         expected_type = type_signature[parameter]
-        if not isoftype(value, expected_type):
+        if not compile_typecheck(expected_type, policy)(value):
             mismatches.append((parameter, value, expected_type))
     return mismatches
 
@@ -581,7 +1042,10 @@ def _extract_self_or_cls(thecallable, args):
     # since we see just bare functions. In the OOP case, the dispatcher
     # is installed on the raw function before it becomes a bound method.
     # (That in itself is just as it should be.)
-    first_param_name = _name_of_1st_positional_parameter(thecallable)
+    try:  # precomputed for dispatchers, so we don't need to inspect the signature on each call
+        first_param_name = thecallable._first_parameter_name
+    except AttributeError:
+        first_param_name = _name_of_1st_positional_parameter(thecallable)
     most_likely_an_oop_method = first_param_name in self_parameter_names
 
     # Let's see if we might have been passed a `self`/`cls` parameter,
@@ -608,7 +1072,8 @@ def _raise_multiple_dispatch_error(dispatcher, args, kwargs, *, candidates, _par
         # TODO: There's some repeated error-reporting code in `unpythonic.fun`.
         thecallable, type_signature = candidates[0]
         bound_arguments = _resolve_bindings(thecallable, args, kwargs, _partial=_partial)
-        mismatches = _get_argument_type_mismatches(type_signature, bound_arguments)
+        mismatches = _get_argument_type_mismatches(type_signature, bound_arguments,
+                                                   policy=dispatcher._typecheck_policy)
         mismatches_list = [f"{parameter}={repr(value)}, expected {expected_type}"
                            for parameter, value, expected_type in mismatches]
         mismatches_str = "; ".join(mismatches_list)
@@ -641,7 +1106,7 @@ def _raise_multiple_dispatch_error(dispatcher, args, kwargs, *, candidates, _par
            f"{one_multimethod_msg_str}")
     raise TypeError(msg)
 
-def _setup(fullname, multimethod):
+def _setup(fullname, multimethod, *, compiled=False, specificity=False, _typed=False):
     """Register a multimethod for a generic function, creating the generic function if necessary.
 
     This is a low-level function; you'll likely want `@generic` or `@augment`.
@@ -657,28 +1122,168 @@ def _setup(fullname, multimethod):
 
     `multimethod`: callable, the new multimethod to register.
 
+    `compiled`: bool, whether to enable the compiled dispatch mode. See `generic`.
+                Once enabled for a generic function, it stays enabled.
+
+    `specificity`: bool, whether to enable the most-specific dispatch mode.
+                   See `generic`. Once enabled for a generic function, it stays enabled.
+
+    `_typed`: bool, internal. If `True`, and the dispatcher is created now, create it
+              with a slot for the fast path of `@typed`. See `typed`.
+
     Return value is the dispatcher.
     """
     if fullname not in _dispatcher_registry:
         # Create the dispatcher. This will replace the original function.
-        @wraps(multimethod)
-        def dispatcher(*args, **kwargs):
-            thecallable = _resolve_multimethod(dispatcher, args, kwargs)
-            if thecallable:
-                return thecallable(*args, **kwargs)
-            _raise_multiple_dispatch_error(dispatcher, args, kwargs,
-                                           candidates=_list_multimethods(dispatcher,
-                                                                         _extract_self_or_cls(dispatcher, args)))
+        if _typed:
+            @wraps(multimethod)
+            def dispatcher(*args, **kwargs):
+                if not kwargs and dispatcher._stats is None:
+                    fastpath = dispatcher._fastpath
+                    if fastpath is not None and fastpath.accepts(args):
+                        return multimethod(*args)
+                return _dispatch(dispatcher, args, kwargs)
+            dispatcher._fastpath = None  # set up by `typed`, after registration
+        else:
+            @wraps(multimethod)
+            def dispatcher(*args, **kwargs):
+                # Same as `_dispatch`, inlined.
+                if dispatcher._stats is not None:
+                    return _dispatch_with_stats(dispatcher, args, kwargs)
+                thecallable = _resolve_multimethod(dispatcher, args, kwargs)
+                if thecallable:
+                    return thecallable(*args, **kwargs)
+                _raise_multiple_dispatch_error(dispatcher, args, kwargs,
+                                               candidates=_list_multimethods(dispatcher,
+                                                                             _extract_self_or_cls(dispatcher, args)))
 
         dispatcher._method_registry = []
+        dispatcher._first_parameter_name = _name_of_1st_positional_parameter(multimethod)
+        dispatcher._mro_cache = {}
+        dispatcher._priority_order = []
+        dispatcher._specificity = False
+        dispatcher._dispatch_cache = _DispatchCache()
+        dispatcher._compiled = None
+        dispatcher._typecheck_policy = None
+        dispatcher._stats = None
         dispatcher._register = partial(_register_to, dispatcher)
         _dispatcher_registry[fullname] = dispatcher
 
     dispatcher = _dispatcher_registry[fullname]
     if isgeneric(dispatcher) == "typed":
         raise TypeError("@typed: cannot register additional multimethods.")
+    if compiled and dispatcher._compiled is None:
+        dispatcher._compiled = _CompiledDispatch()
+    if specificity:
+        dispatcher._specificity = True  # the ordering is recomputed when the multimethod is registered
     return dispatcher._register(multimethod)  # this returns the *dispatcher*
 
+def _dispatch(dispatcher, args, kwargs):
+    """Resolve and call the multimethod of `dispatcher` for `args` and `kwargs`.
+
+    Raise `TypeError` if no multimethod matches.
+    """
+    if dispatcher._stats is not None:
+        return _dispatch_with_stats(dispatcher, args, kwargs)
+    thecallable = _resolve_multimethod(dispatcher, args, kwargs)
+    if thecallable:
+        return thecallable(*args, **kwargs)
+    _raise_multiple_dispatch_error(dispatcher, args, kwargs,
+                                   candidates=_list_multimethods(dispatcher,
+                                                                 _extract_self_or_cls(dispatcher, args)))
+
+class _TypedFastPath:
+    """Precompiled positional type checks for a `@typed` function.
+
+    `classes`: list of `(j, cls)`, sorted by `j`, for positional parameters whose type
+               check is just `isinstance(arg, cls)`. `cls` may be a tuple of classes.
+    `checks`:  list of `(j, pred)`, sorted by `j`, for the other positional parameters;
+               `pred` is the compiled type check. Parameters of type `Any` are omitted.
+    `minargs`, `maxargs`: the range of numbers of positional arguments the fast path accepts.
+               Any parameters not passed must have a default value that passes its type check.
+    """
+    __slots__ = ("classes", "checks", "minargs", "maxargs")
+
+    def __init__(self, classes, checks, minargs, maxargs):
+        self.classes = classes
+        self.checks = checks
+        self.minargs = minargs
+        self.maxargs = maxargs
+
+    def accepts(self, args):
+        """Return whether the positional `args` bind to the function, and pass the type checks."""
+        n = len(args)
+        if n < self.minargs or n > self.maxargs:
+            return False
+        # Parameters beyond `n` take their default values, which were checked in advance.
+        for j, cls in self.classes:
+            if j >= n:
+                break
+            if not isinstance(args[j], cls):
+                return False
+        for j, pred in self.checks:
+            if j >= n:
+                break
+            if not pred(args[j]):
+                return False
+        return True
+
+def _make_typed_fastpath(multimethod, type_signature, policy):
+    """Create the `_TypedFastPath` for a `@typed` function, or return `None` if not applicable.
+
+    The fast path handles calls with positional arguments only, so it is not applicable
+    if the function has `*args` or `**kwargs`, or keyword-only parameters that need
+    to be passed.
+    """
+    function, _ = getfunc(multimethod)
+    parameters = list(inspect.signature(function).parameters.values())
+    positional = []
+    for p in parameters:
+        if p.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            return None
+        T = type_signature[p.name]
+        pred = compile_typecheck(T, policy)
+        default_ok = p.default is not inspect.Parameter.empty and pred(p.default)
+        if p.kind is inspect.Parameter.KEYWORD_ONLY:
+            if not default_ok:
+                return None
+        else:
+            positional.append((T, pred, default_ok))
+
+    # Beside all parameters that have no default, also those that have
+    # a default that fails the type check must be passed explicitly.
+    minargs = len(positional)
+    while minargs > 0 and positional[minargs - 1][2]:
+        minargs -= 1
+
+    classes = []
+    checks = []
+    for j, (T, pred, _) in enumerate(positional):
+        if T is typing.Any:
+            continue
+        cls = _isinstance_classes(T)
+        if cls is not None:
+            classes.append((j, cls))
+        else:
+            checks.append((j, pred))
+    return _TypedFastPath(classes, checks, minargs, len(positional))
+
+def _isinstance_classes(T):
+    """If `isoftype(x, T)` is the same as `isinstance(x, cls)`, return `cls`; else `None`.
+
+    `cls` is a class or a tuple of classes.
+    """
+    if T is typing.Any or not _is_type_determined(T):
+        return None
+    if _is_union(T):
+        members = [_isinstance_classes(U) for U in T.__args__]
+        if any(cls is None for cls in members):  # e.g. `Any` in the union
+            return None
+        return tuple(chain.from_iterable(cls if isinstance(cls, tuple) else (cls,) for cls in members))
+    if T is not str and safeissubclass(T, str):  # `isoftype` checks subclasses of `str` against `typing.Text`
+        return None
+    return T
+
 def _register_to(dispatcher, multimethod):
     """Decorator. Register a new `multimethod` to `dispatcher`.
 
@@ -738,7 +1343,10 @@ def _register_to(dispatcher, multimethod):
         msg = f"Multimethod definition missing type annotation for parameter{plural}: {repr_str}"
         raise TypeError(msg)
 
+    global _registration_generation
     dispatcher._method_registry.append((multimethod, type_signature))
+    dispatcher._priority_order = _compute_priority_order(dispatcher)
+    _registration_generation += 1
 
     # Update entry point docstring to include docs for the new multimethod,
     # and its call signature.
@@ -758,3 +1366,92 @@ def _register_to(dispatcher, multimethod):
         dispatcher.__doc__ += our_doc
 
     return dispatcher  # Replace the multimethod callable with this generic function's dispatcher.
+
+# --------------------------------------------------------------------------------
+# Most-specific dispatch
+
+def _compute_priority_order(dispatcher):
+    """Return the multimethods of `dispatcher`, in the order the dispatcher tries them.
+
+    By default, most-recently-registered first. In the most-specific dispatch mode
+    (see `generic`), sorted topologically so that each multimethod comes after all
+    multimethods more specific than it; ties are broken by recency.
+    """
+    multimethods = list(reversed(dispatcher._method_registry))
+    if not dispatcher._specificity:
+        return multimethods
+    n = len(multimethods)
+    beats = [[i != j and _is_more_specific(multimethods[i], multimethods[j]) for j in range(n)]
+             for i in range(n)]
+    remaining = list(range(n))
+    order = []
+    while remaining:
+        for i in remaining:
+            if not any(beats[j][i] for j in remaining):
+                break
+        else:  # pragma: no cover, the relation should be acyclic, but don't hang if it isn't.
+            i = remaining[0]
+        order.append(i)
+        remaining.remove(i)
+    return [multimethods[i] for i in order]
+
+def _is_more_specific(method1, method2):
+    """Return whether multimethod `method1` is strictly more specific than `method2`.
+
+    Each argument is `(callable, type_signature)`. See `generic`.
+    """
+    (callable1, type_signature1), (callable2, type_signature2) = method1, method2
+    shape1, names1 = _parameter_shape(callable1)
+    shape2, names2 = _parameter_shape(callable2)
+    if shape1 != shape2:
+        return False
+    types1 = [type_signature1[name] for name in names1]
+    types2 = [type_signature2[name] for name in names2]
+    return (all(_is_subspec(T1, T2) for T1, T2 in zip(types1, types2)) and
+            not all(_is_subspec(T2, T1) for T1, T2 in zip(types1, types2)))
+
+def _parameter_shape(thecallable):
+    """Return `(shape, names)` of the parameter list of `thecallable`, for comparing multimethods."""
+    function, _ = getfunc(thecallable)
+    parameters = inspect.signature(function).parameters.values()
+    shape = tuple((p.kind, p.name if p.kind is inspect.Parameter.KEYWORD_ONLY else None)
+                  for p in parameters)
+    return shape, [p.name for p in parameters]
+
+def _is_union(T):
+    return typing.get_origin(T) is typing.Union or isinstance(T, types.UnionType)
+
+def _is_subspec(T1, T2):
+    """Return whether type specification `T1` is a subtype of (or the same as) `T2`.
+
+    Conservative: if this cannot tell, it returns `False`.
+
+    Parametric types are treated as covariant in their type arguments
+    (so `List[bool]` is a subtype of `List[int]`), which is what matters
+    for `isoftype`, since it only checks values, not variance.
+    """
+    if T1 == T2 or T2 is typing.Any:
+        return True
+    if T1 is typing.Any:
+        return False
+    if _is_union(T1):
+        return all(_is_subspec(U, T2) for U in T1.__args__)
+    if _is_union(T2):
+        return any(_is_subspec(T1, U) for U in T2.__args__)
+    origin1 = typing.get_origin(T1)
+    origin2 = typing.get_origin(T2)
+    if origin1 is typing.Literal:
+        return all(isoftype(value, T2) for value in T1.__args__)
+    cls1 = origin1 if origin1 is not None else T1
+    cls2 = origin2 if origin2 is not None else T2
+    if not (isinstance(cls1, type) and isinstance(cls2, type)):
+        return False
+    if not safeissubclass(cls1, cls2):
+        return False
+    args2 = getattr(T2, "__args__", None) if origin2 is not None else None
+    if not args2:  # `T2` is a bare class, e.g. `list` or `Sequence`
+        return True
+    args1 = getattr(T1, "__args__", None) if origin1 is not None else None
+    if not args1 or len(args1) != len(args2):
+        return False
+    return all(_is_subspec(U1, U2) for U1, U2 in zip(args1, args2))
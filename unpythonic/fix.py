@@ -57,23 +57,44 @@ import typing  # we use typing.NoReturn as a special value at runtime
 import threading
 from functools import wraps
 from typing import Any
+from weakref import WeakKeyDictionary
 
 from .fun import const, memoize
-from .tco import trampolined, _jump
-from .env import env
-from .arity import resolve_bindings, tuplify_bindings
+from .tco import trampolined, _jump, _claim
+from .arity import _get_binder
 from .regutil import register_decorator
 
-_L = threading.local()
-def _get_threadlocals() -> "env":
-    if not hasattr(_L, "_data"):
+class _FixState(threading.local):
+    """Per-thread state of the cycle detector."""
+    def __init__(self) -> None:
+        self.visited = set()
         # TCO info forms a stack to support nested TCO chains (during a
         # TCO chain, regular call, which then calls another TCO chain).
-        _L._data = env(visited=set(), tco_stack=[])
-    return _L._data
+        self.tco_stack = []
+_state = _FixState()
+
+class _TcoFrame:
+    """One TCO chain in progress, on the per-thread `tco_stack`."""
+    __slots__ = ("target", "cleanup")
+
+    def __init__(self, target: Callable) -> None:
+        self.target = target
+        self.cleanup = []  # entries added to `visited` during this chain
+
+# Cycle key functions of fixtco'd entrypoints, for use in TCO chains, where
+# we only see the jump target. Weak keys, so we don't keep the functions alive;
+# the keyers must not reference the functions either.
+_keyers: WeakKeyDictionary = WeakKeyDictionary()
+
+def _get_keyer(f: Callable) -> Callable:
+    """Return `keyer(args, kwargs)`, computing the cycle key for a call to `f`."""
+    try:
+        return _keyers[f]
+    except (KeyError, TypeError):  # TypeError: f not weakly referenceable
+        return _get_binder(f).key
 
 @register_decorator(priority=40, istco=False)  # same priority as @fixtco
-def fix(bottom: Any = typing.NoReturn, memo: bool = True) -> Callable:
+def fix(bottom: Any = typing.NoReturn, memo: bool = True, key: Callable | None = None) -> Callable:
     """Break recursion cycles. Parametric decorator.
 
     This is sometimes useful for recursive pattern-matching definitions. For an
@@ -137,6 +158,22 @@ def fix(bottom: Any = typing.NoReturn, memo: bool = True) -> Callable:
         recursive fix-instrumented functions, each entrypoint memoizes its
         results separately.)
 
+      - By default, two calls are the same, for cycle detection, when their
+        arguments bind to the parameters of `f` in the same way. The `key`
+        parameter replaces this with a custom key function, called as
+        `key(*args, **kwargs)` with the same arguments as `f`, which must
+        return a hashable value. Two calls are then the same if their keys
+        are equal.
+
+        This is useful to cut cycles on just the part of the arguments that
+        identifies a node (e.g. `key=lambda node, ctx: node.id`), and it is
+        also faster than binding the arguments. If `f` is called with the
+        same arguments in a consistent way (e.g. always positionally),
+        `key=lambda *args: args` skips the binding step.
+
+        The key only affects cycle detection; the memo still keys on the
+        full bindings.
+
     **NOTE**: If you need `fix` for code that uses TCO, use `fixtco` instead.
 
     The implementations of recursion cycle breaking and TCO must interact in a
@@ -146,10 +183,10 @@ def fix(bottom: Any = typing.NoReturn, memo: bool = True) -> Callable:
     halting problem. This should be hint enough that it will only work for the
     advertised class of special cases - i.e., a specific kind of recursion cycles.
     """
-    return _fix(bottom, memo, tco=False)
+    return _fix(bottom, memo, key, tco=False)
 
 @register_decorator(priority=40, istco=True)  # same priority as @trampolined
-def fixtco(bottom: Any = typing.NoReturn, memo: bool = True) -> Callable:
+def fixtco(bottom: Any = typing.NoReturn, memo: bool = True, key: Callable | None = None) -> Callable:
     """TCO-enabled version of @fix.
 
     On top of performing the duties of `fix`, this parametric decorator applies
@@ -178,7 +215,7 @@ def fixtco(bottom: Any = typing.NoReturn, memo: bool = True) -> Callable:
     for that additional machinery to slow things down when TCO support is not
     required.
     """
-    return _fix(bottom, memo, tco=True)
+    return _fix(bottom, memo, key, tco=True)
 
 # Without TCO support the idea is as simple as:
 # def fix(bottom=typing.NoReturn, memo=True):
@@ -188,15 +225,15 @@ def fixtco(bottom: Any = typing.NoReturn, memo: bool = True) -> Callable:
 #         f_memo = memoize(f) if memo else f
 #         @wraps(f)
 #         def f_fix(*args, **kwargs):
-#             e = _get_threadlocals()
+#             visited = _state.visited
 #             me = (f_fix, tuplify_bindings(resolve_bindings(f, *args, **kwargs)))
-#             mrproper = not e.visited  # on outermost call, scrub visited clean at exit
-#             if not e.visited or me not in e.visited:
+#             mrproper = not visited  # on outermost call, scrub visited clean at exit
+#             if not visited or me not in visited:
 #                 try:
-#                     e.visited.add(me)
+#                     visited.add(me)
 #                     return f_memo(*args, **kwargs)
 #                 finally:
-#                     e.visited.clear() if mrproper else e.visited.remove(me)
+#                     visited.clear() if mrproper else visited.remove(me)
 #             else:  # cycle detected
 #                 return bottom(f_fix.__name__, *args, **kwargs)
 #         f_fix.entrypoint = f  # just for information
@@ -208,28 +245,52 @@ def fixtco(bottom: Any = typing.NoReturn, memo: bool = True) -> Callable:
 #   OTOH, maybe that's not needed, since by definition, a decorator overwrites the name.
 #   So returning the decorated version would be just fine.
 #
-def _fix(bottom: Any = typing.NoReturn, memo: bool = True, *, tco: bool) -> Callable:
+def _fix(bottom: Any = typing.NoReturn, memo: bool = True, key: Callable | None = None, *, tco: bool) -> Callable:
     # Being a class, typing.NoReturn is technically callable (to construct an
     # instance), but because it's an abstract class, the call raises TypeError.
     # We want to use the class itself as a data value, so we special-case it.
     if bottom is typing.NoReturn or not callable(bottom):
         bottom = const(bottom)
     def decorator(f):
-        @wraps(f)
-        def f_fix(*args, **kwargs):
-            e = _get_threadlocals()
-            me = (f_fix, tuplify_bindings(resolve_bindings(f, *args, **kwargs)))
-            mrproper = not e.visited  # on outermost call, scrub visited clean at exit
-            if me not in e.visited:
+        if key is None:
+            keyer = _get_binder(f).key  # the shared binder does not reference `f`, see `_keyers`
+        else:
+            def keyer(args, kwargs):
+                return key(*args, **kwargs)
+        if tco:
+            try:
+                _keyers[f] = keyer  # for `spy`, which sees `f` as a jump target
+            except TypeError:  # f not weakly referenceable
+                pass
+            @wraps(f)
+            def f_fix(*args, **kwargs):
+                e = _state
+                visited = e.visited
+                me = (f_fix, keyer(args, kwargs))
+                if me in visited:  # cycle detected
+                    return bottom(f_fix.__name__, *args, **kwargs)
+                mrproper = not visited  # on outermost call, scrub visited clean at exit
+                visited.add(me)
+                tco_stack = e.tco_stack
+                tco_stack.append(_TcoFrame(f))
+                try:
+                    return f_memo(*args, **kwargs)
+                finally:
+                    tco_stack.pop()
+                    visited.clear() if mrproper else visited.remove(me)
+        else:
+            @wraps(f)
+            def f_fix(*args, **kwargs):
+                visited = _state.visited
+                me = (f_fix, keyer(args, kwargs))
+                if me in visited:  # cycle detected
+                    return bottom(f_fix.__name__, *args, **kwargs)
+                mrproper = not visited  # on outermost call, scrub visited clean at exit
+                visited.add(me)
                 try:
-                    e.visited.add(me)
-                    e.tco_stack.append(env(target=f, cleanup=set()))  # harmless if no TCO
                     return f_memo(*args, **kwargs)
                 finally:
-                    e.tco_stack.pop()
-                    e.visited.clear() if mrproper else e.visited.remove(me)
-            else:  # cycle detected
-                return bottom(f_fix.__name__, *args, **kwargs)
+                    visited.clear() if mrproper else visited.remove(me)
         f_fix._entrypoint = f  # for information and for co-operation with TCO
 
         # TCO trampoline interception.
@@ -255,21 +316,22 @@ def _fix(bottom: Any = typing.NoReturn, memo: bool = True, *, tco: bool) -> Call
         # there somewhere.)
         #
         def spy(*args, **kwargs):
-            e = _get_threadlocals()
+            e = _state
             t = e.tco_stack[-1]
             v = t.target(*args, **kwargs)
             if isinstance(v, _jump):
-                you = (v.target, tuplify_bindings(resolve_bindings(v.target, *v.args, **v.kwargs)))
+                you = (v.target, _get_keyer(v.target)(v.args, v.kwargs))
                 if you in e.visited:  # cycle detected
                     for target in t.cleanup:
                         e.visited.remove(target)
-                    v._claimed = True  # we have handled the jump, by terminating the infinite cycle.
-                    return bottom(v.target.__name__, *args, **kwargs)
+                    target = v.target  # read before `_claim`, which may recycle `v`
+                    _claim(v)  # we have handled the jump, by terminating the infinite cycle.
+                    return bottom(target.__name__, *args, **kwargs)
                 # Just like the f_fix loop adds `f` to `visited` before calling it,
                 # we add the target to `visited` before we let the trampoline jump
                 # into it.
                 e.visited.add(you)
-                t.cleanup.add(you)
+                t.cleanup.append(you)
                 t.target, v.target = v.target, spy  # re-instate the spy
             else:  # TCO chain ended
                 for target in t.cleanup:
@@ -24,15 +24,18 @@ FP loops don't have to be pure::
     assert [f(10) for f in funcs] == [0, 10, 20]
 """
 
-__all__ = ["looped", "looped_over", "breakably_looped", "breakably_looped_over"]
+__all__ = ["looped", "looped_over", "breakably_looped", "breakably_looped_over",
+           "fast_looped_over"]
 
 from collections.abc import Callable, Iterable
-from functools import partial
+from functools import partial, reduce
+import operator
+import sys
 from typing import Any
 
 from .ec import call_ec
 from .arity import arity_includes, UnknownArity
-from .tco import trampolined, _jump
+from .tco import trampolined, _jump, _make_jump
 from .regutil import register_decorator
 
 @register_decorator(priority=50, istco=True)
@@ -118,7 +121,7 @@ def looped(body: Callable) -> Any:
     def loop(*args: Any, **kwargs: Any) -> _jump:
         # Pass the original non-trampolined body; it is sufficient
         # to have one trampoline at the top level.
-        return _jump(body, (loop,) + args, kwargs)  # already packed args, inst directly.
+        return _make_jump(body, (loop,) + args, kwargs)  # already packed args.
     try:
         if not arity_includes(body, 1):
             raise ValueError("Body arity mismatch. (Is 'loop' parameter declared? Do all extra parameters have their defaults set?)")
@@ -167,7 +170,7 @@ def breakably_looped(body: Callable) -> Any:
     @call_ec
     def result(brk: Callable) -> Any:
         def loop(*args: Any, **kwargs: Any) -> _jump:
-            return _jump(body, (loop, brk) + args, kwargs)  # already packed args, inst directly.
+            return _make_jump(body, (loop, brk) + args, kwargs)  # already packed args.
         try:
             if not arity_includes(body, 2):
                 raise ValueError("Body arity mismatch. (Are (loop, brk) declared? Do all extra parameters have their defaults set?)")
@@ -259,7 +262,7 @@ def looped_over(iterable: Iterable, acc: Any = None) -> Callable[[Callable], Any
             except StopIteration:
                 return newacc
             rest = args[1:] if len(args) >= 2 else ()
-            return _jump(body, (loop, newx, newacc) + rest, kwargs)  # already packed args, inst directly.
+            return _make_jump(body, (loop, newx, newacc) + rest, kwargs)  # already packed args.
         try:
             if not arity_includes(body, 3):
                 raise ValueError("Body arity mismatch. (Are (loop, x, acc) declared? Do all extra parameters have their defaults set?)")
@@ -330,7 +333,7 @@ def breakably_looped_over(iterable: Iterable, acc: Any = None) -> Callable[[Call
                     return newacc
                 rest = args[1:] if len(args) >= 2 else ()
                 cnt = partial(loop, oldacc)
-                return _jump(body, (loop, newx, newacc, cnt, brk) + rest, kwargs)  # already packed args, inst directly.
+                return _make_jump(body, (loop, newx, newacc, cnt, brk) + rest, kwargs)  # already packed args.
             try:
                 if not arity_includes(body, 5):
                     raise ValueError("Body arity mismatch. (Are (loop, x, acc, cnt, brk) declared? Do all extra parameters have their defaults set?)")
@@ -344,3 +347,110 @@ def breakably_looped_over(iterable: Iterable, acc: Any = None) -> Callable[[Call
             return tb(loop, x0, acc, partial(loop, oldacc), brk)
         return result
     return run
+
+@register_decorator(priority=50, istco=True)
+def fast_looped_over(iterable: Iterable, acc: Any = None) -> Callable[[Callable], Any]:  # decorator factory
+    """Like ``@looped_over``, but without a trampoline round-trip per element.
+
+    The body is the same as for ``@looped_over``; it takes the magic parameters
+    ``loop``, ``x`` and ``acc``, and any extra parameters with defaults, and
+    ``return loop(...)`` proceeds to the next element. But here ``loop(...)``
+    just records the new ``acc`` (and any extra arguments), and a plain
+    ``for`` loop calls the body for the next element. This is several times
+    faster than ``@looped_over``.
+
+    Exits work as usual: returning anything other than the result of
+    ``loop(...)`` terminates the loop, with that value as the return value of
+    the loop. If the body returns a ``jump(...)`` (e.g. a tail call to a helper
+    that eventually returns ``loop(...)``), the jump is run in a trampoline,
+    and the loop then continues or exits, depending on the final result.
+
+    **CAUTION**: The result of ``loop(...)`` is only valid as the return
+    value of the body. Don't store it, and don't call ``loop`` more than once
+    per iteration.
+
+    **Reductions**: If the body is one of the associative operators
+    ``operator.add``, ``operator.mul``, ``operator.and_``, ``operator.or_``,
+    ``operator.xor``, or the builtins ``min`` or ``max``, the loop is a
+    reduction: ``acc = op(acc, x)`` for each ``x``. This is done by
+    ``functools.reduce``, in C. If the iterable is a one-dimensional NumPy
+    array, the corresponding ufunc's ``reduce`` is used instead. NumPy sums
+    floats pairwise, so the result may differ from a sequential sum in the
+    last few bits.
+
+    Example::
+
+        @fast_looped_over(range(10), acc=0)
+        def s(loop, x, acc):
+            return loop(acc + x)
+        assert s == 45
+
+        # same thing, as a reduction
+        s = fast_looped_over(range(10), acc=0)(operator.add)
+        assert s == 45
+    """
+    def run(body: Callable) -> Any:
+        if any(body is op for op in _reduction_ufunc_names):
+            return _reduce_over(body, iterable, acc)
+        try:
+            if not arity_includes(body, 3):
+                raise ValueError("Body arity mismatch. (Are (loop, x, acc) declared? Do all extra parameters have their defaults set?)")
+        except UnknownArity:  # well, we tried!  # pragma: no cover
+            pass
+        state = _LoopState(acc)
+        loop = state.loop
+        for x in iterable:
+            rest = state.rest
+            kwargs = state.kwargs
+            if rest or kwargs:
+                v = body(loop, x, state.acc, *rest, **kwargs)
+            else:
+                v = body(loop, x, state.acc)
+            if v is not state:
+                if isinstance(v, _jump):  # tail call out of the body; run it, and see where it ends up
+                    v = trampolined(lambda: v)()
+                if v is not state:  # any other return value exits the loop
+                    return v
+        return state.acc
+    return run
+
+class _LoopState:
+    """The loop state of a `fast_looped_over`.
+
+    Also serves as the return value of `loop(...)`, meaning "proceed to the next element".
+    """
+    __slots__ = ("acc", "rest", "kwargs")
+
+    def __init__(self, acc):
+        self.acc = acc
+        self.rest = ()
+        self.kwargs = {}
+
+    def loop(self, *args: Any, **kwargs: Any) -> "_LoopState":
+        if args:
+            self.acc = args[0]
+            self.rest = args[1:]
+        else:
+            self.rest = ()
+        self.kwargs = kwargs
+        return self
+
+_reduction_ufunc_names = {operator.add: "add",
+                          operator.mul: "multiply",
+                          operator.and_: "bitwise_and",
+                          operator.or_: "bitwise_or",
+                          operator.xor: "bitwise_xor",
+                          min: "minimum",
+                          max: "maximum"}
+
+def _reduce_over(op: Callable, iterable: Iterable, acc: Any) -> Any:
+    """Left-fold `iterable` with the associative operator `op`, starting from `acc`."""
+    # NumPy is never imported by us; if the user has an array, they have already imported NumPy.
+    numpy = sys.modules.get("numpy", None)
+    if (numpy is not None and isinstance(iterable, numpy.ndarray) and iterable.ndim == 1 and
+            iterable.dtype.kind != "O"):
+        if not len(iterable):
+            return acc
+        ufunc = getattr(numpy, _reduction_ufunc_names[op])
+        return op(acc, ufunc.reduce(iterable))
+    return reduce(op, iterable, acc)
@@ -18,17 +18,19 @@ __all__ = ["memoize",
            "to1st", "to2nd", "tokth", "tolast", "to",
            "withself"]
 
-from collections import namedtuple
+from collections import OrderedDict, defaultdict, namedtuple
 from collections.abc import Callable
 from functools import wraps, partial as functools_partial
 from inspect import signature
-from threading import RLock
+from threading import Event, Lock, get_ident, local
+from time import monotonic
+from types import MethodType
 from typing import Any, TypeVar, get_type_hints
 
 F = TypeVar('F', bound=Callable)
 T = TypeVar('T')
 
-from .arity import (_resolve_bindings, tuplify_bindings, _bind)
+from .arity import (_resolve_bindings, _bind, _Binder, _get_binder)
 from .fold import reducel
 from .dispatch import (isgeneric, _resolve_multimethod, _format_callable,
                        _get_argument_type_mismatches, _raise_multiple_dispatch_error,
@@ -39,7 +41,7 @@ from .regutil import register_decorator
 from .symbol import sym
 
 # We use `@passthrough_lazy_args` and `maybe_force_args` to support unpythonic.syntax.lazify.
-from .lazyutil import passthrough_lazy_args, islazy, force, maybe_force_args
+from .lazyutil import passthrough_lazy_args, islazy, force, maybe_force_args, _allatoms
 
 # --------------------------------------------------------------------------------
 
@@ -55,8 +57,13 @@ from .lazyutil import passthrough_lazy_args, islazy, force, maybe_force_args
 
 _success = sym("_success")
 _fail = sym("_fail")
+
+_CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+_ContentionInfo = namedtuple("ContentionInfo", ["waits", "wait_time"])
+
 @register_decorator(priority=10)
-def memoize(f: F) -> F:
+def memoize(f: F | None = None, *, maxsize: int | None = None, policy: str = "lru", ttl: float | None = None,
+            store: Any = None) -> F:
     """Decorator: memoize the function f.
 
     All of the args and kwargs of ``f`` must be hashable.
@@ -69,40 +76,324 @@ def memoize(f: F) -> F:
     preserved between invocations) for this to make any sense.
 
     Beginning with v0.15.0, `memoize` is thread-safe even when the same memoized
-    function instance is called concurrently from multiple threads. Exactly one
-    thread will compute the result. If `f` is recursive, the thread that acquired
-    the lock is the one that is allowed to recurse into the memoized `f`.
+    function instance is called concurrently from multiple threads. For each set
+    of argument bindings, exactly one thread will compute the result; other threads
+    that call with the same arguments meanwhile wait for it. Threads computing
+    results for different arguments do not wait for each other.
+
+    If waiting would deadlock, because the computations depend on each other
+    (e.g. a recursion cycle, as in `fix`), the thread that would close the
+    cycle of waits computes the result itself instead.
+
+    By default, the memo is unbounded, and entries never expire. To change that,
+    use the parametric form::
+
+        @memoize(maxsize=1024, policy="lfu", ttl=60.0)
+        def f(x):
+            ...
+
+    `maxsize`: int or `None`. Maximum number of entries in the memo. When a new
+               entry would exceed it, one is evicted, as chosen by `policy`.
+               `None` means unbounded.
+
+    `policy`: str, one of:
+               - "lru": evict the least recently used entry (default).
+               - "lfu": evict the least frequently used entry. Ties are broken
+                        by evicting the least recently used one.
+               - "fifo": evict the oldest entry.
+
+    `ttl`: float or `None`. Time to live, in seconds. An entry older than this
+           counts as missing, and is recomputed the next time it is needed.
+           Expired entries are dropped when next looked up, or evicted.
+           `None` means entries never expire.
+
+    Memoized exceptions count as entries, too.
+
+    `store`: A memo store to use instead of the default in-memory one, e.g. a
+             `DiskMemo`, to keep the memo on disk. Any object with the `dict`
+             methods `__getitem__` (raising `KeyError` for a missing key),
+             `__setitem__`, `__len__` and `clear` will do. Cannot be combined
+             with `maxsize` or `ttl`.
+
+             The store sees the memo keys, built from the argument bindings, and
+             the memo values, which are pairs of a tag and a return value or an
+             exception. A store that serializes them (such as `DiskMemo`) gives
+             a new copy on each lookup, so a memoized exception is then raised as
+             an equal, but not the same, instance.
+
+             A store shared between processes, such as `SharedMemo`, may have
+             a method `keylock(k)`, returning a context manager. The thread that
+             computes the value for key `k` holds it while it looks up `k` again,
+             and computes and stores the value if it is still missing. Thus each
+             value is computed only once, also across processes.
+
+    Like with `functools.lru_cache`, the memoized function has the methods
+    `cache_info()`, which returns a `CacheInfo(hits, misses, maxsize, currsize)`,
+    and `cache_clear()`, which empties the memo and resets the statistics.
+    When the function is called concurrently from several threads, the hit
+    count is approximate.
+
+    To measure contention, `contention_info()` returns a `ContentionInfo(waits,
+    wait_time)`: how many calls waited for another thread to compute the same
+    result, and the total time, in seconds, they spent waiting.
     """
-    # One lock per use site of `memoize`. We use an `RLock` to allow recursive calls
-    # to the memoized `f` in the thread that acquired the lock.
-    lock = RLock()
-    memo = {}
+    if f is None:
+        return functools_partial(memoize, maxsize=maxsize, policy=policy, ttl=ttl, store=store)
+    if maxsize is not None and (not isinstance(maxsize, int) or maxsize < 1):
+        raise ValueError(f"`maxsize` must be a positive integer or `None`, got {repr(maxsize)}")
+    if policy not in ("lru", "lfu", "fifo"):
+        raise ValueError(f"`policy` must be one of 'lru', 'lfu', 'fifo'; got {repr(policy)}")
+    if ttl is not None and not ttl > 0:
+        raise ValueError(f"`ttl` must be a positive number or `None`, got {repr(ttl)}")
+    if store is not None and (maxsize is not None or ttl is not None):
+        raise ValueError("`store` cannot be combined with `maxsize` or `ttl`")
+
+    if store is not None:
+        memo = store
+    elif maxsize is None and ttl is None:
+        memo = {}
+    else:
+        memo = _MemoStore(maxsize, policy, ttl)
+    keylock = getattr(memo, "keylock", None)
+    binder = _Binder(f)
+    inflight = {}  # key -> _InFlight, for keys some thread is computing right now
+    lock = Lock()  # guards `inflight` and the statistics; only held briefly
+    hits = misses = waits = 0
+    wait_time = 0.0
     @wraps(f)
     def memoized(*args, **kwargs):
-        k = tuplify_bindings(_resolve_bindings(f, args, kwargs, _partial=False))
+        nonlocal hits
+        k = binder.key(args, kwargs)
         try:  # EAFP to eliminate TOCTTOU.
             kind, value = memo[k]
+            hits += 1
         except KeyError:
-            # But we still need to be careful to avoid race conditions.
-            with lock:
-                if k not in memo:
-                    # We were the first thread to acquire the lock.
-                    try:
-                        result = (_success, maybe_force_args(f, *args, **kwargs))
-                    except BaseException as err:
-                        result = (_fail, err)
-                    memo[k] = result  # should yell separately if k is not a valid key
-                else:
-                    # Some other thread acquired the lock before us.
-                    pass
-            kind, value = memo[k]
+            kind, value = miss(k, args, kwargs)
         if kind is _fail:
             raise value
         return value
+    def miss(k, args, kwargs):
+        nonlocal hits, misses, waits, wait_time
+        # We still need to be careful to avoid race conditions.
+        with lock:
+            try:
+                # Some other thread may have computed the value just before us.
+                result = memo[k]
+            except KeyError:
+                entry = inflight.get(k)
+                if entry is None:
+                    entry = inflight[k] = _InFlight(get_ident())
+                    misses += 1
+                    computing = True
+                else:
+                    if entry.event is None:
+                        entry.event = Event()
+                    computing = False
+            else:
+                hits += 1
+                return result
+
+        if computing:  # We are the first thread to need the value for this key.
+            result = None
+            try:
+                if keylock is None:
+                    result = _memo_compute(f, args, kwargs)
+                    memo[k] = result  # should yell separately if k is not a valid key
+                else:
+                    with keylock(k):
+                        try:  # another process may have computed the value meanwhile
+                            result = memo[k]
+                        except KeyError:
+                            result = _memo_compute(f, args, kwargs)
+                            memo[k] = result
+            finally:  # release the waiters even if the store fails
+                with lock:
+                    del inflight[k]
+                    entry.result = result
+                    event = entry.event
+                if event is not None:
+                    event.set()
+            # A bounded memo may evict the entry as soon as another thread
+            # adds one, so use our result directly instead of reading it back.
+            return result
+
+        # Some other thread is computing the value for this key. Wait for it.
+        start = monotonic()
+        waited = _wait_for_inflight(entry)
+        with lock:
+            if waited:
+                waits += 1
+                wait_time += monotonic() - start
+            else:
+                misses += 1
+        if not waited or entry.result is None:
+            # Waiting would deadlock, because that thread is (directly or indirectly)
+            # waiting for us. This happens when the computations depend on each other,
+            # e.g. in a recursion cycle, or when `f` recurses with the same arguments.
+            # Compute the value here; the thread that started first will store it.
+            # (Or that thread failed to get a value at all, because the store raised.)
+            return _memo_compute(f, args, kwargs)
+        return entry.result
+    def cache_info():
+        """Return memo statistics, as a `CacheInfo(hits, misses, maxsize, currsize)`."""
+        return _CacheInfo(hits, misses, maxsize, len(memo))
+    def contention_info():
+        """Return how often calls have waited for another thread, as a `ContentionInfo(waits, wait_time)`."""
+        return _ContentionInfo(waits, wait_time)
+    def cache_clear():
+        """Empty the memo, and reset the statistics."""
+        nonlocal hits, misses, waits, wait_time
+        with lock:
+            memo.clear()
+            hits = misses = waits = 0
+            wait_time = 0.0
+    memoized.cache_info = cache_info
+    memoized.contention_info = contention_info
+    memoized.cache_clear = cache_clear
     if islazy(f):
         memoized = passthrough_lazy_args(memoized)
     return memoized
 
+def _memo_compute(f, args, kwargs):
+    """Internal helper for `memoize`. Call `f`, and return the result in the form stored in the memo."""
+    try:
+        return (_success, maybe_force_args(f, *args, **kwargs))
+    except BaseException as err:
+        return (_fail, err)
+
+class _InFlight:
+    """Internal. A memo entry that the thread `owner` is computing right now.
+
+    Threads that need the same value wait on `event`, which is created by
+    the first one of them. When `event` is set, `result` is available.
+    """
+    __slots__ = ("owner", "event", "result")
+    def __init__(self, owner):
+        self.owner = owner
+        self.event = None
+        self.result = None
+
+# The thread ident of each thread waiting in `memoize`, and the `_InFlight` entry it waits for.
+# Global, because a deadlock may involve several memoized functions.
+_memo_waits = {}
+_memo_waits_lock = Lock()
+
+def _wait_for_inflight(entry):
+    """Internal helper for `memoize`. Wait until another thread has finished computing `entry`.
+
+    Return whether we waited. If waiting would deadlock, because the owner of `entry`
+    is (directly or through other threads) waiting for this thread, return `False`
+    immediately.
+    """
+    me = get_ident()
+    with _memo_waits_lock:
+        owner = entry.owner
+        while owner != me:
+            waited_on = _memo_waits.get(owner)
+            if waited_on is None:
+                break
+            owner = waited_on.owner
+        else:
+            return False
+        _memo_waits[me] = entry
+    try:
+        entry.event.wait()
+    finally:
+        with _memo_waits_lock:
+            del _memo_waits[me]
+    return True
+
+class _MemoStore:
+    """Memo for `memoize`, with a maximum size, an eviction policy, and expiration.
+
+    Supports the subset of the `dict` API that `memoize` uses. Looking up an
+    entry counts as a use of it, for the eviction policy. Looking up an expired
+    entry removes it, and raises `KeyError`.
+
+    Each operation is atomic, so `memoize` can use this from several threads,
+    like a `dict`.
+    """
+    def __init__(self, maxsize, policy, ttl):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.ttl = ttl
+        self.lock = Lock()
+        self.entries = OrderedDict()  # key -> value; in eviction order for "lru" and "fifo"
+        self.deadlines = {}  # key -> expiration time, when `ttl` is set
+        # For "lfu": key -> number of uses, and number of uses -> keys with that many,
+        # in least recently used order. This makes all operations O(1).
+        self.counts = {}
+        self.buckets = defaultdict(OrderedDict)
+        self.mincount = 0
+
+    def __getitem__(self, k):
+        with self.lock:
+            value = self.entries[k]
+            if self.ttl is not None and monotonic() > self.deadlines[k]:
+                self._remove(k)
+                raise KeyError(k)
+            if self.policy == "lru":
+                self.entries.move_to_end(k)
+            elif self.policy == "lfu":
+                self._bump(k)
+            return value
+
+    def __setitem__(self, k, value):
+        with self.lock:
+            if k in self.entries:
+                self._remove(k)
+            elif self.maxsize is not None and len(self.entries) >= self.maxsize:
+                self._evict()
+            self.entries[k] = value
+            if self.ttl is not None:
+                self.deadlines[k] = monotonic() + self.ttl
+            if self.policy == "lfu":
+                self.counts[k] = 1
+                self.buckets[1][k] = None
+                self.mincount = 1
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.deadlines.clear()
+            self.counts.clear()
+            self.buckets.clear()
+            self.mincount = 0
+
+    def _bump(self, k):
+        count = self.counts[k]
+        bucket = self.buckets[count]
+        del bucket[k]
+        if not bucket:
+            del self.buckets[count]
+            if self.mincount == count:
+                self.mincount = count + 1
+        self.counts[k] = count + 1
+        self.buckets[count + 1][k] = None
+
+    def _evict(self):
+        if self.policy == "lfu":
+            bucket = self.buckets[self.mincount]
+            k = next(iter(bucket))
+        else:
+            k = next(iter(self.entries))
+        self._remove(k)
+
+    def _remove(self, k):
+        del self.entries[k]
+        self.deadlines.pop(k, None)
+        if self.policy == "lfu":
+            count = self.counts.pop(k)
+            bucket = self.buckets[count]
+            del bucket[k]
+            if not bucket:
+                del self.buckets[count]
+            # `mincount` may now be stale. It is only needed when evicting, and the
+            # memo is no longer full, so the next insertion (which sets it) comes first.
+
 # --------------------------------------------------------------------------------
 
 # Parameter naming is consistent with `functools.partial`.
@@ -136,6 +427,23 @@ def partial(func: Callable, *args: Any, **kwargs: Any) -> Callable:
     To conveniently make regular calls of the function type-check arguments, too,
     see the decorator `unpythonic.dispatch.typed`.
     """
+    _check_partial_application(func, args, kwargs)
+
+    # `functools.partial` already handles chaining partial applications, so send only the new args/kwargs to it.
+    return functools_partial(func, *args, **kwargs)
+
+def _check_partial_application(func, args, kwargs, type_signature=None):
+    """Internal helper for `partial` and `curry`.
+
+    Type-check partially applying `func` to `args` and `kwargs`, and raise
+    `TypeError` if the check fails.
+
+    `type_signature`: the type hints of the underlying function, if already
+                      known. If `None`, computed here.
+
+    Return `type_signature`, so that a caller that checks more partial
+    applications of the same function can pass it in the next time.
+    """
     # HACK: As of Python 3.8, `typing.get_type_hints` does not know about `functools.partial` objects,
     # HACK: but those objects have `args` and `keywords` attributes, so we can extract what we need.
     # TODO: Maybe remove this hack if `typing.get_type_hints` gets support for `functools.partial` at some point.
@@ -162,8 +470,9 @@ def partial(func: Callable, *args: Any, **kwargs: Any) -> Callable:
         # but it's much more pythonic, if the type-checking `partial` works properly for code that does
         # not opt in to `unpythonic`'s multiple-dispatch subsystem.
         # TODO: There's some repeated error-reporting code in `unpythonic.dispatch`.
-        type_signature = get_type_hints(thecallable)
-        if type_signature:  # TODO: Python 3.8+: use walrus assignment here
+        if type_signature is None:
+            type_signature = get_type_hints(thecallable)
+        if type_signature:
             # Partial mode: allow leaving some parameters unbound.
             bound_arguments = _resolve_bindings(func, collected_args, collected_kwargs, _partial=True)
             # Allow having some parameters without type annotations, in which case those parameters
@@ -176,9 +485,7 @@ def partial(func: Callable, *args: Any, **kwargs: Any) -> Callable:
                                        for parameter, value, expected_type in mismatches]
                 mismatches_str = "; ".join(mismatches_list)
                 raise TypeError(f"When partially applying {description}:\nParameter binding(s) do not match type specification: {mismatches_str}")
-
-    # `functools.partial` already handles chaining partial applications, so send only the new args/kwargs to it.
-    return functools_partial(func, *args, **kwargs)
+    return type_signature
 
 # --------------------------------------------------------------------------------
 
@@ -193,6 +500,17 @@ def partial(func: Callable, *args: Any, **kwargs: Any) -> Callable:
 
 make_dynvar(curry_context=[])
 
+class _CurryState(local):
+    """Thread-local. How many saturated calls through the curry fast path are in progress.
+
+    The fast path does not push to `curry_context`, because reading or binding
+    a dynvar costs more than the rest of the call. This counter stands in for
+    the push, so that a curry call in the dynamic extent of such a call still
+    knows it is not the top-level curry context.
+    """
+    depth = 0
+_curry_state = _CurryState()
+
 def iscurried(f: Any) -> bool:
     """Return whether f is a curried function."""
     return hasattr(f, "_is_curried_function")
@@ -267,6 +585,11 @@ def curry(f, *args, _curry_force_call=False, _curry_allow_uninspectable=False, *
     Because it is a dynvar, it affects all ``curry`` calls in its dynamic extent,
     including ones inside library functions such as ``composerc`` or ``pipec``.
 
+    For performance, a call that binds all parameters of ``f``, with nothing
+    left over, calls ``f`` directly without pushing a new context. Inside ``f``,
+    ``curry`` still knows it is not the top-level context, but the curried
+    function is not on the ``curry_context`` list.
+
     **Curry itself is curried**:
 
     When invoked as a regular function (not decorator), curry itself is curried.
@@ -331,123 +654,37 @@ def curry(f, *args, _curry_force_call=False, _curry_allow_uninspectable=False, *
     # will perform the signature analysis.)
     if not (args or kwargs):
         try:
-            signature(f)
+            _get_binder(f).signature
         except ValueError as err:  # inspection failed in inspect.signature()?
             msg = err.args[0]
             if "no signature found" in msg:
                 return fallback()
             raise
 
+    # Precompiled fast path: when the arguments of a call bind all parameters of `f`, with
+    # nothing left over, there is no passthrough, so we can call `f` right away. This check
+    # is only valid for a plain callable; `@generic` functions and `functools.partial`
+    # objects need the full analysis in `_decide_curry_action`.
+    if isinstance(f, functools_partial) or isgeneric(f):
+        binder = None
+    else:
+        binder = _get_binder(f)
+    lazy = islazy(f)
+
     @wraps(f)
     def curried(*args, **kwargs):
-        outerctx = dyn.curry_context
-        with dyn.let(curry_context=(outerctx + [f])):
-            # In order to decide what to do when the curried function is called, we must first compute
-            # the parameter bindings. All of `f`'s parameters must be bound (whether by position or by
-            # name) before calling `f`.
-            #
-            # The parameter binding analysis result is needed for passthrough.
+        if binder is not None:
             try:
-                action, analysis = _decide_curry_action(f, args, kwargs)
+                saturated = binder.saturated(args, kwargs)
             except ValueError as err:  # inspection failed in inspect.signature()?
                 msg = err.args[0]
                 if "no signature found" in msg:
                     return fallback()
                 raise
-
-            if action is _call:
-                return maybe_force_args(f, *args, **kwargs)
-
-            elif action == _call_with_passthrough:
-                # To avoid subtle errors, we must pass the arguments the same way the user did:
-                #   - Any arguments passed to us positionally must be passed through positionally,
-                #   - Any arguments passed to us by name must be passed through by name.
-                #
-                # Note the impedance mismatch with our use of `functools.partial`; the `args`/`kwargs`
-                # here are **NOT** the full `args`/`kwargs`, but only the new ones from this step.
-                #
-                # We know these args/kwargs were extra when matched against the function's call signature:
-                later_args = analysis.extra_args
-                later_kwargs = analysis.extra_kwargs
-                # Hence, we should avoid passing **now** any args/kwargs that should be passed later:
-                if later_args:
-                    now_args = args[:-len(later_args)]
-                else:
-                    now_args = args
-                now_kwargs = {k: v for k, v in kwargs.items() if k not in later_kwargs}
-
-                now_result = maybe_force_args(f, *now_args, **now_kwargs)
-
-                # Inspect the return value(s).
-                #  - Inject the appropriate items to `later_args` and `later_kwargs`.
-                if isinstance(now_result, Values):  # multiple-return-values
-                    if now_result.rets:
-                        # `leftmost`, not `first`, for unambiguous stack traces.
-                        leftmost, *others = now_result.rets
-
-                        # Extra positional arguments (`later_args`) are passed through *on the right*.
-                        # Hence any further positional return values are inserted before them.
-                        if callable(leftmost):
-                            # If the leftmost return value is a callable, omit it from `later_args`,
-                            # since we will call it.
-                            later_args = tuple(others) + later_args
-                        else:
-                            later_args = (leftmost,) + tuple(others) + later_args
-                    else:
-                        # No positional return values; no changes to `later_args`.
-                        leftmost = None
-
-                    # In case of name conflicts, named return values override earlier extra named arguments.
-                    # (This follows the execution order: arguments were passed in, then the function ran.)
-                    # TODO: This way, or allow named arguments to override a named return value?
-                    # TODO: Which choice is more useful practically or mathematically?
-                    if now_result.kwrets:
-                        later_kwargs = {**later_kwargs, **now_result.kwrets}
-                else:
-                    # The only return value is also the leftmost one.
-                    leftmost = now_result
-                    if callable(leftmost):
-                        pass
-                    else:
-                        later_args = (leftmost,) + later_args
-
-                # If the first positional return value is a callable, curry it and recurse.
-                # Currying sustains the chain in case the next action is `_call_with_passthrough`
-                # or `_keep_currying`.
-                if callable(leftmost):
-                    if not iscurried(leftmost):
-                        leftmost = curry(leftmost)
-                    return maybe_force_args(leftmost, *later_args, **later_kwargs)
-
-                # The first positional return value is not a callable. Pass the return value(s) through
-                # to the curried procedure waiting in outerctx (e.g. in a curried compose chain).
-                #
-                # If there is no outer curry context (i.e. we are the top-level curry context),
-                # by default it is an error to have any args/kwargs left over, to avoid common
-                # human error. (To explicitly state such intent, `with dyn.let(curry_context=["whatever"])`.)
-                if not outerctx:
-                    num_positional_msg = f"{len(later_args)} positional"
-                    num_named_msg = f"{len(later_kwargs)} named"
-                    num_sep = " and " if later_args and later_kwargs else ""
-                    plural = "s" if len(later_args) + len(later_kwargs) != 1 else ""
-                    positional_msg = f"positional: {later_args}"
-                    named_msg = f"named: {later_kwargs}"
-                    sep = "; " if later_args and later_kwargs else ""
-                    raise TypeError(f"Top-level curry context exited with {num_positional_msg}{num_sep}{num_named_msg} argument{plural} remaining; {positional_msg}{sep}{named_msg}")
-                return Values(*later_args, **later_kwargs)
-
-            elif action is _keep_currying:
-                # Fail-fast: use our `partial` wrapper to type-check the partial call signature
-                # when we build the curried function. It delegates to `functools.partial` if the
-                # type check passes, and else raises a `TypeError` immediately.
-                p = partial(f, *args, **kwargs)
-                if islazy(f):
-                    p = passthrough_lazy_args(p)
-                return curry(p)
-
-            else:  # pragma: no cover
-                assert False, action
-    if islazy(f):
+            if saturated:
+                return _call_saturated(f, lazy, args, kwargs)
+        return _curry_step(f, binder, None, args, kwargs, fallback)
+    if lazy:
         curried = passthrough_lazy_args(curried)
     curried._is_curried_function = True  # stash for detection
     # curry itself is curried: if we get args, they're the first step
@@ -455,6 +692,212 @@ def curry(f, *args, _curry_force_call=False, _curry_allow_uninspectable=False, *
         return maybe_force_args(curried, *args, **kwargs)
     return curried
 
+def _call_saturated(f, lazy, args, kwargs):
+    """Internal helper for `curry`. Call `f`, whose parameters `args` and `kwargs` bind exactly.
+
+    `lazy`: whether `f` is marked for passthrough of lazy args.
+    """
+    state = _curry_state
+    state.depth += 1
+    try:
+        # Skip `maybe_force_args` when it would just call `f`.
+        if lazy or _allatoms(args, kwargs):
+            return f(*args, **kwargs)
+        return maybe_force_args(f, *args, **kwargs)
+    finally:
+        state.depth -= 1
+
+def _curry_step(f, binder, type_signature, args, kwargs, fallback=None):
+    """Internal helper for `curry`. Call `f`, pass arguments through, or keep currying.
+
+    `args` and `kwargs` are all the arguments collected so far in this chain
+    of partial applications.
+
+    `binder`: the `_Binder` of `f`, or `None` if `f` is a `functools.partial`
+              or a generic function. These always need the full analysis.
+
+    `type_signature`: the type hints of `f`, if already computed for this chain,
+                      else `None`.
+
+    `fallback`: what to do if the signature of `f` cannot be inspected.
+    """
+    # With fewer arguments than required parameters, no binding can be complete,
+    # so we know to keep currying without analyzing the bindings. This calls no
+    # user code, so there is no need to set up a curry context either.
+    if binder is not None and len(args) + len(kwargs) < binder.nrequired + len(binder.kwonly_required):
+        return _make_curried_partial(f, binder, type_signature, args, kwargs)
+
+    outerctx = dyn.curry_context
+    with dyn.let(curry_context=(outerctx + [f])):
+        # In order to decide what to do when the curried function is called, we must first compute
+        # the parameter bindings. All of `f`'s parameters must be bound (whether by position or by
+        # name) before calling `f`.
+        #
+        # The parameter binding analysis result is needed for passthrough.
+        try:
+            action, analysis = _decide_curry_action(f, args, kwargs)
+        except ValueError as err:  # inspection failed in inspect.signature()?
+            msg = err.args[0]
+            if fallback is not None and "no signature found" in msg:
+                return fallback()
+            raise
+
+        if action is _call:
+            return maybe_force_args(f, *args, **kwargs)
+
+        elif action == _call_with_passthrough:
+            # To avoid subtle errors, we must pass the arguments the same way the user did:
+            #   - Any arguments passed to us positionally must be passed through positionally,
+            #   - Any arguments passed to us by name must be passed through by name.
+            #
+            # Here `args`/`kwargs` are all those collected in this chain of partial applications.
+            # (If `f` itself is a `functools.partial`, that doesn't include the ones stored in it.)
+            #
+            # We know these args/kwargs were extra when matched against the function's call signature:
+            later_args = analysis.extra_args
+            later_kwargs = analysis.extra_kwargs
+            # Hence, we should avoid passing **now** any args/kwargs that should be passed later:
+            if later_args:
+                now_args = args[:-len(later_args)]
+            else:
+                now_args = args
+            now_kwargs = {k: v for k, v in kwargs.items() if k not in later_kwargs}
+
+            now_result = maybe_force_args(f, *now_args, **now_kwargs)
+
+            # Inspect the return value(s).
+            #  - Inject the appropriate items to `later_args` and `later_kwargs`.
+            if isinstance(now_result, Values):  # multiple-return-values
+                if now_result.rets:
+                    # `leftmost`, not `first`, for unambiguous stack traces.
+                    leftmost, *others = now_result.rets
+
+                    # Extra positional arguments (`later_args`) are passed through *on the right*.
+                    # Hence any further positional return values are inserted before them.
+                    if callable(leftmost):
+                        # If the leftmost return value is a callable, omit it from `later_args`,
+                        # since we will call it.
+                        later_args = tuple(others) + later_args
+                    else:
+                        later_args = (leftmost,) + tuple(others) + later_args
+                else:
+                    # No positional return values; no changes to `later_args`.
+                    leftmost = None
+
+                # In case of name conflicts, named return values override earlier extra named arguments.
+                # (This follows the execution order: arguments were passed in, then the function ran.)
+                # TODO: This way, or allow named arguments to override a named return value?
+                # TODO: Which choice is more useful practically or mathematically?
+                if now_result.kwrets:
+                    later_kwargs = {**later_kwargs, **now_result.kwrets}
+            else:
+                # The only return value is also the leftmost one.
+                leftmost = now_result
+                if callable(leftmost):
+                    pass
+                else:
+                    later_args = (leftmost,) + later_args
+
+            # If the first positional return value is a callable, curry it and recurse.
+            # Currying sustains the chain in case the next action is `_call_with_passthrough`
+            # or `_keep_currying`.
+            if callable(leftmost):
+                if not iscurried(leftmost):
+                    leftmost = curry(leftmost)
+                return maybe_force_args(leftmost, *later_args, **later_kwargs)
+
+            # The first positional return value is not a callable. Pass the return value(s) through
+            # to the curried procedure waiting in outerctx (e.g. in a curried compose chain).
+            #
+            # If there is no outer curry context (i.e. we are the top-level curry context),
+            # by default it is an error to have any args/kwargs left over, to avoid common
+            # human error. (To explicitly state such intent, `with dyn.let(curry_context=["whatever"])`.)
+            if not outerctx and not _curry_state.depth:
+                num_positional_msg = f"{len(later_args)} positional"
+                num_named_msg = f"{len(later_kwargs)} named"
+                num_sep = " and " if later_args and later_kwargs else ""
+                plural = "s" if len(later_args) + len(later_kwargs) != 1 else ""
+                positional_msg = f"positional: {later_args}"
+                named_msg = f"named: {later_kwargs}"
+                sep = "; " if later_args and later_kwargs else ""
+                raise TypeError(f"Top-level curry context exited with {num_positional_msg}{num_sep}{num_named_msg} argument{plural} remaining; {positional_msg}{sep}{named_msg}")
+            return Values(*later_args, **later_kwargs)
+
+        elif action is _keep_currying:
+            return _make_curried_partial(f, binder, type_signature, args, kwargs)
+
+        else:  # pragma: no cover
+            assert False, action
+
+def _make_curried_partial(f, binder, type_signature, args, kwargs):
+    """Internal helper for `curry`. Partially apply `f` to the arguments collected so far."""
+    # Fail-fast: type-check the partial call signature when we build the partial
+    # application, like our `partial` wrapper does.
+    type_signature = _check_partial_application(f, args, kwargs, type_signature)
+    cls = _LazyCurriedPartial if islazy(f) else _CurriedPartial
+    return cls(f, args, kwargs, binder, type_signature)
+
+# A partial application of a curried function.
+#
+# Created by `curry` when a call does not yet bind all parameters. The arguments
+# collected so far are stored flat, so each further step just extends them, and
+# the signature analysis of the original function is reused.
+#
+# For introspection, `__name__`, `__qualname__` and `__doc__` are those of the original
+# function, and like a function, this binds as a method when stored as a class attribute.
+# (Hence no docstring; `__doc__` is a property.)
+class _CurriedPartial:
+    __slots__ = ("func", "args", "kwargs", "binder", "type_signature", "__weakref__")
+    _is_curried_function = True  # for `iscurried`
+    _lazy = False
+
+    def __init__(self, func, args, kwargs, binder, type_signature):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.binder = binder
+        self.type_signature = type_signature
+
+    def __call__(self, *args, **kwargs):
+        args = self.args + args
+        kwargs = {**self.kwargs, **kwargs} if kwargs else self.kwargs
+        binder = self.binder
+        if binder is not None and binder.saturated(args, kwargs):
+            return _call_saturated(self.func, self._lazy, args, kwargs)
+        return _curry_step(self.func, binder, self.type_signature, args, kwargs)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+    @property
+    def __signature__(self):
+        return signature(functools_partial(self.func, *self.args, **self.kwargs))
+
+    @property
+    def __name__(self):
+        return getattr(self.func, "__name__", "curried")
+
+    @property
+    def __doc__(self):
+        return getattr(self.func, "__doc__", None)
+
+    def __getattr__(self, name):  # a class cannot have a `__qualname__` property
+        if name == "__qualname__":
+            return getattr(self.func, "__qualname__", self.__name__)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __repr__(self):  # pragma: no cover
+        return f"<curried partial application of {self.func!r}, args={self.args!r}, kwargs={self.kwargs!r}>"
+
+# A `_CurriedPartial` of a function marked for passthrough of lazy args.
+class _LazyCurriedPartial(_CurriedPartial):
+    __slots__ = ()
+    __doc__ = _CurriedPartial.__dict__["__doc__"]  # else `type` sets it to `None` here
+    _passthrough_lazy_args = True  # for `islazy`
+    _lazy = True
+
 @passthrough_lazy_args
 def _currycall(f, *args, **kwargs):
     """Co-operate with unpythonic.syntax.autocurry.
@@ -506,7 +949,7 @@ def _decide_curry_action(f, args, kwargs):
 
     def _bind_arguments(thecallable):
         # For this check we look for a complete match, hence `_partial=False`.
-        bound_arguments, unbound_parameters, (extra_args, extra_kwargs) = _bind(signature(thecallable),
+        bound_arguments, unbound_parameters, (extra_args, extra_kwargs) = _bind(_get_binder(thecallable).signature,
                                                                                 collected_args,
                                                                                 collected_kwargs,
                                                                                 partial=False)
@@ -557,23 +1000,24 @@ def _decide_curry_action(f, args, kwargs):
     multimethods = _list_multimethods(function,
                                       _extract_self_or_cls(function,
                                                            collected_args))
+    policy = getattr(function, "_typecheck_policy", None)
     # Step 1: exact match
     for thecallable, type_signature in multimethods:
         analysis = _bind_arguments(thecallable)
         if not analysis.unbound_parameters and not analysis.extra_args and not analysis.extra_kwargs:
-            if not _get_argument_type_mismatches(type_signature, analysis.bound_arguments):
+            if not _get_argument_type_mismatches(type_signature, analysis.bound_arguments, policy=policy):
                 return _call, analysis
     # Step 2: complete match, with extra args/kwargs
     for thecallable, type_signature in multimethods:
         analysis = _bind_arguments(thecallable)
         if not analysis.unbound_parameters and (analysis.extra_args or analysis.extra_kwargs):
-            if not _get_argument_type_mismatches(type_signature, analysis.bound_arguments):
+            if not _get_argument_type_mismatches(type_signature, analysis.bound_arguments, policy=policy):
                 return _call_with_passthrough, analysis
     # Step 3: partial match
     for thecallable, type_signature in multimethods:
         analysis = _bind_arguments(thecallable)
         if analysis.unbound_parameters:
-            if not _get_argument_type_mismatches(type_signature, analysis.bound_arguments):
+            if not _get_argument_type_mismatches(type_signature, analysis.bound_arguments, policy=policy):
                 return _keep_currying, analysis
     # No matter which multimethod we pick, at least one parameter gets a binding
     # that fails the type check.
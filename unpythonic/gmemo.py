@@ -6,18 +6,24 @@ or iterators created by factory functions."""
 
 __all__ = ["gmemoize", "imemoize", "fimemoize"]
 
+from array import array
 from collections.abc import Callable, Generator, Iterable, Iterator
-from functools import wraps
-from threading import RLock
+from functools import wraps, partial
+import mmap
+import pickle
+import tempfile
+from threading import Lock, RLock
 from typing import Any, TypeVar
+from weakref import WeakSet
 
-from .arity import resolve_bindings, tuplify_bindings
+from .arity import _Binder
 from .regutil import register_decorator
 from .symbol import sym
 
 F = TypeVar('F', bound=Callable)
 
-def gmemoize(gfunc: F) -> F:
+def gmemoize(gfunc: F | None = None, *, store: Any = None, window: int | None = None,
+             spill: int | None = None) -> F:
     """Decorator: produce memoized generator instances.
 
     Similar to ``itertools.tee``, but the whole sequence is kept in memory
@@ -35,17 +41,53 @@ def gmemoize(gfunc: F) -> F:
       - Any exceptions raised by the generator (except StopIteration) are also
         memoized, like in ``memoize``.
 
-      - Thread-safe. Calls to ``next`` on the memoized generator from different
-        threads are serialized via a lock. Each memoized sequence has its own
-        lock. This uses ``threading.RLock``, so re-entering from the same
-        thread (e.g. in recursively defined sequences) is fine.
+      - Thread-safe. Reading an item that is already memoized takes no lock, so
+        threads reading the memoized part of a sequence do not wait for each
+        other. Only advancing the underlying generator is serialized, via a
+        lock; each memoized sequence has its own lock. This uses
+        ``threading.RLock``, so re-entering from the same thread (e.g. in
+        recursively defined sequences) is fine.
+
+        To read many items at once, use the ``take_memoized(start, stop)``
+        method of a memoized generator instance. It copies the already computed
+        items in one step, without advancing the instance.
 
       - For infinite sequences, use this only if you can guarantee only a
-        reasonable number of terms will ever be evaluated (w.r.t. available RAM).
+        reasonable number of terms will ever be evaluated (w.r.t. available RAM),
+        or use one of the bounded modes below.
 
       - Typically, this should be the outermost decorator if several are used
         on the same gfunc.
 
+      - To keep the memoized sequences in a memo store instead of in memory,
+        e.g. on disk in a ``DiskMemo``, use the parametric form
+        ``@gmemoize(store=...)``. See ``memoize`` for what a memo store is.
+
+        Each item is stored separately, so a sequence can be continued where
+        an earlier run of the program left off. In that case, the generator
+        is re-run (and the already stored items are skipped) when the first
+        item not yet in the store is needed.
+
+      - ``@gmemoize(window=n)``: keep only the last ``n`` items (at most ``2 * n``,
+        since they are dropped in batches) of each memoized sequence in memory,
+        and drop older ones once no live instance still needs them. An instance
+        needs the items it has not yet reached, so an instance that lags behind
+        keeps them alive until it advances, or is garbage collected.
+
+        A new instance starts from the oldest item still kept, not necessarily
+        from the beginning of the sequence. Indexing a dropped item raises
+        ``IndexError``. Hence this is meant for long streams whose history
+        is not needed, not for e.g. recursively defined sequences that
+        re-read their own beginning.
+
+      - ``@gmemoize(spill=n)``: keep between ``n`` and ``2 * n`` of the latest
+        items of each memoized sequence in memory; spill older ones to a temporary
+        file, in chunks of ``n``, and memory-map them back when they are read.
+        Nothing is lost, but reading a spilled item unpickles it, so the items
+        (and the memoized exceptions) must be picklable.
+
+      At most one of ``store``, ``window`` and ``spill`` can be given.
+
     Usage::
 
         evals = 0
@@ -95,16 +137,188 @@ def gmemoize(gfunc: F) -> F:
 
     See also ``imemoize``, ``fimemoize``.
     """
+    if gfunc is None:
+        return partial(gmemoize, store=store, window=window, spill=spill)
+    if sum(x is not None for x in (store, window, spill)) > 1:
+        raise ValueError("At most one of `store`, `window` and `spill` can be given")
+    if window is not None and (not isinstance(window, int) or window < 1):
+        raise ValueError(f"`window` must be a positive integer or `None`, got {repr(window)}")
+    if spill is not None and (not isinstance(spill, int) or spill < 1):
+        raise ValueError(f"`spill` must be a positive integer or `None`, got {repr(spill)}")
     memos: dict[tuple, tuple] = {}
+    binder = _Binder(gfunc)
     @wraps(gfunc)
     def gmemoized(*args: Any, **kwargs: Any) -> "_MemoizedGenerator":
-        k = tuplify_bindings(resolve_bindings(gfunc, *args, **kwargs))
+        k = binder.key(args, kwargs)
         if k not in memos:
             # underlying generator instance, memo instance, lock instance
-            memos[k] = (gfunc(*args, **kwargs), [], RLock())
-        return _MemoizedGenerator(*memos[k])
+            if store is not None:
+                memo = _StoredMemo(store, k)
+                memos[k] = (_resume(gfunc(*args, **kwargs), len(memo)), memo, RLock())
+            elif window is not None:
+                memos[k] = (gfunc(*args, **kwargs), _WindowMemo(window), RLock())
+            elif spill is not None:
+                memos[k] = (gfunc(*args, **kwargs), _SpillMemo(spill), RLock())
+            else:
+                memos[k] = (gfunc(*args, **kwargs), [], RLock())
+        g = _MemoizedGenerator(*memos[k])
+        if window is not None:
+            g.memo.register(g)
+        return g
     return gmemoized
 
+class _StoredMemo:
+    """One memoized sequence, kept in a memo store. Co-operates with gmemoize.
+
+    Supports the subset of the `list` API that `_MemoizedGenerator` uses.
+    Item `j` is stored under the key `(k, j)`, and the length under `(k, "length")`.
+    """
+    def __init__(self, store: Any, k: tuple) -> None:
+        self.store = store
+        self.k = k
+        try:
+            self.length = store[(k, "length")]
+        except KeyError:
+            self.length = 0
+    def __len__(self) -> int:
+        return self.length
+    def __getitem__(self, j: int | slice) -> Any:
+        if isinstance(j, slice):
+            return [self.store[(self.k, i)] for i in range(*j.indices(self.length))]
+        if j < 0:
+            j += self.length
+        if not 0 <= j < self.length:
+            raise IndexError(f"stored memo index out of range; got {j}, with {self.length} items")
+        return self.store[(self.k, j)]
+    def append(self, item: tuple) -> None:
+        self.store[(self.k, self.length)] = item
+        self.length += 1
+        self.store[(self.k, "length")] = self.length  # only after the item is in
+
+class _WindowMemo:
+    """One memoized sequence, keeping only its latest items. Co-operates with gmemoize.
+
+    Supports the subset of the `list` API that `_MemoizedGenerator` uses, with
+    indices counted from the beginning of the sequence, also for dropped items.
+
+    Items older than the last `window` ones are dropped, unless a registered reader
+    has not reached them yet. To keep `append` cheap, this is done once per `window`
+    appended items.
+    """
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.items: list = []
+        self.head = 0  # items[:head] are dropped, but not yet deleted
+        self.base = 0  # index of items[head] in the sequence
+        self.readers: WeakSet = WeakSet()
+        self.pending = 0  # items appended since the last drop
+        self.lock = Lock()
+    def register(self, reader: "_MemoizedGenerator") -> None:
+        """Start `reader` at the oldest item kept, and keep the items it has not reached."""
+        with self.lock:
+            reader.j = self.base
+            self.readers.add(reader)
+    def __len__(self) -> int:
+        return self.base + len(self.items) - self.head
+    def __getitem__(self, j: int | slice) -> Any:
+        with self.lock:
+            length = len(self)
+            if isinstance(j, slice):
+                return [self._get(i, length) for i in range(*j.indices(length))]
+            if j < 0:
+                j += length
+            return self._get(j, length)
+    def _get(self, j: int, length: int) -> Any:
+        if not self.base <= j < length:
+            if 0 <= j < self.base:
+                raise IndexError(f"memoized sequence item {j} has been dropped; the window holds items {self.base} to {length - 1}")
+            raise IndexError(f"memoized sequence index out of range; got {j}, with {length} items")
+        return self.items[self.head + j - self.base]
+    def append(self, item: tuple) -> None:
+        with self.lock:
+            self.items.append(item)
+            self.pending += 1
+            if self.pending < self.window:
+                return
+            self.pending = 0
+            length = len(self)
+            keep = length - self.window  # index of the oldest item to keep
+            for reader in self.readers:
+                keep = min(keep, reader.j)
+            if keep > self.base:
+                self.head += keep - self.base
+                self.base = keep
+                if self.head > len(self.items) // 2:  # delete in bulk, amortized O(1) per item
+                    del self.items[:self.head]
+                    self.head = 0
+
+class _SpillMemo:
+    """One memoized sequence, with older items spilled to disk. Co-operates with gmemoize.
+
+    Supports the subset of the `list` API that `_MemoizedGenerator` uses.
+
+    The latest items are kept in memory. When there are `2 * chunksize` of them,
+    the oldest `chunksize` are pickled, and appended to a temporary file, which
+    is memory-mapped for reading.
+    """
+    def __init__(self, chunksize: int) -> None:
+        self.chunksize = chunksize
+        self.items: list = []  # in memory, from index `spilled` on
+        self.spilled = 0
+        self.file = None
+        self.offsets = array("Q", [0])  # start of each spilled item in the file, and end of the last one
+        self.map = None
+        self.lock = Lock()
+    def __len__(self) -> int:
+        return self.spilled + len(self.items)
+    def __getitem__(self, j: int | slice) -> Any:
+        with self.lock:
+            length = len(self)
+            if isinstance(j, slice):
+                return [self._get(i) for i in range(*j.indices(length))]
+            if j < 0:
+                j += length
+            if not 0 <= j < length:
+                raise IndexError(f"memoized sequence index out of range; got {j}, with {length} items")
+            return self._get(j)
+    def _get(self, j: int) -> Any:
+        if j >= self.spilled:
+            return self.items[j - self.spilled]
+        end = self.offsets[j + 1]
+        if self.map is None or len(self.map) < end:  # the file has grown since we mapped it
+            if self.map is not None:
+                self.map.close()
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        failed, value = pickle.loads(self.map[self.offsets[j]:end])
+        return (_fail if failed else _success, value)
+    def append(self, item: tuple) -> None:
+        with self.lock:
+            self.items.append(item)
+            if len(self.items) >= 2 * self.chunksize:
+                self._spill()
+    def _spill(self) -> None:
+        # The tag as a bool, since pickling a `sym` is much slower.
+        chunk = [pickle.dumps((kind is _fail, value)) for kind, value in self.items[:self.chunksize]]
+        if self.file is None:
+            self.file = tempfile.TemporaryFile()  # noqa: SIM115 -- lives as long as the memo
+        self.file.seek(0, 2)
+        self.file.write(b"".join(chunk))
+        self.file.flush()
+        for data in chunk:
+            self.offsets.append(self.offsets[-1] + len(data))
+        del self.items[:self.chunksize]
+        self.spilled += self.chunksize
+
+def _resume(g: Generator, n: int) -> Generator:
+    """Wrap generator `g`, skipping its first `n` items (when the first item is requested)."""
+    def resumed():
+        for _ in range(n):
+            next(g)
+        yield from g
+    out = resumed()
+    out.__name__ = g.__name__  # for `_MemoizedGenerator.__repr__`
+    return out
+
 _success = sym("_success")
 _fail = sym("_fail")
 class _MemoizedGenerator:
@@ -122,20 +336,56 @@ class _MemoizedGenerator:
     def __next__(self) -> Any:
         j = self.j
         memo = self.memo
-        with self.lock:
-            if j < len(memo):
-                result = memo[j]
-            else:
-                try:
-                    result = (_success, next(self.g))
-                except BaseException as err:  # StopIteration propagates, not a BaseException
-                    result = (_fail, err)
-                memo.append(result)
-            kind, value = result
-            self.j += 1
-            if kind is _fail:
-                raise value
-            return value
+        # Memoized items never change, so reading one needs no lock. Every memo
+        # type updates its length so that it may lag, but never lead, the items
+        # actually available, so if we see `j` in range, item `j` is there.
+        if j < len(memo):
+            kind, value = memo[j]
+        else:
+            with self.lock:
+                # Another thread may have advanced the generator just before us.
+                kind, value = memo[j] if j < len(memo) else self._advance()
+        self.j = j + 1
+        if kind is _fail:
+            raise value
+        return value
+    def _advance(self) -> tuple:
+        """Compute the next item, and add it to the memo. Call with `self.lock` held."""
+        try:
+            result = (_success, next(self.g))
+        except BaseException as err:  # StopIteration, too; it marks the end of the sequence
+            result = (_fail, err)
+        self.memo.append(result)
+        return result
+    def take_memoized(self, start: int, stop: int) -> list:
+        """Return the items `start` to `stop - 1` of the sequence, as a list.
+
+        Like ``list(islice(...))``, but reads the memo directly, copying the
+        already computed items in one step. Items not computed yet are computed
+        first. If the sequence ends before `stop`, the result is shorter.
+
+        If one of the items is a memoized exception, it is raised.
+
+        This does not advance this instance.
+        """
+        if not (isinstance(start, int) and isinstance(stop, int)) or start < 0 or stop < 0:
+            raise ValueError(f"Expected non-negative int `start` and `stop`, got {repr(start)} and {repr(stop)}")
+        memo = self.memo
+        if stop > len(memo):
+            with self.lock:
+                # Don't advance past the end of the sequence, which is memoized as a `StopIteration`.
+                if not (len(memo) and memo[-1][0] is _fail):
+                    while len(memo) < stop and self._advance()[0] is not _fail:
+                        pass
+        items = memo[start:stop]
+        values = [value for kind, value in items if kind is _success]
+        if len(values) < len(items):  # there is a memoized exception
+            for kind, value in items:
+                if kind is _fail:
+                    if isinstance(value, StopIteration):
+                        return values
+                    raise value
+        return values
     # Support a subset of the `collections.abc.Sequence` API for already-computed items
     def __len__(self) -> int:
         return len(self.memo)
@@ -194,7 +444,8 @@ def imemoize(iterable: Iterable) -> Callable:
     return iterable_as_gfunc
 
 @register_decorator(priority=10)
-def fimemoize(ifactory: F) -> F:
+def fimemoize(ifactory: F | None = None, *, store: Any = None, window: int | None = None,
+              spill: int | None = None) -> F:
     """Like imemoize, but for cases where creating the iterable needs arguments.
 
     ``ifactory`` is a function, which takes any number of positional or keyword
@@ -209,6 +460,8 @@ def fimemoize(ifactory: F) -> F:
 
     The return value is a gfunc, which takes the same arguments as ``ifactory``.
 
+    ``store``, ``window`` and ``spill`` are passed on to ``gmemoize``.
+
     Example::
 
         def evens():
@@ -233,8 +486,10 @@ def fimemoize(ifactory: F) -> F:
         some_evens = fimemoize(lambda n: drop(n, evens()))
         assert last(some_evens(25)) == last(some_evens(25))
     """
+    if ifactory is None:
+        return partial(fimemoize, store=store, window=window, spill=spill)
     @wraps(ifactory)
     def gfunc(*args: Any, **kwargs: Any) -> Iterator:
         yield from ifactory(*args, **kwargs)
-    return gmemoize(gfunc)
+    return gmemoize(gfunc, store=store, window=window, spill=spill)
     # return gmemoize(lambda *a, **kw: (yield from ifactory(*a, **kw)))
@@ -4,7 +4,7 @@
 __all__ = ["gtco", "gtrampolined"]
 
 from collections.abc import Callable, Generator
-from functools import wraps
+from functools import partial, wraps
 from inspect import isgenerator
 from typing import Any, TypeVar
 
@@ -23,6 +23,10 @@ def gtco(generator: Generator) -> Generator:
             return march()  # tail-chain to a new instance of itself
         assert tuple(take(6, gtco(march()))) == (1, 2, 1, 2, 1, 2)
         last(take(10000, gtco(march())))  # no crash
+
+    The return value is a generator. Values passed in with ``send``, and
+    exceptions passed in with ``throw``, go to the generator that is currently
+    running in the chain.
     """
     while True:  # trampoline
         x = yield from generator  # yield stuff, get final result (return ...)
@@ -38,7 +42,7 @@ def gtco(generator: Generator) -> Generator:
             except TypeError:
                 return x  # passthrough
 
-def gtrampolined(gfunc: F) -> F:
+def gtrampolined(gfunc: F | None = None, *, flat: bool = False) -> F:
     """Decorator for generator functions (i.e. definitions of generators).
 
     Decorating the definition avoids the need to use ``gtco`` at call time.
@@ -51,7 +55,36 @@ def gtrampolined(gfunc: F) -> F:
             return ones()
         assert tuple(take(10, ones())) == (1,) * 10
         last(take(10000, ones()))  # no crash
+
+    By default, calling the decorated function returns an iterable, which
+    starts the trampoline when it is iterated over.
+
+    With ``@gtrampolined(flat=True)``, calling the decorated function returns
+    a generator object (a ``collections.abc.Generator``), which can also be
+    advanced with ``next``, and supports ``send``, ``throw`` and ``close``.
+    These go to the generator that is currently running in the chain. Like
+    in the default mode, when a generator tail-chains into another decorated
+    one that has not been started, the same trampoline runs the new generator,
+    so a chain of any number of handoffs costs one level of ``yield from``
+    per item::
+
+        @gtrampolined(flat=True)
+        def echo():
+            x = yield
+            while x is not None:
+                x = yield x
+            return echo()  # on `None`, restart
+        g = echo()
+        next(g)
+        assert g.send(1) == 1
     """
+    if gfunc is None:  # parametric form, `@gtrampolined(flat=...)`
+        return partial(gtrampolined, flat=flat)
+    if flat:
+        @wraps(gfunc)
+        def flat_trampolining_gfunc(*args: Any, **kwargs: Any) -> "_FlatTrampolinedGenerator":
+            return _FlatTrampolinedGenerator(gfunc(*args, **kwargs))
+        return flat_trampolining_gfunc
     @wraps(gfunc)
     def trampolining_gfunc(*args: Any, **kwargs: Any) -> "_TrampolinedGenerator":
         generator = gfunc(*args, **kwargs)
@@ -66,3 +99,27 @@ class _TrampolinedGenerator:
         return gtco(iter(self.g))  # start the trampoline
     # no __next__, because __iter__ redirects;
     # this wrapper is never actually iterated over.
+
+class _FlatTrampolinedGenerator(_TrampolinedGenerator, Generator):
+    """Like `_TrampolinedGenerator`, but also supports the generator API.
+
+    The trampoline is started on first use. Before that, a trampoline that
+    tail-chains into this runs `g` itself, like for `_TrampolinedGenerator`.
+    After that, `g` is the trampoline, so a tail-chain into this continues it.
+    """
+    started = False  # no `__init__`, to keep the handoffs cheap
+    def _start(self) -> Generator:
+        if not self.started:
+            self.g = gtco(self.g)
+            self.started = True
+        return self.g
+    def __iter__(self) -> Generator:
+        return self._start()  # iterate the trampoline directly, with no per-item overhead
+    def __next__(self) -> Any:
+        return next(self._start())
+    def send(self, value: Any) -> Any:
+        return self._start().send(value)
+    def throw(self, *args: Any) -> Any:
+        return self._start().throw(*args)
+    def close(self) -> None:
+        self.g.close()
@@ -8,6 +8,8 @@ upon which other regular code is allowed to depend.
 __all__ = ["Lazy", "force1", "force",  # intended also for end-users
            "islazy", "maybe_force_args", "passthrough_lazy_args"]  # mostly for use inside `unpythonic`
 
+from types import BuiltinFunctionType, FunctionType, MethodType
+
 from .regutil import register_decorator
 from .dynassign import make_dynvar
 from .symbol import sym
@@ -110,6 +112,26 @@ def islazy(f):
     # special-case "_let" for lazify/curry combo when let[] expressions are present
     return hasattr(f, "_passthrough_lazy_args") or (hasattr(f, "__name__") and f.__name__ == "_let")
 
+# Types whose instances are atoms that are not promises, so `force` returns them as-is.
+# Checked by exact type, so that the check is cheap.
+_atomic_types = frozenset((int, float, complex, bool, str, bytes, type(None),
+                           FunctionType, BuiltinFunctionType, MethodType))
+
+def _allatoms(args, kwargs):
+    """Internal. Return whether `force` has nothing to do for `args` and `kwargs`.
+
+    True when every argument is an atom of a type in `_atomic_types`. Containers
+    (which `force` would have to look into) and promises make this return False.
+    """
+    for x in args:
+        if type(x) not in _atomic_types:
+            return False
+    if kwargs:
+        for x in kwargs.values():
+            if type(x) not in _atomic_types:
+                return False
+    return True
+
 def maybe_force_args(f, *thunks, **kwthunks):
     """Internal. Helps calling strict functions from inside a ``with lazify`` block.
 
@@ -119,7 +141,7 @@ def maybe_force_args(f, *thunks, **kwthunks):
     if f is jump:  # special case to avoid drastic performance hit in TCO'd strict code
         target, *argthunks = thunks
         return jump(force1(target), *argthunks, **kwthunks)
-    if islazy(f):
+    if islazy(f) or _allatoms(thunks, kwthunks):
         return f(*thunks, **kwthunks)
     return f(*force(thunks), **force(kwthunks))
 
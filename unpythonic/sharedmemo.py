@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""Memo storage in shared memory, for sharing a memo between processes.
+
+See `unpythonic.diskmemo` for what a memo store is.
+"""
+
+__all__ = ["SharedMemo"]
+
+from contextlib import contextmanager
+import errno
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import os
+import pickle
+import secrets
+import struct
+import sys
+import tempfile
+import threading
+from typing import Any, Iterator
+import weakref
+
+from .diskmemo import _keyhash
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover, not a POSIX system
+    fcntl = None
+
+# Segment layout: header, then a hash table of `nslots` slots, with linear probing,
+# then the records. Each slot is (key hash, record offset); an offset of 0 marks an
+# empty slot. Records are (key length, value length, key, value), allocated from
+# the start of the free space, and never moved until the store is cleared.
+_MAGIC = b"UNPYMSHM"
+_header = struct.Struct("<8sQQQQ")  # magic, nslots, nstripes, count, end of records
+_slot = struct.Struct("<QQ")
+_record_header = struct.Struct("<II")
+
+class SharedMemo:
+    """A memo store in shared memory, for sharing a memo between processes.
+
+    Usage::
+
+        from unpythonic import memoize, SharedMemo
+
+        @memoize(store=SharedMemo("myjob-expensive"))
+        def expensive(x):
+            ...
+
+    Then use `expensive` in worker processes, e.g. with `multiprocessing` or
+    `concurrent.futures.ProcessPoolExecutor`. Whether the workers are forked
+    (inheriting the store) or spawned (importing the module again, and attaching
+    to the store by name), they all share the same memo.
+
+    With `memoize`, each value is computed only once, also across processes:
+    while a process computes the value for a key, other processes that need
+    the same value wait for it. See `keylock`.
+
+    `name`: Name of the shared memory segment. If a segment with this name exists,
+            attach to it; else create it. If `None`, create a segment with a new,
+            random name, available as the `name` attribute.
+
+    `size`: Size of the segment, in bytes, if it is created. The segment cannot
+            grow. When it is full, further values are not stored; they are computed
+            again whenever they are needed. The hash index takes about an eighth of
+            the space.
+
+    `serializer`: An object with the functions `dumps(obj) -> bytes` and `loads(bytes) -> obj`,
+                  used for the values. Default is the `pickle` module. All processes
+                  sharing the store must use the same one.
+
+    `stripes`: Number of locks in the lock table used by `keylock`, if the segment
+               is created. Keys are mapped to the locks by hash, so with fewer
+               locks, computations for different keys wait for each other more often.
+
+    Keys are serialized with `pickle` for hashing, so they must be picklable,
+    and serialize to the same bytes in every process (true of e.g. numbers,
+    strings, and tuples of them). The full serialized key is stored too, and
+    compared on lookup, so hash collisions cannot return a wrong value.
+
+    Access is serialized with POSIX record locks (`fcntl.lockf`) on a lock file
+    in the temporary directory. (On systems without `fcntl`, only threads of one
+    process are serialized, so sharing the store between processes is not safe.)
+
+    The segment stays in existence until `unlink` is called, or the process that
+    created it exits (courtesy of the `multiprocessing` resource tracker of that
+    process). Processes that attach to an existing segment never destroy it.
+
+    Use a separate store for each memoized function, since the memo keys do not
+    identify the function.
+    """
+    def __init__(self, name: str | None = None, *, size: int = 2**24, serializer: Any = pickle,
+                 stripes: int = 1024) -> None:
+        if size < 4096:
+            raise ValueError(f"`size` must be at least 4096, got {size}")
+        if stripes < 1:
+            raise ValueError(f"`stripes` must be positive, got {stripes}")
+        if name is None:
+            name = f"unpythonic_{secrets.token_hex(8)}"
+        self.name = name
+        self.serializer = serializer
+        self._lockfile = os.path.join(tempfile.gettempdir(), f"{name}.unpythonic-lock")
+        self._lock_fd = os.open(self._lockfile, os.O_RDWR | os.O_CREAT, 0o600)
+        self._reinit_locks()
+        self._buf = None
+        with self._locked(exclusive=True, check=False):
+            try:
+                self._shm = SharedMemory(name, create=True, size=size)
+            except FileExistsError:
+                self._shm = _attach(name)
+                self._buf = self._shm.buf
+            else:
+                self._buf = self._shm.buf
+                # Slots for at most an eighth of the space, as a power of two.
+                nslots = 1 << ((size // (8 * _slot.size)).bit_length() - 1)
+                _header.pack_into(self._buf, 0, _MAGIC, nslots, stripes, 0, self._records_start(nslots))
+        magic, _, self.stripes, _, _ = _header.unpack_from(self._buf, 0)
+        if magic != _MAGIC:
+            self._close()
+            raise ValueError(f"shared memory segment {name!r} is not a SharedMemo")
+        self._stripe_mutexes = [threading.Lock() for _ in range(self.stripes)]
+        self._stripe_counts = [0] * self.stripes
+        _instances.add(self)
+
+    def __repr__(self) -> str:
+        return f"<SharedMemo {self.name!r}>"
+
+    def close(self) -> None:
+        """Detach from the segment. The store cannot be used after this."""
+        with self._lock:
+            if self._buf is not None:
+                self._close()
+
+    def unlink(self) -> None:
+        """Destroy the segment, and the lock file. Then close the store.
+
+        Other processes that are attached to the segment can still use it,
+        until they close it.
+        """
+        with self._lock:
+            self._shm.unlink()
+            try:
+                os.unlink(self._lockfile)
+            except FileNotFoundError:  # pragma: no cover, already unlinked by another process
+                pass
+            self.close()
+
+    def __enter__(self) -> "SharedMemo":
+        return self
+
+    def __exit__(self, exctype: Any, excvalue: Any, traceback: Any) -> None:
+        self.close()
+
+    # --------------------------------------------------------------------------------
+    # The memo store API
+
+    def __getitem__(self, k: Any) -> Any:
+        keybytes, h = self._hash(k)
+        with self._locked(exclusive=False):
+            _, offset, value = self._find(keybytes, h)
+            if offset is None:
+                raise KeyError(k)
+        return self.serializer.loads(value)
+
+    def __setitem__(self, k: Any, value: Any) -> None:
+        keybytes, h = self._hash(k)
+        valuebytes = self.serializer.dumps(value)
+        record = _record_header.pack(len(keybytes), len(valuebytes)) + keybytes + valuebytes
+        with self._locked(exclusive=True):
+            buf = self._buf
+            j, offset, _ = self._find(keybytes, h, read_value=False)
+            _, nslots, stripes, count, end = _header.unpack_from(buf, 0)
+            isnew = offset is None
+            if (isnew and 2 * (count + 1) > nslots) or end + len(record) > len(buf):
+                return  # full
+            buf[end:end + len(record)] = record
+            _slot.pack_into(buf, _header.size + j * _slot.size, h, end)
+            _header.pack_into(buf, 0, _MAGIC, nslots, stripes, count + isnew, end + len(record))
+
+    def __contains__(self, k: Any) -> bool:
+        keybytes, h = self._hash(k)
+        with self._locked(exclusive=False):
+            _, offset, _ = self._find(keybytes, h, read_value=False)
+        return offset is not None
+
+    def __len__(self) -> int:
+        with self._locked(exclusive=False):
+            _, _, _, count, _ = _header.unpack_from(self._buf, 0)
+        return count
+
+    def clear(self) -> None:
+        """Delete all entries, for all processes sharing the store."""
+        with self._locked(exclusive=True):
+            buf = self._buf
+            _, nslots, stripes, _, _ = _header.unpack_from(buf, 0)
+            start = self._records_start(nslots)
+            buf[_header.size:start] = bytes(start - _header.size)
+            _header.pack_into(buf, 0, _MAGIC, nslots, stripes, 0, start)
+
+    @contextmanager
+    def keylock(self, k: Any) -> Iterator[None]:
+        """Context manager: hold the lock for computing the value for key `k`.
+
+        `memoize` uses this to compute each value only once across processes:
+        it holds the lock while it looks up the value again, and computes and
+        stores it if it is still missing.
+
+        The locks form a lock table, with `stripes` locks. Each process may take
+        the same lock several times (e.g. in a recursive computation); its threads
+        count as one holder.
+
+        If waiting for the lock would deadlock, because the process holding it
+        is (directly or through other processes) waiting for this one, the lock
+        is not taken, and the block runs anyway. Such cycles are detected by the
+        operating system (`EDEADLK`).
+        """
+        _, h = self._hash(k)
+        s = h % self.stripes
+        mutex = self._stripe_mutexes[s]
+        with mutex:
+            held = True
+            if self._stripe_counts[s] == 0 and fcntl is not None:
+                try:
+                    fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, 1 + s)
+                except OSError as err:
+                    if err.errno != errno.EDEADLK:
+                        raise
+                    held = False
+            if held:
+                self._stripe_counts[s] += 1
+        try:
+            yield
+        finally:
+            if held:
+                with mutex:
+                    self._stripe_counts[s] -= 1
+                    if self._stripe_counts[s] == 0 and fcntl is not None:
+                        fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, 1 + s)
+
+    # --------------------------------------------------------------------------------
+    # Internal
+
+    def _hash(self, k: Any) -> tuple[bytes, int]:
+        return _keyhash(k)
+
+    @staticmethod
+    def _records_start(nslots: int) -> int:
+        return _header.size + nslots * _slot.size
+
+    def _reinit_locks(self) -> None:
+        # POSIX record locks belong to a process, so a forked child holds none of them.
+        self._lock = threading.RLock()  # record locks do not serialize threads of the same process
+        if hasattr(self, "_stripe_counts"):
+            self._stripe_mutexes = [threading.Lock() for _ in range(self.stripes)]
+            self._stripe_counts = [0] * self.stripes
+
+    def _close(self) -> None:
+        self._buf = None
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    @contextmanager
+    def _locked(self, exclusive: bool, check: bool = True) -> Iterator[None]:
+        with self._lock:
+            if check and self._buf is None:
+                raise ValueError(f"{self!r} is closed")
+            if fcntl is not None:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH, 1, 0)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, 0)
+
+    def _find(self, keybytes: bytes, h: int, read_value: bool = True) -> tuple[int, int | None, bytes | None]:
+        """Look up a key. Return `(slot, offset, value)`.
+
+        If the key is not in the index, `offset` and `value` are `None`,
+        and `slot` is the empty slot where it would go.
+        """
+        buf = self._buf
+        _, nslots, _, _, _ = _header.unpack_from(buf, 0)
+        mask = nslots - 1
+        j = h & mask
+        while True:
+            slot_hash, offset = _slot.unpack_from(buf, _header.size + j * _slot.size)
+            if offset == 0:
+                return j, None, None
+            if slot_hash == h:
+                keylen, valuelen = _record_header.unpack_from(buf, offset)
+                start = offset + _record_header.size
+                if buf[start:start + keylen] == keybytes:
+                    start += keylen
+                    value = bytes(buf[start:start + valuelen]) if read_value else None
+                    return j, offset, value
+            j = (j + 1) & mask
+
+_attach_lock = threading.Lock()
+def _attach(name: str) -> SharedMemory:
+    """Attach to the existing shared memory segment `name`, without tracking it.
+
+    The resource tracker of a process destroys the segments registered with it
+    when the process exits. If an attaching process registered the segment, then
+    e.g. a worker process would destroy the memo under the other processes.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+    # Older Pythons register every segment a process attaches to. Unregistering it
+    # afterward is not an option: a process started by `multiprocessing` shares the
+    # resource tracker of its parent, so that would also cancel the registration
+    # made by the creator of the segment. So we skip registering this one segment.
+    with _attach_lock:
+        register = resource_tracker.register
+        def register_others(rname: str, rtype: str) -> None:
+            if rtype != "shared_memory" or rname.lstrip("/") != name.lstrip("/"):
+                register(rname, rtype)
+        resource_tracker.register = register_others
+        try:
+            return SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+# Forked children must not think they hold the record locks of the parent.
+_instances: "weakref.WeakSet[SharedMemo]" = weakref.WeakSet()
+def _reinit_after_fork() -> None:
+    for store in _instances:
+        store._reinit_locks()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
@@ -3,22 +3,28 @@
 
 __all__ = ["lazy", "lazyrec", "lazify"]
 
-from ast import (Lambda, FunctionDef, AsyncFunctionDef, Call, Name, Attribute,
-                 Starred, keyword, List, Tuple, Dict, Set, Subscript, Load)
+from ast import (Lambda, FunctionDef, AsyncFunctionDef, ClassDef, Call, Name, Attribute,
+                 Starred, keyword, List, Tuple, Dict, Set, Subscript, Load,
+                 Expr, Assign, AugAssign, AnnAssign, Return, If, IfExp, Raise,
+                 For, AsyncFor, While, With, AsyncWith, Try, Match, BinOp, UnaryOp, BoolOp, Compare,
+                 NamedExpr, Slice, JoinedStr, FormattedValue, ListComp, SetComp, DictComp,
+                 GeneratorExp, Yield, YieldFrom, Await)
 from functools import partial
 
 from mcpyrate.quotes import macros, q, u, a, h  # noqa: F401
 
-from mcpyrate.astcompat import TypeAlias
+from mcpyrate import parametricmacro
+from mcpyrate.astcompat import TypeAlias, TryStar
 from mcpyrate.astfixers import fix_ctx
 from mcpyrate.quotes import capture_as_macro, is_captured_value
 from mcpyrate.unparser import unparse
-from mcpyrate.walkers import ASTTransformer
+from mcpyrate.walkers import ASTTransformer, ASTVisitor
 
 from .util import (suggest_decorator_index, sort_lambda_decorators, detect_lambda,
                    isx, getname, is_decorator)
 from .letdoutil import islet, isdo, ExpandedLetView
 from .nameutil import is_unexpanded_expr_macro
+from .tailtools import _count_bindings
 from ..lazyutil import Lazy, passthrough_lazy_args, force, force1, maybe_force_args
 from ..dynassign import dyn
 
@@ -82,7 +88,8 @@ def lazyrec(tree, *, syntax, **kw):
     # Expand outside in. Ordering shouldn't matter here.
     return _lazyrec(tree)
 
-def lazify(tree, *, syntax, expander, **kw):
+@parametricmacro
+def lazify(tree, *, args, syntax, expander, **kw):
     """[syntax, block] Call-by-need for Python.
 
     In a ``with lazify`` block, function arguments are evaluated only when
@@ -421,15 +428,56 @@ def lazify(tree, *, syntax, expander, **kw):
 
     **CAUTION**: Argument passing by function call, and let-bindings are
     currently the only binding constructs to which auto-lazification is applied.
+
+    **Strictness analysis**: with ``with lazify[strictness]``, the block is
+    analyzed to find which parameters of each ``def`` are certainly forced
+    whenever the function is called. When a ``def`` like that is called
+    directly by name (or tail-called, under ``with tco``), the arguments for
+    those parameters are evaluated before the call, instead of being wrapped
+    in a promise::
+
+        with lazify[strictness], tco:
+            def fact(n, acc=1):
+                if n == 0:            # forces `n`
+                    return acc        # forces `acc`
+                return fact(n - 1, n * acc)  # `fact` is strict in both
+            assert fact(5000) > 0
+
+    Here, without the analysis, each call would allocate two promises, and
+    ``acc`` would become a chain of 5000 nested promises, which blows the call
+    stack when it is finally forced. With it, the loop passes plain numbers,
+    which the lazify-aware trampoline then does not need to force.
+
+    Arguments for the other parameters remain lazy, as before.
+
+    The analysis is conservative. It considers only a ``def`` at the top level
+    of the block (not nested in another function or a class) that has no
+    decorators (other than ``@trampolined``), no ``*args`` or ``**kwargs``,
+    is not a generator, and whose name is bound only once in the block. A
+    parameter that is assigned to anywhere in the function is not considered
+    strict. A call is optimized only if it passes its arguments by position
+    and by name, without ``*`` or ``**`` unpacking. Container literals are
+    always passed lazily, because the function may not force their items.
+
+    **CAUTION**: A function strict in an argument would force it anyway, so the
+    result is the same, but the argument is evaluated at a different time. If
+    evaluating it raises an exception or has side effects, those now happen
+    at the call site, before the body of the function starts running.
     """
     if syntax != "block":
         raise SyntaxError("lazify is a block macro only")  # pragma: no cover
     if syntax == "block" and kw['optional_vars'] is not None:
         raise SyntaxError("lazify does not take an as-part")  # pragma: no cover
+    strictness = False
+    for option in args:
+        if type(option) is Name and option.id == "strictness":
+            strictness = True
+        else:
+            raise SyntaxError(f"lazify: unknown option {unparse(option)}; valid: strictness")  # pragma: no cover
 
     # Two-pass macro.
     with dyn.let(_macro_expander=expander):
-        return _lazify(body=tree)
+        return _lazify(body=tree, strictness=strictness)
 
 # -----------------------------------------------------------------------------
 
@@ -593,7 +641,7 @@ def _is_literal_container(tree, maps_only=False):
 #   - don't lazify "for", the loop counter changes value imperatively (and usually rather rapidly)
 # full list: see unpythonic.syntax.scopeanalyzer.get_names_in_store_context (and the link therein)
 
-def _lazify(body):
+def _lazify(body, strictness=False):
     # first pass, outside-in
     userlambdas = detect_lambda(body)
 
@@ -608,6 +656,10 @@ def _lazify(body):
     # `lazify`'s analyzer needs the `ctx` attributes in `tree` to be filled in correctly.
     body = fix_ctx(body, copy_seen_nodes=False)  # TODO: or maybe copy seen nodes?
 
+    # Strict parameters of known functions, for `with lazify[strictness]`.
+    # This must look at the code before we insert any `force` calls.
+    callees = _analyze_strictness(body) if strictness else {}
+
     # second pass, inside-out
     class LazifyTransformer(ASTTransformer):
         def transform(self, tree):
@@ -762,6 +814,27 @@ def _lazify(body):
                     return tree
 
                 else:  # general case
+                    positions = _strict_positions(tree, callees)
+                    if positions is not None:
+                        # Direct call, or `jump`, to a function known to the strictness analysis.
+                        # The function is lazy, so it doesn't need `maybe_force_args`.
+                        # Evaluate the args for its strict parameters now, and lazify the rest.
+                        def transform_maybe_strict_arg(tree, strict):
+                            if not strict or _is_literal_container(tree):
+                                return transform_arg(tree)
+                            isref = type(tree) in (Name, Attribute, Subscript)
+                            self.withstate(tree, forcing_mode=("flat" if isref else "full"))
+                            return self.visit(tree)
+
+                        strictpos, strictkw = positions
+                        isjump = isx(tree.func, "jump")
+                        args = tree.args[1:] if isjump else tree.args
+                        args = [transform_maybe_strict_arg(x, strict) for x, strict in zip(args, strictpos)]
+                        tree.args = tree.args[:1] + args if isjump else args
+                        for kw, strict in zip(tree.keywords, strictkw):
+                            kw.value = transform_maybe_strict_arg(kw.value, strict)
+                        return tree
+
                     thefunc = self.visit(tree.func)
 
                     # Lazify the arguments of the call.
@@ -886,3 +959,258 @@ def _lazify(body):
     return quoted
 
 # -----------------------------------------------------------------------------
+# Strictness analysis, for `with lazify[strictness]`.
+#
+# A function is *strict* in a parameter if each call to it forces that argument
+# (or never returns). Then delaying the argument gains nothing, so where such a
+# function is called directly, the argument can be evaluated before the call.
+#
+# We analyze the code as it is before `lazify` inserts any `force` calls. In a
+# `with lazify` block, a name is forced wherever it is read, except when it is
+# passed as an argument in a function call, since those are passed through as-is.
+#
+# The analysis is a fixed-point iteration. We start by assuming that every known
+# function is strict in all of its parameters, and remove parameters until
+# nothing changes. This handles recursion; e.g. `f(k, acc)` that returns `acc`
+# or tail-calls `f(k - 1, k * acc)` is strict in `acc`.
+#
+# Sets of forced names are represented as `set`s, and `None` stands for the set
+# of all names. That is the forced set of a path that is never taken; e.g. the
+# path that falls through a `return` statement.
+
+class _Callee:
+    """A function known to the strictness analysis."""
+    def __init__(self, tree, eligible):
+        params = tree.args
+        self.tree = tree
+        self.posnames = [x.arg for x in params.posonlyargs + params.args]
+        self.kwnames = [x.arg for x in params.args + params.kwonlyargs]
+        self.eligible = eligible  # params that are not rebound in the body
+        self.strict = set(eligible)
+
+def _analyze_strictness(body):
+    """Find the strict parameters of the top-level `def`s in statement suite `body`.
+
+    Return a `dict` `{name: _Callee}` of the functions that may be optimized.
+    """
+    # Only the `def`s at the top level of the block are visible at every call site
+    # in the block. Since the name of each analyzed function is bound only once in
+    # the block, no call site in the block sees any other binding of that name.
+    # (A `def` in a nested scope could hijack calls, by the same name, to some other
+    # function that is visible outside that scope.)
+    bindcounts = _count_bindings(body)
+    class DefCollector(ASTVisitor):
+        def examine(self, tree):
+            if is_captured_value(tree):
+                return
+            if type(tree) is FunctionDef and self.state.toplevel:
+                self.collect(tree)
+            if type(tree) in (FunctionDef, AsyncFunctionDef, Lambda, ClassDef):
+                self.generic_withstate(tree, toplevel=False)
+            self.generic_visit(tree)
+    collector = DefCollector(toplevel=True)
+    collector.visit(body)
+
+    callees = {}
+    for tree in collector.collected:
+        params = tree.args
+        if (bindcounts.get(tree.name, 0) != 1 or params.vararg or params.kwarg or
+                not all(isx(deco, "trampolined") for deco in tree.decorator_list) or
+                _is_generator(tree.body)):
+            continue
+        localcounts = _count_bindings(tree)
+        eligible = {x.arg for x in params.posonlyargs + params.args + params.kwonlyargs
+                    if localcounts[x.arg] == 1}
+        callees[tree.name] = _Callee(tree, eligible)
+
+    changed = True
+    while changed:
+        changed = False
+        for callee in callees.values():
+            fallthrough, returning = _forced_in_suite(callee.tree.body, callees)
+            strict = callee.strict & _intersection(fallthrough, returning)
+            if strict != callee.strict:
+                callee.strict = strict
+                changed = True
+    return callees
+
+def _is_generator(body):
+    """Return whether the statement suite `body` is part of a generator (or a coroutine).
+
+    Conservative; this looks also inside nested scopes.
+    """
+    class YieldDetector(ASTVisitor):
+        def examine(self, tree):
+            if type(tree) in (Yield, YieldFrom, Await):
+                self.collect(tree)
+                return
+            self.generic_visit(tree)
+    d = YieldDetector()
+    d.visit(body)
+    return bool(d.collected)
+
+def _union(a, b):
+    if a is None or b is None:
+        return None
+    return a | b
+
+def _intersection(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a & b
+
+def _strict_positions(tree, callees):
+    """Determine which args of `Call` `tree` are passed to strict parameters.
+
+    The call must be a direct call `f(...)`, or a `jump(f, ...)`, where `f` is
+    in `callees`. Return `(positional, named)`, where each is a `list` of `bool`,
+    one for each arg; or `None` if the call is something else.
+    """
+    if not callees:
+        return None
+    if isx(tree.func, "jump"):
+        if not (tree.args and type(tree.args[0]) is Name):
+            return None
+        name, args = tree.args[0].id, tree.args[1:]
+    elif type(tree.func) is Name:
+        name, args = tree.func.id, tree.args
+    else:
+        return None
+    callee = callees.get(name, None)
+    if callee is None or any(type(x) is Starred for x in args) or len(args) > len(callee.posnames):
+        return None
+    bound = callee.posnames[:len(args)]
+    positional = [x in callee.strict for x in bound]
+    named = []
+    for kw in tree.keywords:
+        if kw.arg is None or kw.arg not in callee.kwnames or kw.arg in bound:
+            return None
+        bound.append(kw.arg)
+        named.append(kw.arg in callee.strict)
+    return positional, named
+
+def _forced_by_call_args(tree, callees):
+    """Return the names forced by the strict args of the `Call` `tree`, if it is to a known function."""
+    positions = _strict_positions(tree, callees)
+    if positions is None:
+        return set()
+    strictpos, strictkw = positions
+    args = tree.args[1:] if isx(tree.func, "jump") else tree.args
+    forced = set()
+    for x, strict in zip(args, strictpos):
+        if strict:
+            forced |= _forced_by_arg(x, callees)
+    for kw, strict in zip(tree.keywords, strictkw):
+        if strict:
+            forced |= _forced_by_arg(kw.value, callees)
+    return forced
+
+def _forced_by_arg(tree, callees):
+    """Return the names forced when an arg expression `tree` is evaluated as the value of a strict parameter."""
+    if type(tree) is Name:
+        return {tree.id}
+    if _is_literal_container(tree):  # passed lazily; only the container itself is forced
+        return set()
+    return _forced_in_expr(tree, callees)
+
+def _forced_in_expr(tree, callees):
+    """Return the names certainly forced when the expression `tree` is evaluated."""
+    if type(tree) is Name:
+        return {tree.id} if type(tree.ctx) is Load else set()
+    if type(tree) in (Attribute, Starred, FormattedValue, NamedExpr):
+        return _forced_in_expr(tree.value, callees)
+    if type(tree) is Subscript:
+        return _forced_in_expr(tree.value, callees) | _forced_in_expr(tree.slice, callees)
+    if type(tree) is BinOp:
+        return _forced_in_expr(tree.left, callees) | _forced_in_expr(tree.right, callees)
+    if type(tree) is UnaryOp:
+        return _forced_in_expr(tree.operand, callees)
+    if type(tree) is BoolOp:  # short-circuits; only the first operand is certainly evaluated.
+        return _forced_in_expr(tree.values[0], callees)
+    if type(tree) is Compare:  # chained comparisons short-circuit, too.
+        return _forced_in_expr(tree.left, callees) | _forced_in_expr(tree.comparators[0], callees)
+    if type(tree) is IfExp:
+        return _forced_in_expr(tree.test, callees) | (_forced_in_expr(tree.body, callees) &
+                                                      _forced_in_expr(tree.orelse, callees))
+    if type(tree) in (Tuple, List, Set, JoinedStr):
+        return _forced_in_exprs(tree.elts if type(tree) is not JoinedStr else tree.values, callees)
+    if type(tree) is Dict:
+        return _forced_in_exprs([k for k in tree.keys if k is not None] + tree.values, callees)
+    if type(tree) is Slice:
+        return _forced_in_exprs([x for x in (tree.lower, tree.upper, tree.step) if x is not None], callees)
+    if type(tree) in (ListComp, SetComp, DictComp, GeneratorExp):  # the first iterable is evaluated eagerly
+        return _forced_in_expr(tree.generators[0].iter, callees)
+    if type(tree) is Call:
+        # The function position is forced. Args are passed through, so they are
+        # forced only if the function is known to be strict in them. A `jump` is
+        # performed only when it is returned, so it is handled in `_forced_in_return`.
+        forced = _forced_in_expr(tree.func, callees)
+        if not isx(tree.func, "jump"):
+            forced |= _forced_by_call_args(tree, callees)
+        return forced
+    return set()  # lambdas, and anything we don't know about
+
+def _forced_in_exprs(trees, callees):
+    forced = set()
+    for tree in trees:
+        forced |= _forced_in_expr(tree, callees)
+    return forced
+
+def _forced_in_return(tree, callees):
+    """Return the names forced by the return-value expression `tree`, including a tail call."""
+    if type(tree) is IfExp:  # `with tco` handles tail calls in both branches.
+        return _forced_in_expr(tree.test, callees) | (_forced_in_return(tree.body, callees) &
+                                                      _forced_in_return(tree.orelse, callees))
+    forced = _forced_in_expr(tree, callees)
+    if type(tree) is Call and isx(tree.func, "jump"):
+        forced |= _forced_by_call_args(tree, callees)
+    return forced
+
+def _forced_in_suite(body, callees):
+    """Analyze the statement suite `body`.
+
+    Return `(fallthrough, returning)`, the names certainly forced on all paths
+    that fall through the end of `body`, and those on all paths that return
+    (or raise) from within `body`.
+    """
+    fallthrough = set()
+    returning = None  # no returning paths seen yet
+    for stmt in body:
+        stmt_fallthrough, stmt_returning = _forced_in_stmt(stmt, callees)
+        # Each path that returns within this statement has first run through the earlier ones.
+        returning = _intersection(returning, _union(fallthrough, stmt_returning))
+        fallthrough = _union(fallthrough, stmt_fallthrough)
+    return fallthrough, returning
+
+def _forced_in_stmt(tree, callees):
+    """Like `_forced_in_suite`, but for a single statement `tree`."""
+    if type(tree) is Return:
+        forced = _forced_in_return(tree.value, callees) if tree.value is not None else set()
+        return None, forced
+    if type(tree) is Raise:
+        forced = _forced_in_expr(tree.exc, callees) if tree.exc is not None else set()
+        return None, forced
+    if type(tree) is If:
+        forced = _forced_in_expr(tree.test, callees)
+        body_fallthrough, body_returning = _forced_in_suite(tree.body, callees)
+        else_fallthrough, else_returning = _forced_in_suite(tree.orelse, callees)
+        return (_union(forced, _intersection(body_fallthrough, else_fallthrough)),
+                _union(forced, _intersection(body_returning, else_returning)))
+    if type(tree) in (Expr, Assign, AnnAssign, AugAssign):
+        forced = _forced_in_expr(tree.value, callees) if tree.value is not None else set()
+        return forced, None
+    # For compound statements, we only look at what is certainly evaluated first.
+    if type(tree) in (For, AsyncFor):
+        forced = _forced_in_expr(tree.iter, callees)
+        return forced, forced
+    if type(tree) is While:
+        forced = _forced_in_expr(tree.test, callees)
+        return forced, forced
+    if type(tree) in (With, AsyncWith):
+        forced = _forced_in_exprs([item.context_expr for item in tree.items], callees)
+        return forced, forced
+    if type(tree) in (Try, TryStar, Match):
+        return set(), set()
+    return set(), None  # `pass`, `import`, `def`, ...; these can't return.
@@ -10,17 +10,19 @@ __all__ = ["autoreturn",
 from functools import partial
 
 from ast import (Lambda, FunctionDef, AsyncFunctionDef, ClassDef,
-                 arguments, arg, keyword,
-                 List, Tuple,
-                 Call, Name, Starred, Constant,
+                 arguments, arg, keyword, alias, ExceptHandler,
+                 List, Tuple, GeneratorExp,
+                 Call, Name, Starred, Constant, Load, Store, Del,
                  BoolOp, And, Or,
                  With, AsyncWith, If, IfExp, Try, Match, Assign, Return, Expr,
-                 Await,
+                 For, AsyncFor, While, Continue, Global, Nonlocal,
+                 MatchAs, MatchStar, MatchMapping,
+                 Await, Yield, YieldFrom,
                  copy_location)
 
 from mcpyrate.quotes import macros, q, u, n, a, h  # noqa: F401
 
-from mcpyrate import gensym
+from mcpyrate import gensym, parametricmacro, unparse
 from mcpyrate.astcompat import TryStar
 from mcpyrate.quotes import capture_as_macro, is_captured_value
 from mcpyrate.utils import NestingLevelTracker
@@ -119,7 +121,8 @@ def autoreturn(tree, *, syntax, **kw):
     # not having to worry about implicit "return" statements.
     return _autoreturn(block_body=tree)
 
-def tco(tree, *, syntax, expander, **kw):
+@parametricmacro
+def tco(tree, *, args, syntax, expander, **kw):
     """[syntax, block] Implicit tail-call optimization (TCO).
 
     Examples::
@@ -215,15 +218,69 @@ def tco(tree, *, syntax, expander, **kw):
     any of the captured names, or as a fallback, one of the literal names
     ``ec``, ``brk``, ``throw`` is interpreted as invoking an escape
     continuation.
+
+    **Self-tail-calls as loops**: with ``with tco[selfloops]``, a ``def`` whose
+    tail calls include calls to itself is compiled into a ``while True`` loop.
+    Each such self-tail-call rebinds the parameters in place and continues the
+    loop, without a round-trip through the trampoline::
+
+        with tco[selfloops]:
+            def fact(n, acc=1):
+                if n == 0:
+                    return acc
+                return fact(n - 1, n * acc)  # --> n, acc = n - 1, n * acc; continue
+            assert fact(5) == 120
+
+    This makes recursion-style loops nearly as fast as explicit ones. Any other
+    tail calls, including mutual recursion, still use the trampoline; the
+    function remains ``@trampolined``.
+
+    Self-tail-calls are rewritten only where this is known to be safe, and
+    otherwise left as jumps. The rules are conservative:
+
+      - The ``def`` has no decorators (other than ``@trampolined``), and its
+        name is bound only once in the ``with tco`` block. So the name
+        certainly refers to the function itself.
+
+        A ``def`` directly in a class body is left alone; the method's name
+        is not in scope in its body.
+
+      - The ``def`` has no ``*args`` or ``**kwargs``, and is not a generator.
+
+      - The function body creates no closures (``lambda``, nested ``def`` or
+        ``class``, generator expression). A closure would see the parameters
+        change under it, whereas a real call gets fresh bindings.
+
+        Note that expanded ``let[]`` and ``do[]`` are lambdas, too.
+
+      - The function has no local variables other than its parameters. A real
+        call starts with them unbound, whereas a loop iteration would see the
+        values from the previous iteration.
+
+      - The call passes a value for every parameter. The default values of the
+        parameters are not re-evaluated; to use them, pass them explicitly.
+
+      - The call is not inside a loop (where ``continue`` would mean something
+        else), or in a ``finally`` block.
+
+    **CAUTION**: If the function's name is rebound outside the ``with tco``
+    block (e.g. ``f = memoize(f)`` after the block), the rebinding is not seen
+    by the self-tail-calls that were compiled into a loop.
     """
     if syntax != "block":
         raise SyntaxError("tco is a block macro only")  # pragma: no cover
     if syntax == "block" and kw['optional_vars'] is not None:
         raise SyntaxError("tco does not take an as-part")  # pragma: no cover
+    selfloops = False
+    for option in args:
+        if type(option) is Name and option.id == "selfloops":
+            selfloops = True
+        else:
+            raise SyntaxError(f"tco: unknown option {unparse(option)}; valid: selfloops")  # pragma: no cover
 
     # Two-pass macro.
     with dyn.let(_macro_expander=expander):
-        return _tco(block_body=tree)
+        return _tco(block_body=tree, selfloops=selfloops)
 
 def continuations(tree, *, syntax, expander, **kw):
     """[syntax, block] call/cc for Python.
@@ -723,12 +780,14 @@ def _autoreturn(block_body):
 
 
 # Automatic TCO. This is the same framework as in "continuations", in its simplest form.
-def _tco(block_body):
+def _tco(block_body, selfloops=False):
     # first pass, outside-in
     userlambdas = detect_lambda(block_body)
     known_ecs = list(uniqify(detect_callec(block_body)))
 
     block_body = dyn._macro_expander.visit_recursively(block_body)
+    if selfloops:
+        bindcounts = _count_bindings(block_body)
 
     # second pass, inside-out
     transform_retexpr = partial(_transform_retexpr)
@@ -748,6 +807,8 @@ def _tco(block_body):
                                      known_ecs=known_ecs,
                                      transform_retexpr=transform_retexpr)
         stmt = sort_lambda_decorators(stmt)
+        if selfloops:
+            stmt = _tco_transform_selfloops(stmt, bindcounts=bindcounts)
         new_block_body.append(stmt)
     return new_block_body
 
@@ -1545,6 +1606,173 @@ def _tco_transform_lambda(tree, *, preproc_cb, userlambdas, known_ecs, transform
             return self.generic_visit(tree)
     return TcoLambdaTransformer(hastco=False).visit(tree)
 
+# Compile self-tail-calls into a loop (`with tco[selfloops]`).
+#
+# This runs after the return-value transformation, so a self-tail-call looks like
+# `return jump(f, ...)`. If a `def` has any such calls that can be safely rewritten,
+# its body is wrapped in a `while True`, and each of those returns becomes a parallel
+# assignment to the parameters, followed by `continue`. Other tail calls stay as jumps.
+# See the docstring of `tco` for the rules.
+def _tco_transform_selfloops(tree, *, bindcounts):
+    class SelfLoopTransformer(ASTTransformer):
+        def transform(self, tree):
+            if is_captured_value(tree):
+                return tree  # don't recurse!
+            if type(tree) is ClassDef:
+                self.generic_withstate(tree, inclass=True)
+            elif type(tree) in (FunctionDef, AsyncFunctionDef, Lambda):
+                if type(tree) is FunctionDef and not self.state.inclass:
+                    tree = _selfloop_def(tree, bindcounts)
+                self.generic_withstate(tree, inclass=False)
+            return self.generic_visit(tree)
+    return SelfLoopTransformer(inclass=False).visit(tree)
+
+def _selfloop_def(tree, bindcounts):
+    """Compile the self-tail-calls of `FunctionDef` `tree` into a loop, if possible."""
+    name = tree.name
+    params = tree.args
+    if (bindcounts.get(name, 0) != 1 or params.vararg or params.kwarg or
+            not all(isx(deco, "trampolined") for deco in tree.decorator_list) or
+            _has_closures_or_yields(tree.body) or
+            _has_nonparameter_locals(tree)):
+        return tree
+    posnames = [x.arg for x in params.posonlyargs + params.args]
+    kwnames = [x.arg for x in params.args + params.kwonlyargs]
+    nparams = len(posnames) + len(params.kwonlyargs)
+
+    # `jump(f, a0, ..., k0=v0, ...)` --> `[p0, ..., k0, ... = a0, ..., v0, ...; continue]`, or `None`
+    def rebind(tree):
+        if not (type(tree) is Call and isx(tree.func, "jump") and tree.args and
+                type(tree.args[0]) is Name and tree.args[0].id == name):
+            return None
+        args = tree.args[1:]
+        if any(type(x) is Starred for x in args) or len(args) > len(posnames):
+            return None
+        targets = posnames[:len(args)]
+        values = list(args)
+        for kw in tree.keywords:
+            if kw.arg is None or kw.arg not in kwnames or kw.arg in targets:
+                return None
+            targets.append(kw.arg)
+            values.append(kw.value)
+        if len(targets) != nparams:  # would need the default values
+            return None
+        stmts = [copy_location(Continue(), tree)]
+        if targets:
+            # All values are computed before any parameter is rebound, just like in a call.
+            assign = Assign(targets=[Tuple(elts=[Name(id=x, ctx=Store()) for x in targets], ctx=Store())],
+                            value=Tuple(elts=values, ctx=Load()))
+            stmts.insert(0, copy_location(assign, tree))
+        return stmts
+
+    # `return` --> list of statements, or `None` if there's nothing to rewrite.
+    def transform_return(tree):
+        if type(tree.value) is IfExp:  # `return a if p else b` --> `if p: return a; else: return b`
+            body = transform_return(copy_location(Return(value=tree.value.body), tree))
+            orelse = transform_return(copy_location(Return(value=tree.value.orelse), tree))
+            if body is None and orelse is None:
+                return None
+            return [copy_location(If(test=tree.value.test,
+                                     body=body or [Return(value=tree.value.body)],
+                                     orelse=orelse or [Return(value=tree.value.orelse)]),
+                                  tree)]
+        return rebind(tree.value)
+
+    class SelfTailCallTransformer(ASTTransformer):
+        def transform(self, tree):
+            if is_captured_value(tree):
+                return tree  # don't recurse!
+            if type(tree) in (For, AsyncFor, While):  # `continue` would refer to this loop
+                self.withstate(tree.body, blocked=True)
+            elif type(tree) in (Try, TryStar):  # `continue` in `finally` is frowned upon, in `except*` forbidden
+                self.withstate(tree.finalbody, blocked=True)
+                if type(tree) is TryStar:
+                    self.withstate(tree.handlers, blocked=True)
+            elif type(tree) is Return and not self.state.blocked:
+                stmts = transform_return(tree)
+                if stmts is not None:
+                    self.collect(name)
+                    return stmts
+            return self.generic_visit(tree)
+    t = SelfTailCallTransformer(blocked=False)
+    body = t.visit(tree.body)
+    if not t.collected:
+        return tree
+
+    docstring = []
+    if body and type(body[0]) is Expr and type(body[0].value) is Constant and type(body[0].value.value) is str:
+        docstring, body = body[:1], body[1:]
+    fallthrough = copy_location(Return(value=Constant(value=None)), tree)  # the implicit `return None`
+    loop = copy_location(While(test=Constant(value=True), body=body + [fallthrough], orelse=[]),
+                         tree)
+    tree.body = docstring + [loop]
+    return tree
+
+def _has_closures_or_yields(body):
+    """Return whether the statement suite `body` creates closures, or is part of a generator."""
+    class ClosureDetector(ASTVisitor):
+        def examine(self, tree):
+            if type(tree) in (Lambda, FunctionDef, AsyncFunctionDef, ClassDef, GeneratorExp,
+                              Yield, YieldFrom, Await):
+                self.collect(tree)
+                return  # found one; no need to look inside
+            self.generic_visit(tree)
+    d = ClosureDetector()
+    d.visit(body)
+    return bool(d.collected)
+
+def _has_nonparameter_locals(tree):
+    """Return whether the function `tree` binds local names other than its parameters.
+
+    Conservative; this counts also the targets of comprehensions.
+    """
+    params = tree.args
+    names = {x.arg for x in params.posonlyargs + params.args + params.kwonlyargs}
+    class DeclarationCollector(ASTVisitor):
+        def examine(self, tree):
+            if type(tree) in (Global, Nonlocal):
+                self.collect(tree.names)
+            self.generic_visit(tree)
+    d = DeclarationCollector()
+    d.visit(tree.body)
+    for declared in d.collected:  # `global` and `nonlocal` names are not local
+        names.update(declared)
+    return any(x not in names for x in _count_bindings(tree.body))
+
+def _count_bindings(tree):
+    """Count how many times each name is bound anywhere in `tree`, including nested scopes.
+
+    Return a `dict` `{name: count}`. Parameters, `global`/`nonlocal` declarations,
+    and `del` also count, so a name with a count of one is bound by exactly one
+    construct, and not shadowed anywhere.
+    """
+    class BindingCounter(ASTVisitor):
+        def examine(self, tree):
+            if type(tree) in (FunctionDef, AsyncFunctionDef, ClassDef):
+                self.collect(tree.name)
+            elif type(tree) is Name and type(getattr(tree, "ctx", None)) in (Store, Del):
+                self.collect(tree.id)
+            elif type(tree) is arg:
+                self.collect(tree.arg)
+            elif type(tree) is alias:
+                self.collect(tree.asname if tree.asname is not None else tree.name.split(".")[0])
+            elif type(tree) in (Global, Nonlocal):
+                for x in tree.names:
+                    self.collect(x)
+            elif type(tree) in (ExceptHandler, MatchAs, MatchStar):
+                if tree.name is not None:
+                    self.collect(tree.name)
+            elif type(tree) is MatchMapping:
+                if tree.rest is not None:
+                    self.collect(tree.rest)
+            self.generic_visit(tree)
+    c = BindingCounter()
+    c.visit(tree)
+    counts = {}
+    for x in c.collected:
+        counts[x] = counts.get(x, 0) + 1
+    return counts
+
 # Tail-position analysis for a return-value expression (also the body of a lambda).
 # Here we need to be very, very selective about where to recurse so this would not
 # benefit much from being made into an ASTTransformer. Just a function is fine.
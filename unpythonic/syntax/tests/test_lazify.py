@@ -2,7 +2,7 @@
 """Automatic lazy evaluation of function arguments."""
 
 from ...syntax import macros, test, test_raises, error, the  # noqa: F401
-from ...test.fixtures import session, testset
+from ...test.fixtures import session, testset, returns_normally
 
 from mcpyrate.debug import macros, step_expansion  # noqa: F811
 
@@ -23,7 +23,7 @@ from ...llist import ll
 from ...seq import pipe1, piped1, lazy_piped1, pipe, pipec, piped, lazy_piped, exitpipe
 from ...tco import trampolined, jump
 
-from ...lazyutil import islazy, Lazy, force1, force  # Lazy usually not needed in client code; for our tests only
+from ...lazyutil import islazy, Lazy, force1, force, passthrough_lazy_args  # Lazy usually not needed in client code; for our tests only
 
 from sys import stderr
 import gc
@@ -641,6 +641,76 @@ def runtests():
                 func3()
             gc.collect()
 
+    with testset("strictness analysis"):
+        @passthrough_lazy_args
+        def ispromise(x):  # defined outside the `with lazify`, so it sees its args as-is.
+            return isinstance(x, Lazy)
+
+        with lazify[strictness]:  # noqa: F821, `strictness` is a macro option.
+            # Passing an argument to a function doesn't force it,
+            # so `f` is not strict in `a` or `b`.
+            def f(a, b):
+                if ispromise(a) or ispromise(b):
+                    return "promise"
+                return "values"
+            test[f(2 * 21, 1 / 0) == "promise"]
+
+            # `g` forces `a` on every path, but `b` only on some.
+            def g(a, b):
+                if a:
+                    return b
+                return ispromise(b)
+            test[g(False, 1 / 0) is True]  # `b` is still passed lazily
+            test[g(True, 42) == 42]
+
+            def h(a, b):
+                if a > 0:  # strict in `a`...
+                    return ispromise(a), ispromise(b)
+                return 0
+            test[h(2 * 21, 2 * 21) == (False, True)]  # ...so `a` is passed as a value
+
+            # Not strict in a parameter that is rebound in the body.
+            def k(a):
+                if a > 0:
+                    return ispromise(a)
+                a = 0
+                return a
+            test[k(2 * 21) is True]
+
+        # Only the top-level `def`s of the block are analyzed. A nested `def`
+        # doesn't affect calls, by the same name, to a function defined elsewhere.
+        def helper(x, y):  # strict, defined outside the `with lazify`
+            return type(x).__name__, type(y).__name__
+        with lazify[strictness]:  # noqa: F821, `strictness` is a macro option.
+            def outer():
+                def helper(x, y):  # strict in `x` only
+                    return x
+                return helper(1, 2)
+            def other(a, b):
+                return helper(a, b)  # the outer `helper`
+            test[outer() == 1]
+            test[other(1, 2) == ("int", "int")]
+
+        # A tail-recursive accumulator loop passes plain values, instead of building
+        # a chain of promises that would overflow the call stack when forced.
+        with lazify[strictness], tco:  # noqa: F821, `strictness` is a macro option.
+            def fact(n, acc=1):
+                if n == 0:
+                    return acc
+                return fact(n - 1, n * acc)
+            test[fact(5) == 120]
+            test[returns_normally(fact(5000))]  # no crash
+
+            def evenp(n):
+                if n == 0:
+                    return True
+                return oddp(n - 1)
+            def oddp(n):
+                if n == 0:
+                    return False
+                return evenp(n - 1)
+            test[evenp(10000) is True]
+
     with testset("integration with TCO and call_ec"):
         with lazify:
             @trampolined
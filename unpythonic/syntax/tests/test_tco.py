@@ -12,6 +12,8 @@ from ...fploop import looped_over
 from ...fun import withself, curry
 from ...funutil import Values
 
+import sys
+
 def runtests():
     # - any explicit return statement in a function body is TCO'd
     # - any expression determined to be in a return-value position is analyzed
@@ -158,6 +160,83 @@ def runtests():
                 func2 = fn[3 * g(_)]  # no tail call  # noqa: F821, _ is magic.
                 test[func2(10) == 60]
 
+    with testset("self-tail-calls as loops"):
+        with tco[selfloops]:  # noqa: F821, `selfloops` is a macro option.
+            def fact(n, acc=1):
+                if n == 0:
+                    return acc
+                return fact(n - 1, n * acc)
+
+            # Self-tail-calls run in the same frame; there's no trampoline round-trip.
+            def frames(n, seen):
+                seen.append(sys._getframe())
+                if n == 0:
+                    return seen
+                return frames(n - 1, seen=seen)
+
+            # Tail position analysis still applies, and also keyword-only parameters work.
+            def count(n, *, acc):
+                return acc if n == 0 else count(n - 1, acc=acc + 1)
+
+            # Mutual recursion keeps using the trampoline.
+            def evenp(x):
+                if x == 0:
+                    return True
+                return oddp(x - 1)
+            def oddp(x):
+                if x != 0:
+                    return evenp(x - 1)
+                return False
+
+            # Not all parameters passed; stays a jump.
+            def fact2(n, acc=1):
+                if n <= 1:
+                    return acc if n == 1 else fact2(1)
+                return fact2(n - 1, n * acc)
+
+            # Self-tail-call inside a loop; stays a jump, since `continue` would mean something else.
+            def firstpos(xs):
+                for x in xs:
+                    if x < 0:
+                        return firstpos(xs[1:])
+                    return x
+                return None
+
+            # A closure would see the parameter change under it; not compiled into a loop.
+            def thunks(n, acc):
+                if n == 0:
+                    return acc
+                return thunks(n - 1, acc + [lambda: n])
+
+            # Falling off the end still returns None.
+            def noreturn(n):
+                if n > 0:
+                    return noreturn(n - 1)
+
+            # A local variable would keep its value from the previous iteration,
+            # whereas a real call starts with it unbound; not compiled into a loop.
+            def freshlocals(n):
+                if n == 3:
+                    flag = True  # noqa: F841, seen via `locals()`
+                if n == 0:
+                    return "flag" in locals()
+                return freshlocals(n - 1)
+
+        test[fact(5) == 120]
+        test[returns_normally(fact(5000))]  # no crash
+        seen = frames(10, [])
+        test[len(seen) == 11]
+        test[all(frame is seen[0] for frame in seen)]
+        del seen
+        test[count(10000, acc=0) == 10000]
+        test[evenp(10000) is True]
+        test[oddp(10000) is False]
+        test[fact2(5) == 120]
+        test[firstpos([-1, -2, 3, 4]) == 3]
+        test[[f() for f in thunks(3, [])] == [3, 2, 1]]
+        test[noreturn(10) is None]
+        test[freshlocals(5) is False]
+
     with testset("integration with continuations"):
         with tco:
             evenp = lambda x: (x == 0) or oddp(x - 1)
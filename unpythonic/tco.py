@@ -31,8 +31,8 @@ profile first.
        check for ``jump`` where it should be ``return jump``; and then check
        that you're returning your final result normally.
 
-       Most often you'll get "unclaimed jump" warnings printed to stderr if you
-       run into this.
+       To get "unclaimed jump" warnings printed to stderr when you run into
+       this, call ``enable_jump_debug()``.
 
  - **Lambdas welcome!** For example, ``trampolined(lambda x: ...)``.
 
@@ -125,7 +125,9 @@ slower than Python's ``for``.
         pass
 """
 
-__all__ = ["jump", "trampolined"]
+__all__ = ["jump", "trampolined",
+           "enable_jump_debug", "disable_jump_debug",
+           "enable_jump_recycling", "disable_jump_recycling"]
 
 from collections.abc import Callable
 from functools import wraps
@@ -133,7 +135,7 @@ from sys import stderr
 from typing import Any, TypeVar
 
 from .regutil import register_decorator
-from .lazyutil import islazy, passthrough_lazy_args, maybe_force_args
+from .lazyutil import islazy, passthrough_lazy_args, maybe_force_args, _allatoms
 from .dynassign import dyn
 
 F = TypeVar('F', bound=Callable)
@@ -150,6 +152,10 @@ def jump(target: Callable, *args: Any, **kwargs: Any) -> "_jump":
     Instances of `jump` are not callable, and do nothing on their own.
     This is just passive data.
 
+    In jump recycling mode (see `enable_jump_recycling`), the jump record is
+    owned by the trampoline that claims it. Once claimed, the record may be
+    reused for a later jump, so don't hold on to it.
+
     Parameters:
         target:
             The function to be called.
@@ -158,24 +164,38 @@ def jump(target: Callable, *args: Any, **kwargs: Any) -> "_jump":
         **kwargs:
             Named arguments to be passed to  `target`.
     """
-    return _jump(target, args, kwargs)
+    return _make_jump(target, args, kwargs)
 
 class _jump:
     """The actual class representing a jump.
 
     If you have already packed args and kwargs, you can instantiate this
-    directly; the public API just performs the packing.
+    directly; the public API just performs the packing. Internal callers
+    should prefer `_make_jump`, which recycles claimed jump records when
+    recycling is enabled.
     """
+    __slots__ = ("target", "args", "kwargs")
+
     def __init__(self, target, args, kwargs):
         # IMPORTANT: don't let target bring along its trampoline if it has one
-        self.target = target._entrypoint if hasattr(target, "_entrypoint") else target
+        self.target = getattr(target, "_entrypoint", target)
         self.args = args
         self.kwargs = kwargs
-        self._claimed = False  # set when the instance is caught by a trampoline
 
     def __repr__(self):
         return f"<_jump at 0x{id(self):x}: target={self.target}, args={self.args}, kwargs={self.kwargs}>"
 
+class _debugjump(_jump):
+    """A jump that warns, when garbage-collected, if no trampoline claimed it.
+
+    These are only created when jump debugging is enabled; see `enable_jump_debug`.
+    """
+    __slots__ = ("_claimed",)
+
+    def __init__(self, target, args, kwargs):
+        super().__init__(target, args, kwargs)
+        self._claimed = False  # set when the instance is caught by a trampoline
+
     def __del__(self):
         """Warn about bugs in client code.
 
@@ -233,6 +253,92 @@ class _jump:
             # import signal
             # os.kill(os.getpid(), signal.SIGTERM)
 
+# In jump recycling mode, claimed jump records are returned here, and `_make_jump`
+# reuses them, so that a long TCO chain doesn't allocate a fresh record per tail call.
+# The list is shared between threads; `list.append` and `list.pop` are atomic.
+_jump_pool = []
+_jump_recycling = False
+_jump_debug = False
+
+def _make_jump(target, args, kwargs):
+    """Create a jump record, recycling a claimed one if available.
+
+    In debug mode (see `enable_jump_debug`), always create a fresh `_debugjump`.
+    """
+    if _jump_debug:
+        return _debugjump(target, args, kwargs)
+    if not _jump_recycling:
+        return _jump(target, args, kwargs)
+    try:
+        j = _jump_pool.pop()
+    except IndexError:
+        return _jump(target, args, kwargs)
+    j.target = getattr(target, "_entrypoint", target)
+    j.args = args
+    j.kwargs = kwargs
+    return j
+
+def _claim(v):
+    """Mark the jump record `v` as handled.
+
+    A trampoline calls this after it has read `v.target`, `v.args` and `v.kwargs`;
+    after this, the record may be reused. Other code that handles a jump instead
+    of passing it to a trampoline (such as `fix`) must call this, too.
+    """
+    if type(v) is not _jump:
+        v._claimed = True
+    elif _jump_recycling:
+        v.target = v.args = v.kwargs = None  # don't keep them alive while pooled
+        _jump_pool.append(v)
+
+def enable_jump_debug() -> None:
+    """Enable the unclaimed-jump diagnostic.
+
+    While enabled, each `jump` creates a fresh record that prints a warning to
+    stderr if it is garbage-collected without a trampoline having claimed it.
+    This helps catch a missing ``return`` in ``return jump(...)``, or a jump
+    from a function that has no trampoline.
+
+    By default, this is disabled, because a finalizer on each jump record is
+    expensive in long TCO loops.
+
+    The setting is global (not thread-local), and takes effect for jumps
+    created after the call.
+    """
+    global _jump_debug
+    _jump_debug = True
+
+def disable_jump_debug() -> None:
+    """Disable the unclaimed-jump diagnostic. See `enable_jump_debug`."""
+    global _jump_debug
+    _jump_debug = False
+
+def enable_jump_recycling() -> None:
+    """Enable recycling of jump records.
+
+    While enabled, once a trampoline has claimed a jump, the record goes back
+    to a pool, and the next `jump` (or `unpythonic.fploop` iteration) reuses it
+    instead of allocating a new one. This makes long TCO loops faster.
+
+    **CAUTION**: In this mode, a jump record must be used only once. Code that
+    keeps a jump record around, and returns it to a trampoline more than once
+    (e.g. a ``@memoize``'d function that returns a jump, or a jump stored in a
+    global), breaks, because the record is cleared and reused after the first
+    time. By default, this is disabled.
+
+    The setting is global (not thread-local), and takes effect for jumps
+    created after the call. In jump debug mode (see `enable_jump_debug`),
+    records are not recycled.
+    """
+    global _jump_recycling
+    _jump_recycling = True
+
+def disable_jump_recycling() -> None:
+    """Disable recycling of jump records. See `enable_jump_recycling`."""
+    global _jump_recycling
+    _jump_recycling = False
+    _jump_pool.clear()
+
 # We want @wraps to preserve docstrings, so the decorator must be a function, not a class.
 # https://stackoverflow.com/questions/6394511/python-functools-wraps-equivalent-for-classes
 # https://stackoverflow.com/questions/25973376/functools-update-wrapper-doesnt-work-properly#25973438
@@ -260,7 +366,11 @@ def trampolined(function: F) -> F:
                         raise RuntimeError(f"Cannot jump into a non-callable value {repr(f)}")
                     args = v.args
                     kwargs = v.kwargs
-                    v._claimed = True
+                    if type(v) is not _jump:  # inlined `_claim(v)`
+                        v._claimed = True
+                    elif _jump_recycling:
+                        v.target = v.args = v.kwargs = None
+                        _jump_pool.append(v)
                 else:  # final result, exit trampoline
                     return v
         # Work together with call_ec and other do-it-now decorators.
@@ -280,12 +390,26 @@ def trampolined(function: F) -> F:
         # Exact same code as above, except has the lazify-aware stuff.
         # This is to avoid a drastic (~10x) performance hit in trampolines
         # built for regular strict code.
+        #
+        # The lazify-aware part is an inlined `maybe_force_args`. Whether the target
+        # is lazy is looked up only when the target changes, and the arguments are
+        # forced only if some of them might need it. So in a loop that passes atoms
+        # such as numbers (e.g. as evaluated by `with lazify[strictness]`), or that
+        # jumps into lazy functions, nothing needs to be forced.
         @wraps(function)
         def trampoline(*args: Any, **kwargs: Any) -> Any:
             f = function
+            checked = None  # the target whose laziness `passthrough` describes
+            passthrough = False
             while True:
-                if callable(f):  # the maybe_force_args here causes the performance hit
-                    v = maybe_force_args(f, *args, **kwargs)    # <--
+                if callable(f):
+                    if f is not checked:
+                        checked = f
+                        passthrough = islazy(f) and f is not jump
+                    if passthrough or (f is not jump and _allatoms(args, kwargs)):
+                        v = f(*args, **kwargs)
+                    else:  # forcing the args here is what causes the performance hit
+                        v = maybe_force_args(f, *args, **kwargs)    # <--
                 else:
                     v = f
                 if isinstance(v, _jump):
@@ -294,7 +418,11 @@ def trampolined(function: F) -> F:
                         raise RuntimeError(f"Cannot jump into a non-callable value {repr(f)}")
                     args = v.args
                     kwargs = v.kwargs
-                    v._claimed = True
+                    if type(v) is not _jump:  # inlined `_claim(v)`
+                        v._claimed = True
+                    elif _jump_recycling:
+                        v.target = v.args = v.kwargs = None
+                        _jump_pool.append(v)
                 else:  # final result, exit trampoline
                     return v
         if callable(function):
@@ -3,10 +3,15 @@
 from ..syntax import macros, test, test_raises, the  # noqa: F401
 from ..test.fixtures import session, testset
 
+import gc
+from inspect import signature
+import weakref
+
 from ..arity import (arities, arity_includes,  # noqa: F401 -- documents API surface
                      required_kwargs, optional_kwargs, kwargs,
                      resolve_bindings, tuplify_bindings,
-                     getfunc, UnknownArity)
+                     getfunc, UnknownArity,
+                     _Binder, _get_binder)
 
 def runtests():
     def barefunction(x):
@@ -154,6 +159,80 @@ def runtests():
         test_raises[TypeError, resolve_bindings(f, 1, a=2)]  # same arg assigned twice
         test_raises[TypeError, resolve_bindings(f, 1, b=2)]  # unexpected kwarg
 
+    # The precompiled binder must agree with `inspect.Signature.bind` + `apply_defaults`,
+    # both when the binding succeeds and when it fails.
+    with testset("internal utilities: precompiled binder"):
+        def reference(f, args, kwargs, partial):
+            thesignature = signature(f)
+            try:
+                if partial:
+                    bound_arguments = thesignature.bind_partial(*args, **kwargs)
+                else:
+                    bound_arguments = thesignature.bind(*args, **kwargs)
+            except TypeError:
+                return TypeError
+            bound_arguments.apply_defaults()
+            return bound_arguments.arguments
+        def ours(f, args, kwargs, partial):
+            try:
+                return _Binder(f).arguments(args, kwargs, partial=partial)
+            except TypeError:
+                return TypeError
+
+        def f1(a, b=2, *args, c, d=4, **kw):
+            pass  # pragma: no cover
+        def f2(a, /, b, *, c=3):
+            pass  # pragma: no cover
+        def f3(a, /, **kw):
+            pass  # pragma: no cover
+        def f4(*args):
+            pass  # pragma: no cover
+        def f5():
+            pass  # pragma: no cover
+        calls = [((), {}), ((1,), {}), ((1, 2), {}), ((1, 2, 3), {}), ((1, 2, 3, 4), {}),
+                 ((1,), {"c": 3}), ((), {"a": 1, "c": 3}), ((1,), {"b": 2, "c": 3}),
+                 ((1, 2), {"c": 3, "e": 5}), ((1,), {"a": 1}), ((1,), {"args": 5}),
+                 ((), {"b": 2}), ((1, 2), {"b": 2}), ((1, 2, 3), {"c": 3, "d": 4, "kw": 5})]
+        for f in (f1, f2, f3, f4, f5):
+            for args, kws in calls:
+                for partial in (False, True):
+                    test[ours(f, args, kws, partial) == reference(f, args, kws, partial)]
+
+        # `key` is a shortcut for `tuplify_bindings(resolve_bindings(...))`.
+        test[_Binder(f1).key((1,), {"c": 3, "e": 5}) == tuplify_bindings(resolve_bindings(f1, 1, c=3, e=5))]
+
+        # Shared binders are reused, also for bound methods.
+        test[_get_binder(f1) is _get_binder(f1)]
+        test[_get_binder(target.instmeth) is _get_binder(target.instmeth)]
+        test[_get_binder(target.instmeth).arguments((42,), {}) == {"x": 42}]
+
+        # Creating a binder never raises; inspection happens on first use.
+        b = _Binder(max)
+        with test_raises[ValueError, "max should not be inspectable"]:
+            b.arguments((), {})
+
+        # Shared binders do not keep the callable alive, nor the instance of a bound method.
+        def make_closure():
+            big = [0] * 1000
+            def closure(x):
+                return big, x
+            return closure
+        f = make_closure()
+        resolve_bindings(f, 1)
+        ref = weakref.ref(f)
+        del f
+        gc.collect()
+        test[ref() is None]
+        class Thing:
+            def meth(self, x):
+                pass  # pragma: no cover
+        thing = Thing()
+        resolve_bindings(thing.meth, 1)
+        ref = weakref.ref(thing)
+        del thing
+        gc.collect()
+        test[ref() is None]
+
 if __name__ == '__main__':  # pragma: no cover
     with session(__file__):
         runtests()
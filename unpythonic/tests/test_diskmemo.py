@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+from ..syntax import macros, test, test_raises, the  # noqa: F401
+from ..test.fixtures import session, testset
+
+import gc
+import marshal
+import os
+import tempfile
+
+from ..diskmemo import DiskMemo
+from ..fun import memoize
+from ..gmemo import gmemoize, fimemoize
+from ..it import take
+
+def runtests():
+    tmpdir = tempfile.TemporaryDirectory()
+    path = lambda name: os.path.join(tmpdir.name, name)
+
+    with testset("basic usage"):
+        with DiskMemo(path("basic")) as store:
+            test[len(store) == 0]
+            test_raises[KeyError, store["nonexistent"]]
+            store["a"] = 1
+            store[(1, 2)] = [3, 4]
+            test[len(store) == 2]
+            test["a" in store]
+            test["b" not in the[store]]
+            test[store["a"] == 1]
+            test[store[(1, 2)] == [3, 4]]
+            store["a"] = 42  # overwrite
+            test[store["a"] == 42]
+            test[len(store) == 2]
+
+    with testset("persistence across reopen"):
+        with DiskMemo(path("persist")) as store:
+            for k in range(100):
+                store[k] = k**2
+        with DiskMemo(path("persist")) as store:
+            test[len(store) == 100]
+            test[all(store[k] == k**2 for k in range(100))]
+        test_raises[ValueError, store["a"]]  # closed
+
+    with testset("index growth"):
+        with DiskMemo(path("grow"), capacity=2) as store:
+            for k in range(1000):
+                store[("key", k)] = str(k)
+            test[len(store) == 1000]
+            test[all(store[("key", k)] == str(k) for k in range(1000))]
+            test[("key", 1000) not in the[store]]
+
+    with testset("hash collisions"):
+        with DiskMemo(path("collide"), capacity=4) as store:
+            store._hash = lambda k, _orig=store._hash: (_orig(k)[0], 0)  # everything collides
+            for k in range(20):
+                store[k] = -k
+            test[all(store[k] == -k for k in range(20))]
+            test[20 not in the[store]]
+
+    with testset("clear"):
+        with DiskMemo(path("clear")) as store:
+            for k in range(10):
+                store[k] = k
+            size = os.path.getsize(path("clear") + ".log")
+            store.clear()
+            test[len(store) == 0]
+            test[0 not in the[store]]
+            test[os.path.getsize(path("clear") + ".log") < the[size]]
+            store[0] = "new"
+            test[store[0] == "new"]
+
+    with testset("files are closed also without close()"):
+        store = DiskMemo(path("dropped"), capacity=2)
+        for k in range(10):  # grow the index, which maps it again
+            store[k] = k
+        log, index_fd, index = store._log, store._index_fd, store._index
+        del store
+        gc.collect()
+        test[log.closed]
+        test[index.closed]
+        test_raises[OSError, os.fstat(index_fd)]
+
+        store = DiskMemo(path("dropped"))
+        store.close()
+        store.close()  # closing again is fine
+        test_raises[ValueError, store[0]]
+
+    with testset("custom serializer"):
+        with DiskMemo(path("marshal"), serializer=marshal) as store:
+            store["x"] = {"a": [1, 2]}
+            test[store["x"] == {"a": [1, 2]}]
+        test[os.path.getsize(path("marshal") + ".log") > 0]
+
+    with testset("error cases"):
+        test_raises[ValueError, DiskMemo(path("bad"), capacity=3)]
+        with open(path("notindex.idx"), "wb") as f:
+            f.write(b"garbage" * 10)
+        test_raises[ValueError, DiskMemo(path("notindex"))]
+
+    with testset("memoize with a DiskMemo store"):
+        evaluations = 0
+        def f(a, b=2):
+            nonlocal evaluations
+            evaluations += 1
+            return a * b
+        store = DiskMemo(path("memoize"))
+        mf = memoize(store=store)(f)
+        test[mf(3) == 6]
+        test[mf(3, 2) == 6]  # same bindings
+        test[mf(a=3) == 6]
+        test[evaluations == 1]
+        test[mf(4) == 8]
+        test[evaluations == 2]
+        test[mf.cache_info().currsize == 2]
+        store.close()
+
+        # A new memoized function, e.g. in a later run of the program, picks up the memo.
+        store = DiskMemo(path("memoize"))
+        mf = memoize(store=store)(f)
+        test[mf(3) == 6]
+        test[mf(4) == 8]
+        test[evaluations == 2]
+
+        # Memoized exceptions survive too, as equal copies.
+        raised = 0
+        @memoize(store=store)
+        def g(x):
+            nonlocal raised
+            raised += 1
+            raise ValueError(f"bad {x}")
+        test_raises[ValueError, g(1)]
+        test_raises[ValueError, g(1)]
+        test[raised == 1]
+
+        mf.cache_clear()
+        test[len(store) == 0]
+        store.close()
+
+        test_raises[ValueError, memoize(f, store={}, maxsize=10)]
+        test_raises[ValueError, memoize(f, store={}, ttl=1.0)]
+
+    with testset("gmemoize with a DiskMemo store"):
+        evaluations = 0
+        def naturals(start):
+            nonlocal evaluations
+            j = start
+            while True:
+                evaluations += 1
+                yield j
+                j += 1
+        store = DiskMemo(path("gmemoize"))
+        g = gmemoize(store=store)(naturals)
+        test[tuple(take(5, g(10))) == (10, 11, 12, 13, 14)]
+        test[tuple(take(3, g(10))) == (10, 11, 12)]
+        test[evaluations == 5]
+        store.close()
+
+        # Warm start: the stored items are available without running the generator.
+        store = DiskMemo(path("gmemoize"))
+        g = gmemoize(store=store)(naturals)
+        evaluations = 0
+        test[tuple(take(5, g(10))) == (10, 11, 12, 13, 14)]
+        test[evaluations == 0]
+        test[g(10)[2] == 12]
+        test[g(10)[-1] == 14]
+        test[g(10)[1:3] == [11, 12]]
+        # Continuing past them re-runs the generator, skipping the stored items.
+        test[tuple(take(7, g(10))) == (10, 11, 12, 13, 14, 15, 16)]
+        test[evaluations == 7]
+        store.close()
+
+        # The end of a finite sequence is memoized, too.
+        store = DiskMemo(path("fimemoize"))
+        fg = fimemoize(store=store)(lambda n: range(n))
+        test[tuple(fg(3)) == (0, 1, 2)]
+        store.close()
+        store = DiskMemo(path("fimemoize"))
+        fg = fimemoize(store=store)(lambda n: 1 / 0)  # never called, the sequence is stored
+        test[tuple(fg(3)) == (0, 1, 2)]
+        store.close()
+
+    tmpdir.cleanup()
+
+if __name__ == '__main__':  # pragma: no cover
+    with session(__file__):
+        runtests()
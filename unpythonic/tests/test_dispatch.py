@@ -3,14 +3,18 @@
 from ..syntax import macros, test, test_raises, fail, the  # noqa: F401
 from ..test.fixtures import session, testset, returns_normally
 
+import abc
 import collections
 import contextlib
 import io
 import re
 import typing
 
+from ..dynassign import dyn
 from ..fun import curry
-from ..dispatch import generic, augment, typed, format_methods
+from ..dispatch import (generic, augment, typed, format_methods, list_methods,
+                        enable_dispatch_stats, disable_dispatch_stats, dispatch_stats)
+from ..typecheck import CheckPolicy
 
 @generic
 def zorblify(x: int, y: int):
@@ -263,6 +267,47 @@ def runtests():
 
         test_raises[TypeError, tt2.clsmeth(None)]  # not defined for NoneType
 
+    with testset("@generic integration with OOP, cached MRO lookup"):
+        class Shape:
+            @generic
+            def describe(self, x: typing.List[int]):  # parametric, so not in the dispatch cache
+                return "Shape: ints"
+        class Square(Shape):
+            @generic
+            def describe(self, x: typing.List[str]):
+                return "Square: strs"
+        sq = Square()
+        test[sq.describe(["a"]) == "Square: strs"]
+        test[sq.describe([1]) == "Shape: ints"]
+        test_raises[TypeError, sq.describe([1.0])]
+
+        # Registering a new multimethod on a class in the MRO invalidates the cached lookup.
+        class Shape:  # noqa: F811, redefine, because we need access to the class body.
+            @generic
+            def describe(self, x: typing.List[float]):
+                return "Shape: floats"
+        # The fullname is the same, so this registered to the same dispatcher as before.
+        test[Square.__mro__[1].describe is Shape.describe]
+        test[sq.describe([1.0]) == "Shape: floats"]
+        test[sq.describe([1]) == "Shape: ints"]
+
+        # Classes created later (e.g. by an `__init_subclass__` hook) are looked up correctly.
+        registry = []
+        class Plugin(Square):
+            def __init_subclass__(cls, **kwargs):
+                super().__init_subclass__(**kwargs)
+                registry.append(cls)
+        class MyPlugin(Plugin):
+            pass
+        test[registry == [MyPlugin]]
+        test[MyPlugin().describe(["a"]) == "Square: strs"]
+        test[MyPlugin().describe([1.0]) == "Shape: floats"]
+
+        # `list_methods` returns a fresh list.
+        methods_list = list_methods(sq.describe)
+        methods_list.clear()
+        test[len(list_methods(sq.describe)) == 3]
+
     with testset("@typed"):
         test[blubnify(2, 21.0) == 42]
         test_raises[TypeError, blubnify(2, 3)]  # blubnify only accepts (int, float)
@@ -275,6 +320,54 @@ def runtests():
         test[jack("foo") == "foo"]
         test_raises[TypeError, jack(3.14)]  # jack only accepts int or str
 
+    with testset("@typed fast path"):
+        @typed
+        def scale(x: typing.Union[int, float], k: int = 2, *, label: str = "x"):
+            return (label, k * x)
+        test[scale._fastpath is not None]
+        test[scale(3) == ("x", 6)]
+        test[scale(1.5, 3) == ("x", 4.5)]
+        test[scale(3, k=3, label="y") == ("y", 9)]  # keyword arguments use the general path
+        test_raises[TypeError, scale("a")]
+        test_raises[TypeError, scale(3, 2.0)]
+        test_raises[TypeError, scale()]
+        test_raises[TypeError, scale(1, 2, 3)]
+
+        # A default value that fails its type check must be passed explicitly.
+        @typed
+        def strict(x: int, y: int = None):
+            return x + y
+        test[strict._fastpath.minargs == 2]
+        test[strict(1, 2) == 3]
+        test_raises[TypeError, strict(1)]
+
+        # Parametric types are checked with the compiled type checks.
+        @typed
+        def summed(xs: typing.List[int], extra: typing.Any = 0):
+            return sum(xs) + extra
+        test[summed([1, 2, 3]) == 6]
+        test[summed([1, 2], 0.5) == 3.5]
+        test_raises[TypeError, summed([1, "x"])]
+        test_raises[TypeError, summed((1, 2))]
+
+        # Varargs are handled by the general path.
+        @typed
+        def varargs(*args: typing.Tuple[int, ...]):
+            return sum(args)
+        test[varargs._fastpath is None]
+        test[varargs(1, 2, 3) == 6]
+        test_raises[TypeError, varargs(1, "a")]
+
+        # On OOP methods, `self` is not checked.
+        class Scaler:
+            def __init__(self, k):
+                self.k = k
+            @typed
+            def scale(self, x: int):
+                return self.k * x
+        test[Scaler(3).scale(2) == 6]
+        test_raises[TypeError, Scaler(3).scale(2.0)]
+
     with testset("list_methods"):
         def check_formatted_multimethods(result, expected):
             def _remove_space_before_typehint(string):  # Python 3.6 didn't print a space there, later versions do
@@ -491,6 +584,258 @@ def runtests():
         test[summarize([1, 2, 3]) == "collection of 3 ints"]
         test[summarize(["a", "b"]) == "collection of 2 strs"]
 
+    with testset("dispatch cache"):
+        @generic
+        def cached(x: int, y: int):
+            return "int, int"
+        @generic
+        def cached(x: str, y: int):  # noqa: F811
+            return "str, int"
+        test[cached(1, 2) == "int, int"]
+        test[cached("a", 2) == "str, int"]
+        test[cached(3, 4) == "int, int"]  # cache hit
+        test[cached(x=3, y=4) == "int, int"]  # different shape of argument list
+        test[len(the[cached._dispatch_cache.entries]) == 3]
+        test_raises[TypeError, cached(1.0, 2)]
+
+        # Registering a new multimethod invalidates the cache.
+        @generic
+        def cached(x: int, y: int):  # noqa: F811
+            return "new int, int"
+        test[cached(1, 2) == "new int, int"]
+
+        # Parametric type specifications are not type-determined, so those decisions are not cached.
+        @generic
+        def elements(x: typing.List[int]):
+            return "ints"
+        @generic
+        def elements(x: typing.List[str]):  # noqa: F811
+            return "strs"
+        test[elements([1, 2]) == "ints"]
+        test[elements(["a", "b"]) == "strs"]
+        test[elements([3, 4]) == "ints"]
+        test[len(the[elements._dispatch_cache.entries]) == 0]
+
+        # Registering a virtual subclass of an ABC invalidates the cache.
+        class Quacker(abc.ABC):
+            pass
+        class Duck:
+            pass
+        @generic
+        def quack(x: typing.Any):
+            return "not a quacker"
+        @generic
+        def quack(x: Quacker):  # noqa: F811
+            return "quack"
+        test[quack(Duck()) == "not a quacker"]
+        Quacker.register(Duck)
+        test[quack(Duck()) == "quack"]
+
+        # In a `@classmethod`, the class itself (not just its metaclass) is part of the key.
+        class Base:
+            @classmethod
+            @generic
+            def who(cls, x: int):
+                return "base"
+        class Derived(Base):
+            @classmethod
+            @generic
+            def who(cls, x: float):
+                return "derived"
+        test[Base.who(1) == "base"]
+        test[Derived.who(1) == "base"]  # via MRO
+        test[Derived.who(1.0) == "derived"]
+        test_raises[TypeError, Base.who(1.0)]
+
+    with testset("compiled dispatch"):
+        @generic(compiled=True)
+        def zorblify2(x: int, y: int):
+            return 2 * x + y
+        @generic
+        def zorblify2(x: str, y: float):  # noqa: F811
+            return f"{x[::-1]} {y}"
+        @generic
+        def zorblify2(x: int, *args: typing.Sequence[str]):  # noqa: F811
+            return f"{x}, {', '.join(args)}"
+        @generic
+        def zorblify2(x: str, y: typing.List[int] = [1, 2]):  # noqa: F811
+            return f"{x} {y}"
+        test[zorblify2(17, 8) == 42]
+        test[zorblify2(17, y=8) == 42]
+        test[zorblify2(y=8, x=17) == 42]
+        test[zorblify2("tac", 1.0) == "cat 1.0"]
+        test[zorblify2(y=1.0, x="tac") == "cat 1.0"]
+        test[zorblify2(23, "cat", "meow") == "23, cat, meow"]
+        test[zorblify2("tac") == "tac [1, 2]"]  # default value checked, too
+        test[zorblify2("tac", [3]) == "tac [3]"]
+        test_raises[TypeError, zorblify2(1.0, 2.0)]
+        test_raises[TypeError, zorblify2("tac", ["a"])]
+
+        # First match wins, in most-recently-registered order, just like in the default mode.
+        @generic(compiled=True)
+        def priority(x: typing.Any, y: int):
+            return "any"
+        @generic
+        def priority(x: int, y: int):  # noqa: F811
+            return "int"
+        @generic
+        def priority(x: bool, y: int):  # noqa: F811
+            return "bool"
+        test[priority(True, 1) == "bool"]
+        test[priority(1, 1) == "int"]
+        test[priority(1.0, 1) == "any"]
+        test_raises[TypeError, priority(1, 1.0)]
+
+        # Compiled mode works with OOP, too.
+        class CompiledTarget:
+            @generic(compiled=True)
+            def meth(self, x: int):
+                return "int"
+            @generic
+            def meth(self, x: str):  # noqa: F811
+                return "str"
+        class CompiledTarget2(CompiledTarget):
+            @generic(compiled=True)
+            def meth(self, x: float):
+                return "float"
+        ct = CompiledTarget2()
+        test[ct.meth(1) == "int"]
+        test[ct.meth("a") == "str"]
+        test[ct.meth(1.0) == "float"]
+        test_raises[TypeError, ct.meth(None)]
+        test_raises[TypeError, CompiledTarget().meth(1.0)]
+
+    with testset("element check policy"):
+        @typed(policy=CheckPolicy("first", k=2))
+        def total(xs: typing.List[int]):
+            return len(xs)
+        test[total([1, 2, 3]) == 3]
+        test[total([1, 2, "x"]) == 3]  # third element not checked
+        test_raises[TypeError, total([1, "x", 3])]
+        test_raises[TypeError, total(None)]
+
+        @typed(policy=CheckPolicy("shape"))
+        def count(xs: typing.List[int]):
+            return len(xs)
+        test[count(["a", "b"]) == 2]
+        test_raises[TypeError, count(("a", "b"))]  # container type still checked
+
+        # Without an explicit policy, the dynvar `typecheck_policy` is used.
+        @typed
+        def total2(xs: typing.List[int]):
+            return len(xs)
+        test_raises[TypeError, total2([1, "x"])]
+        with dyn.let(typecheck_policy=CheckPolicy("first", k=1)):
+            test[total2([1, "x"]) == 2]
+        test_raises[TypeError, total2([1, "x"])]
+
+        # Also in compiled dispatch.
+        @generic(compiled=True)
+        def total3(xs: typing.List[int]):
+            return len(xs)
+        test_raises[TypeError, total3([1, "x"])]
+        with dyn.let(typecheck_policy=CheckPolicy("first", k=1)):
+            test[total3([1, "x"]) == 2]
+
+        # Also in curry.
+        @typed(policy=CheckPolicy("first", k=1))
+        def pair(xs: typing.List[int], ys: typing.List[int]):
+            return len(xs) + len(ys)
+        test[curry(pair)([1, "x"])([2, "y"]) == 4]
+
+    with testset("most-specific dispatch"):
+        # Registered from most specific to least specific; in the default mode,
+        # the `Any` method would shadow everything else.
+        @generic(specificity=True)
+        def kind(x: bool):
+            return "bool"
+        @generic
+        def kind(x: int):  # noqa: F811
+            return "int"
+        @generic
+        def kind(x: typing.Union[int, float]):  # noqa: F811
+            return "number"
+        @generic
+        def kind(x: typing.List[int]):  # noqa: F811
+            return "list of int"
+        @generic
+        def kind(x: typing.Sequence[typing.Any]):  # noqa: F811
+            return "sequence"
+        @generic
+        def kind(x: typing.Any):  # noqa: F811
+            return "anything"
+        test[kind(True) == "bool"]
+        test[kind(42) == "int"]
+        test[kind(3.14) == "number"]
+        test[kind([1, 2]) == "list of int"]
+        test[kind(["a"]) == "sequence"]
+        test[kind((1, 2)) == "sequence"]
+        test[kind(None) == "anything"]
+        test[[list(type_signature.values())[0] for _, type_signature in list_methods(kind)] ==
+             [typing.List[int], typing.Sequence[typing.Any], bool, int,
+              typing.Union[int, float], typing.Any]]  # more specific first, unrelated ones by recency
+
+        # Unrelated signatures keep the most-recently-registered order.
+        @generic(specificity=True)
+        def pick(x: int, y: typing.Any):
+            return "first"
+        @generic
+        def pick(x: typing.Any, y: int):  # noqa: F811
+            return "second"
+        @generic
+        def pick(x: int, *, y: int):  # noqa: F811, different parameter list, unrelated
+            return "kwonly"
+        test[pick(1, 2) == "second"]
+        test[pick(1, "a") == "first"]
+        test[pick(1, y=2) == "kwonly"]
+
+        # The mode can be enabled on any definition, and then applies to all of them.
+        @generic
+        def late(x: int):
+            return "int"
+        @generic
+        def late(x: typing.Any):  # noqa: F811
+            return "any"
+        test[late(1) == "any"]
+        @generic(specificity=True)
+        def late(x: str):  # noqa: F811
+            return "str"
+        test[late(1) == "int"]
+        test[late("a") == "str"]
+        test[late(1.0) == "any"]
+
+    with testset("dispatch statistics"):
+        @generic
+        def profiled(x: typing.List[int]):  # not cacheable
+            return "list of int"
+        @generic
+        def profiled(x: int):  # noqa: F811, tried first, so cacheable
+            return "int"
+        test[dispatch_stats(profiled) is None]  # not enabled
+        enable_dispatch_stats(profiled)
+        profiled(1)
+        profiled(2)
+        profiled([1, 2])
+        test_raises[TypeError, profiled("no")]
+        stats = dispatch_stats(profiled)
+        test[stats["calls"] == 4]
+        test[stats["failures"] == 1]
+        int_method, list_method = [thecallable for thecallable, _ in list_methods(profiled)]
+        test[stats["methods"] == {int_method: 2, list_method: 1}]
+        test[stats["cache_hits"] == 1]  # the second call with an `int`
+        test[stats["cache_misses"] == 3]
+        test[sum(stats["resolution_histogram"].values()) == 4]
+        test[stats["resolution_ns"] > 0]
+        test[stats["body_ns"] > 0]
+
+        enable_dispatch_stats(profiled)  # resets
+        test[dispatch_stats(profiled)["calls"] == 0]
+        disable_dispatch_stats(profiled)
+        profiled(1)
+        test[dispatch_stats(profiled) is None]
+
+        test_raises[TypeError, enable_dispatch_stats(lambda x: x)]  # not a generic function
+
 if __name__ == '__main__':  # pragma: no cover
     with session(__file__):
         runtests()
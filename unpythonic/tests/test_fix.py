@@ -3,10 +3,12 @@
 from ..syntax import macros, test, the  # noqa: F401
 from ..test.fixtures import session, testset
 
+import gc
 from typing import NoReturn
 import threading
 from queue import Queue
 from math import cos
+import weakref
 
 from ..fix import fix, fixtco
 from ..fun import identity
@@ -105,6 +107,28 @@ def runtests():
         f, c = cosser2(1)  # f ends up in the return value because it's in the args of iterate1_rec.
         test[the[c] == the[cos(c)]]
 
+    with testset("custom cycle key"):
+        # Cycle on the node only; the depth grows without bound, so with the
+        # default key (full bindings), no call would ever repeat.
+        # walk(0, 0) -> walk(1, 1) -> walk(2, 2) -> walk(0, 3) -> ...
+        @fix(key=lambda node, depth: node)
+        def walk(node, depth):
+            return walk((node + 1) % 3, depth + 1)
+        test[walk(0, 0) is NoReturn]
+
+        # The key function receives the arguments as passed.
+        @fix(lambda funcname, node, depth: (node, depth),
+             key=lambda node, depth: node)
+        def walk2(node, depth):
+            return walk2((node + 1) % 3, depth=depth + 1)
+        test[walk2(0, depth=0) == (0, 3)]
+
+        # `key=lambda *args: args` skips the argument binding step.
+        @fix(key=lambda *args: args)
+        def f(k):
+            return f((k + 1) % 3)
+        test[f(0) is NoReturn]
+
     with testset("thread-safety"):
         def threadtest():
             a_calls = []
@@ -171,6 +195,24 @@ def runtests():
             return f(k)
         test[g(0) is NoReturn]
 
+        @fixtco(key=lambda node, depth: node)
+        def walk(node, depth):
+            return jump(walk, (node + 1) % 5000, depth + 1)
+        test[walk(0, 0) is NoReturn]
+
+        # The registry of cycle keys used in TCO chains does not keep the functions alive.
+        def make():
+            @fixtco()
+            def h(k):
+                return jump(h, (k + 1) % 10)
+            return h
+        h = make()
+        test[h(0) is NoReturn]
+        ref = weakref.ref(h.__wrapped__)
+        del h
+        gc.collect()
+        test[ref() is None]
+
 if __name__ == '__main__':  # pragma: no cover
     with session(__file__):
         runtests()
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 
-from ..syntax import macros, test, test_raises, fail  # noqa: F401
+from ..syntax import macros, test, test_raises, fail, warn  # noqa: F401
 from ..test.fixtures import session, testset
 
-from ..fploop import looped, looped_over, breakably_looped, breakably_looped_over
+from ..fploop import (looped, looped_over, breakably_looped, breakably_looped_over,
+                      fast_looped_over)
 from ..tco import trampolined, jump
 
 from ..ec import catch, throw
@@ -12,6 +13,8 @@ from ..let import let
 from ..misc import timer
 from ..seq import begin
 
+import operator
+
 def runtests():
     with testset("basic usage"):
         @looped
@@ -374,6 +377,81 @@ def runtests():
             def s(loop, x, acc, cnt):  # missing `brk` parameter
                 return loop(acc + x)  # pragma: no cover
 
+    with testset("fast_looped_over"):
+        @fast_looped_over(range(10), acc=0)
+        def s1(loop, x, acc):
+            return loop(acc + x)
+        test[s1 == 45]
+
+        @fast_looped_over((), acc="empty")
+        def s2(loop, x, acc):
+            return loop(acc + x)  # pragma: no cover
+        test[s2 == "empty"]
+
+        # `loop()` keeps `acc`; extra parameters, positional and named
+        @fast_looped_over(range(10), acc=0)
+        def s3(loop, x, acc, evens=0, *, odds=0):
+            if x % 2 == 0:
+                return loop(acc + x, evens + 1, odds=odds)
+            if x == 9:
+                return loop(acc, evens, odds=odds + 1)
+            return loop(odds=odds + 1)
+        test[s3 == 20]
+
+        # returning a value exits the loop (like `brk`)
+        @fast_looped_over(range(100), acc=0)
+        def s5(loop, x, acc):
+            if x == 10:
+                return ("stopped", acc)
+            return loop(acc + x)
+        test[s5 == ("stopped", 45)]
+
+        # tail calls out of the body go through a trampoline, and may come back to `loop`
+        def helper(loop, x, acc):
+            if x == 5:
+                return "helper stopped"
+            return loop(acc + x)
+        @fast_looped_over(range(10), acc=0)
+        def s6(loop, x, acc):
+            return jump(helper, loop, x, acc)
+        test[s6 == "helper stopped"]
+        @fast_looped_over(range(5), acc=0)
+        def s7(loop, x, acc):
+            return jump(helper, loop, x, acc)
+        test[s7 == 10]
+
+        # nested
+        @fast_looped_over(range(1, 4), acc=[])
+        def s8(outer_loop, y, outer_acc):
+            @fast_looped_over(range(1, 3), acc=[])
+            def inner(inner_loop, x, inner_acc):
+                return inner_loop(inner_acc + [y * x])
+            return outer_loop(outer_acc + [inner])
+        test[s8 == [[1, 2], [2, 4], [3, 6]]]
+
+        with test_raises[ValueError, "should detect arity mismatch"]:
+            @fast_looped_over(range(10), acc=0)
+            def s9(loop, x):
+                return loop()  # pragma: no cover
+
+    with testset("fast_looped_over, reductions"):
+        test[fast_looped_over(range(10), acc=0)(operator.add) == 45]
+        test[fast_looped_over(range(1, 6), acc=1)(operator.mul) == 120]
+        test[fast_looped_over([5, 3, 7], acc=0)(operator.xor) == 5 ^ 3 ^ 7]
+        test[fast_looped_over([5, 3, 7], acc=10)(min) == 3]
+        test[fast_looped_over([5, 3, 7], acc=10)(max) == 10]
+        test[fast_looped_over((), acc=42)(operator.add) == 42]
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover
+            warn["NumPy not installed, skipping NumPy reduction tests."]
+        else:
+            a = numpy.arange(1, 101, dtype=numpy.int64)
+            test[fast_looped_over(a, acc=0)(operator.add) == 5050]
+            test[fast_looped_over(a, acc=1000)(max) == 1000]
+            test[fast_looped_over(a[:0], acc=17)(operator.add) == 17]
+            test[fast_looped_over(numpy.array([0b1100, 0b1010]), acc=0b1111)(operator.and_) == 0b1000]
+
     # TODO: need some kind of benchmarking tools to do this properly.
     with testset("performance benchmark"):
         n = 100000
@@ -393,12 +471,19 @@ def runtests():
             def _ignored4(loop, x, acc):    # but body always takes at least these three parameters
                 return loop()
 
+        with timer() as fp4:
+            @fast_looped_over(range(n))
+            def _ignored5(loop, x, acc):
+                return loop()
+
         print(f"do-nothing loop, {n:d} iterations:")
         print(f"  builtin for {ip.dt:g}s ({(ip.dt / n):g}s/iter)")
         print(f"  @looped {fp2.dt:g}s ({(fp2.dt / n):g}s/iter)")
         print(f"  @looped_over {fp3.dt:g}s ({(fp3.dt / n):g}s/iter)")
+        print(f"  @fast_looped_over {fp4.dt:g}s ({(fp4.dt / n):g}s/iter)")
         print(f"@looped slowdown {(fp2.dt / ip.dt):g}x")
         print(f"@looped_over slowdown {(fp3.dt / ip.dt):g}x")
+        print(f"@fast_looped_over slowdown {(fp4.dt / ip.dt):g}x")
 
 if __name__ == '__main__':  # pragma: no cover
     with session(__file__):
@@ -4,13 +4,16 @@ from ..syntax import macros, test, test_raises, fail, the  # noqa: F401
 from ..test.fixtures import session, testset, returns_normally
 
 from collections import Counter
+from inspect import signature
 import sys
 from queue import Queue
 import threading
 from time import sleep
+import weakref
 
 from ..dispatch import generic
-from ..fun import (memoize, partial, curry, apply,
+from ..fix import fix
+from ..fun import (memoize, partial, curry, iscurried, apply,
                    identity, const,
                    andf, orf, notf,
                    flip, rotate,
@@ -20,6 +23,7 @@ from ..fun import (memoize, partial, curry, apply,
                    withself)
 from ..funutil import Values
 from ..it import allsame
+from ..lazyutil import islazy, passthrough_lazy_args
 from ..misc import slurp
 
 from ..dynassign import dyn
@@ -170,6 +174,157 @@ def runtests():
             test[allsame(results)]
         threadtest()
 
+    with testset("@memoize, misses on different keys do not wait for each other"):
+        release = threading.Event()
+        evaluations = Counter()
+        @memoize
+        def f(x):
+            evaluations[x] += 1
+            if x == "slow":
+                release.wait(timeout=10)
+            return x
+        slow_results = Queue()
+        def worker(que):
+            que.put(f("slow"))
+        threads = [threading.Thread(target=worker, args=(slow_results,)) for _ in range(2)]
+        for t in threads:
+            t.start()
+        sleep(0.05)  # let both threads get in
+        test[f("fast") == "fast"]
+        test[not release.is_set()]  # we didn't have to wait for "slow"
+        release.set()
+        for t in threads:
+            t.join()
+        test[slurp(slow_results) == ["slow", "slow"]]
+        test[evaluations["slow"] == 1]  # the other thread waited for the result
+        test[the[f.contention_info().waits] == 1]
+        test[the[f.contention_info().wait_time] > 0.0]
+        f.cache_clear()
+        test[f.contention_info() == (0, 0.0)]
+
+        # When two threads each wait for a value the other one is computing,
+        # the second one to start waiting computes the value itself instead.
+        barrier = threading.Barrier(2, timeout=10)
+        local = threading.local()
+        @fix()
+        def cyclic(x):
+            if not getattr(local, "started", False):
+                local.started = True
+                barrier.wait()  # make sure both threads are computing before either continues
+            return (x, cyclic("b" if x == "a" else "a"))
+        results = Queue()
+        threads = [threading.Thread(target=lambda x: results.put(cyclic(x)), args=(x,)) for x in "ab"]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+        test[not any(t.is_alive() for t in threads)]  # no deadlock
+        test[len(slurp(results)) == 2]
+
+    with testset("@memoize cache_info, cache_clear"):
+        @memoize
+        def square(x):
+            return x**2
+        square(2)
+        square(2)
+        square(3)
+        test[square.cache_info() == (1, 2, None, 2)]  # hits, misses, maxsize, currsize
+        square.cache_clear()
+        test[square.cache_info() == (0, 0, None, 0)]
+
+    with testset("@memoize with maxsize and eviction policy"):
+        def make(policy):
+            evaluations = Counter()
+            @memoize(maxsize=2, policy=policy)
+            def f(x):
+                evaluations[x] += 1
+                return x**2
+            return f, evaluations
+
+        f, evaluations = make("lru")
+        f(1)
+        f(2)
+        f(1)  # 1 is now the most recently used
+        f(3)  # evicts 2
+        test[the[f.cache_info().currsize] == 2]
+        f(1)
+        test[evaluations[1] == 1]
+        f(2)
+        test[evaluations[2] == 2]
+
+        f, evaluations = make("fifo")
+        f(1)
+        f(2)
+        f(1)  # using an entry doesn't matter for FIFO
+        f(3)  # evicts 1
+        f(2)
+        test[evaluations[2] == 1]
+        f(1)
+        test[evaluations[1] == 2]
+
+        f, evaluations = make("lfu")
+        f(1)
+        f(1)
+        f(2)
+        f(3)  # evicts 2, used less often than 1
+        f(1)
+        test[evaluations[1] == 1]
+        f(2)
+        test[evaluations[2] == 2]
+
+        test_raises[ValueError, memoize(maxsize=0)(lambda x: x)]
+        test_raises[ValueError, memoize(policy="random")(lambda x: x)]
+        test_raises[ValueError, memoize(ttl=-1)(lambda x: x)]
+
+    with testset("@memoize with ttl"):
+        evaluations = 0
+        @memoize(ttl=0.05)
+        def g(x):
+            nonlocal evaluations
+            evaluations += 1
+            return x
+        g(1)
+        g(1)
+        test[evaluations == 1]
+        sleep(0.1)
+        g(1)
+        test[evaluations == 2]
+
+        # Exceptions are memoized, and expire, too.
+        evaluations = 0
+        @memoize(maxsize=10, ttl=0.05)
+        def h():
+            nonlocal evaluations
+            evaluations += 1
+            raise ValueError(evaluations)
+        with test_raises[ValueError]:
+            h()
+        with test_raises[ValueError]:
+            h()
+        test[evaluations == 1]
+        sleep(0.1)
+        with test_raises[ValueError]:
+            h()
+        test[evaluations == 2]
+
+    with testset("@memoize with maxsize, thread-safety"):
+        @memoize(maxsize=4)
+        def f(x):
+            sleep(0.001)
+            return (id(threading.current_thread()), x)
+        comm = Queue()
+        def worker(que):
+            que.put(f(42))
+        n = 100
+        threads = [threading.Thread(target=worker, args=(comm,)) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        results = slurp(comm)
+        test[the[len(results)] == the[n]]
+        test[allsame(results)]
+
     with testset("partial (type-checking wrapper)"):
         def nottypedfunc(x):
             return "ok"
@@ -287,6 +442,90 @@ def runtests():
         test[makemul(x=2, y=3) == 6]
         test[makemul(y=3, x=2) == 6]
 
+    with testset("curry saturated call fast path"):
+        @curry
+        def kwonly(a, *, b, c=3):
+            return a, b, c
+        test[kwonly(1, b=2) == (1, 2, 3)]
+        test[kwonly(1, c=4, b=2) == (1, 2, 4)]
+        test[kwonly(b=2)(1) == (1, 2, 3)]
+
+        @curry
+        def star(a, *args, **kwargs):
+            return a, args, kwargs
+        test[star(1) == (1, (), {})]
+        test[star(1, 2, 3, x=4) == (1, (2, 3), {"x": 4})]
+
+        @curry
+        def posonly(a, /, **kwargs):
+            return a, kwargs
+        test[posonly(1, a=2) == (1, {"a": 2})]  # `a` goes to `**kwargs`, like in Python
+
+        # A saturated call does not push to `curry_context`, but curry calls in its
+        # dynamic extent still see that they are not the top-level curry context.
+        def double(x):
+            return 2 * x
+        @curry
+        def leftovers(x):
+            return curry(double, x, "foo")
+        test[leftovers(2) == Values(4, "foo")]
+        with test_raises[TypeError, "leftovers at the top level should still be an error"]:
+            curry(double, 2, "foo")
+
+        @curry
+        def fails(x):
+            raise ValueError(x)
+        with test_raises[ValueError]:
+            fails(42)
+        with test_raises[TypeError, "the nesting level should be restored when the call raises"]:
+            curry(double, 2, "foo")
+
+    with testset("curried partial application"):
+        @curry
+        def add3(a, b, c):
+            return a + b + c
+        p = add3(1)
+        test[iscurried(p)]
+        test[p(2)(3) == 6]
+        test[p(2, 3) == 6]
+        test[p(c=3)(b=2) == 6]
+        test[p(10, 20) == 31]  # p is not modified by its uses
+        test[signature(p(2)) == signature(lambda c: None)]
+        test[weakref.ref(p)() is p]
+
+        # Introspection sees the original function.
+        @curry
+        def add3doc(a, b, c):
+            """Add three numbers."""
+            return a + b + c
+        p = add3doc(1)
+        test[p.__name__ == "add3doc"]
+        test[p.__qualname__ == add3doc.__qualname__]
+        test[p.__doc__ == "Add three numbers."]
+        test[p(2).__name__ == "add3doc"]
+
+        # Like a function, a partial application binds as a method.
+        @curry
+        def addx(a, self, c):
+            return a + self.x + c
+        class Adder:
+            def __init__(self, x):
+                self.x = x
+            add = addx(1)
+        test[Adder(10).add(100) == 111]
+        test[Adder.add is the[Adder.__dict__["add"]]]
+
+        @curry
+        def named(a, b, c=3):
+            return a, b, c
+        test[named(c=4)(c=5)(1, 2) == (1, 2, 5)]  # the latest binding wins, like in `functools.partial`
+
+        test[islazy(curry(passthrough_lazy_args(lambda a, b: (a, b)))(1))]
+        def pairdoc(a, b):
+            """Make a pair."""
+            return a, b  # pragma: no cover
+        test[curry(passthrough_lazy_args(pairdoc))(1).__doc__ == "Make a pair."]
+
     with testset("curry integration with @generic"):  # v0.15.0+
         @generic
         def f(x: int):
@@ -5,6 +5,7 @@ from ..test.fixtures import session, testset
 
 from itertools import count, takewhile, chain
 from collections import Counter
+import threading
 
 from ..gmemo import gmemoize, imemoize, fimemoize
 
@@ -168,6 +169,139 @@ def runtests():
         test[the[last(se(25))] == the[last(se(25))]]
         test[the[last(se(20))] == the[last(se(20))]]
 
+    with testset("take_memoized"):
+        evaluations = 0
+        @gmemoize
+        def naturals():
+            nonlocal evaluations
+            for j in count():
+                evaluations += 1
+                yield j
+        g = naturals()
+        test[g.take_memoized(0, 5) == [0, 1, 2, 3, 4]]  # computes the missing items
+        test[evaluations == 5]
+        test[next(g) == 0]  # the instance was not advanced
+        test[g.take_memoized(2, 4) == [2, 3]]
+        test[g.take_memoized(3, 3) == []]
+        test[evaluations == 5]
+        test[g.take_memoized(3, 8) == [3, 4, 5, 6, 7]]
+        test[evaluations == 8]
+        test_raises[ValueError, g.take_memoized(-1, 3)]
+
+        @gmemoize
+        def finite():
+            yield from range(3)
+        f = finite()
+        test[f.take_memoized(1, 10) == [1, 2]]  # islice-like at the end of the sequence
+        test[f.take_memoized(0, 10) == [0, 1, 2]]
+        test[len(f) == 4]  # the end is memoized, but only once
+        test[tuple(f) == (0, 1, 2)]
+
+        @gmemoize
+        def failing():
+            yield 1
+            raise ValueError("oops")
+        h = failing()
+        test_raises[ValueError, h.take_memoized(0, 5)]
+        test[h.take_memoized(0, 1) == [1]]
+
+    with testset("replaying from several threads"):
+        @gmemoize
+        def naturals():
+            yield from count()
+        n = 10000
+        test[the[tuple(take(n, naturals()))] == tuple(range(n))]
+        results = []
+        def replay():
+            results.append(tuple(take(2 * n, naturals())))  # half cached, half computed
+        threads = [threading.Thread(target=replay) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        test[len(results) == 8]
+        test[all(r == tuple(range(2 * n)) for r in results)]
+        test[len(naturals()) == 2 * n]
+
+    with testset("bounded window"):
+        evaluations = 0
+        @gmemoize(window=3)
+        def naturals():
+            nonlocal evaluations
+            for j in count():
+                evaluations += 1
+                yield j
+        g1 = naturals()
+        test[tuple(take(10, g1)) == tuple(range(10))]
+        test[len(g1) == 10]
+        test[g1[-1] == 9]
+        test[g1[7:10] == [7, 8, 9]]
+        # Items are dropped in batches of `window`; the last drop was at 9 items.
+        test_raises[IndexError, g1[5]]
+        test[g1[6] == 6]
+        test_raises[IndexError, g1[10]]
+
+        # A new instance starts from the oldest item kept.
+        g2 = naturals()
+        test[tuple(take(3, g2)) == (6, 7, 8)]
+        test[evaluations == 10]
+
+        # A live instance that lags behind keeps the items it has not reached.
+        g3 = naturals()
+        test[next(g3) == 6]
+        test[tuple(take(10, g1)) == tuple(range(10, 20))]
+        test[g1[7] == 7]
+        test[tuple(take(3, g3)) == (7, 8, 9)]
+        test[evaluations == 20]
+        del g2, g3  # now nothing holds back the window
+        next(g1)
+        test_raises[IndexError, g1[17]]
+        test[g1[18:21] == [18, 19, 20]]
+
+        test_raises[ValueError, gmemoize(naturals, window=0)]
+        test_raises[ValueError, gmemoize(naturals, window=3, spill=3)]
+
+    with testset("spill to disk"):
+        evaluations = 0
+        @gmemoize(spill=4)
+        def squares():
+            nonlocal evaluations
+            for j in count():
+                evaluations += 1
+                if j == 5:
+                    yield ValueError("not raised, just a value")
+                else:
+                    yield j**2
+        g1 = squares()
+        expected = tuple((j**2 if j != 5 else None) for j in range(20))
+        test[tuple(x if not isinstance(x, ValueError) else None for x in take(20, g1)) == expected]
+        memo = g1.memo
+        test[memo.spilled == 16]
+        test[len(the[memo.items]) == 4]
+        test[len(g1) == 20]
+        test[g1[3] == 9]  # read back from the file
+        test[isinstance(g1[5], ValueError)]
+        test[g1[14:18] == [196, 225, 256, 289]]  # across the spill boundary
+        test[g1[-1] == 361]
+
+        g2 = squares()  # replays from the beginning
+        test[tuple(take(4, g2)) == (0, 1, 4, 9)]
+        test[evaluations == 20]
+
+        # Exceptions are memoized across the spill, too.
+        @fimemoize(spill=2)
+        def failing(n):
+            return (1 // (n - j) for j in range(2 * n))
+        g = failing(3)
+        test[tuple(take(3, g)) == (0, 0, 1)]
+        test_raises[ZeroDivisionError, next(g)]
+        h = failing(3)
+        for _ in range(3):
+            next(h)
+        test[g.memo.spilled > 0]
+        test_raises[ZeroDivisionError, next(h)]
+        test_raises[ZeroDivisionError, g[3]]
+
     with testset("FP sieve of Eratosthenes"):
         def primes():  # no memoization, recomputes unnecessarily, very slow
             yield 2
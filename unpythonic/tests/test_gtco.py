@@ -38,6 +38,62 @@ def runtests():
             return range(10, 20)  # can tail-chain into any iterable
         test[tuple(ranges()) == tuple(range(20))]
 
+    with testset("@gtrampolined(flat=True)"):
+        @gtrampolined(flat=True)
+        def ones3():
+            yield 1
+            return ones3()
+        test[tuple(take(10, ones3())) == (1,) * 10]
+        test[returns_normally(last(take(10000, ones3())))]  # no crash
+
+        # Handing off to another flat generator doesn't nest trampolines.
+        @gtrampolined(flat=True)
+        def stage(k):
+            yield k
+            if k < 3:
+                return stage(k + 1)
+        g = stage(0)
+        test[next(g) == 0]
+        test[next(g) == 1]
+        test[iter(g).gi_yieldfrom.gi_yieldfrom is None]  # the trampoline runs `stage(1)` directly
+        test[tuple(g) == (2, 3)]
+
+        # send and throw go to the generator currently running in the chain.
+        @gtrampolined(flat=True)
+        def echo():
+            x = yield
+            while x is not None:
+                x = yield x
+            return echo()  # on `None`, restart
+        g = echo()
+        next(g)
+        test[g.send(1) == 1]
+        test[g.send(None) is None]
+        test[g.send(2) == 2]
+
+        @gtrampolined(flat=True)
+        def catcher():
+            yield 1
+            return catcher2()
+        @gtrampolined(flat=True)
+        def catcher2():
+            try:
+                yield 2
+            except ValueError:
+                yield "caught"
+        g = catcher()
+        test[tuple(take(2, g)) == (1, 2)]
+        test[g.throw(ValueError) == "caught"]
+        g = catcher()
+        next(g)
+        test_raises[ValueError, g.throw(ValueError)]  # not caught by `catcher`
+
+        @gtrampolined(flat=True)
+        def ranges2():
+            yield from range(10)
+            return range(10, 20)
+        test[tuple(ranges2()) == tuple(range(20))]
+
 if __name__ == '__main__':  # pragma: no cover
     with session(__file__):
         runtests()
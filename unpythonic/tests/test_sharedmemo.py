@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+from ..syntax import macros, test, test_raises, the  # noqa: F401
+from ..test.fixtures import session, testset
+
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from ..sharedmemo import SharedMemo
+from ..fun import memoize
+
+def runtests():
+    with testset("basic usage"):
+        with SharedMemo() as store:
+            test[len(store) == 0]
+            test_raises[KeyError, store["nonexistent"]]
+            store["a"] = 1
+            store[(1, 2)] = [3, 4]
+            test[len(store) == 2]
+            test["a" in store]
+            test["b" not in the[store]]
+            test[store["a"] == 1]
+            test[store[(1, 2)] == [3, 4]]
+            store["a"] = 42  # overwrite
+            test[store["a"] == 42]
+            test[len(store) == 2]
+
+            # Attach to the same segment by name.
+            with SharedMemo(store.name) as other:
+                test[other["a"] == 42]
+                other["b"] = "from other"
+                test[store["b"] == "from other"]
+                store.clear()
+                test[len(other) == 0]
+                test["a" not in the[other]]
+            store.unlink()
+        test_raises[ValueError, store["a"]]  # closed
+
+    with testset("full store"):
+        store = SharedMemo(size=4096)
+        for k in range(100):
+            store[k] = k
+        n = len(store)
+        test[0 < n < 100]
+        test[all(store[k] == k for k in range(n))]  # what was stored is intact
+        test[n not in the[store]]  # the rest was not stored
+        store[0] = "x" * 10000  # does not fit
+        test[store[0] == 0]
+        store.clear()
+        store[0] = "y"
+        test[store[0] == "y"]
+        store.unlink()
+
+    with testset("hash collisions"):
+        store = SharedMemo(size=2**16)
+        store._hash = lambda k, _orig=store._hash: (_orig(k)[0], 0)  # everything collides
+        for k in range(20):
+            store[k] = -k
+        test[all(store[k] == -k for k in range(20))]
+        test[20 not in the[store]]
+        store.unlink()
+
+    with testset("keylock"):
+        store = SharedMemo()
+        with store.keylock("a"):
+            with store.keylock("a"):  # a process may take the same lock again
+                test[max(store._stripe_counts) == 2]
+        test[max(store._stripe_counts) == 0]
+        store.unlink()
+
+    with testset("error cases"):
+        test_raises[ValueError, SharedMemo(size=100)]
+        test_raises[ValueError, SharedMemo(stripes=0)]
+        shm = SharedMemory(create=True, size=4096)
+        test_raises[ValueError, SharedMemo(shm.name)]
+        shm.unlink()
+        os.unlink(os.path.join(tempfile.gettempdir(), f"{shm.name}.unpythonic-lock"))
+
+    with testset("attaching processes don't destroy the segment"):
+        store = SharedMemo()
+        store["a"] = 1
+        # Spawned workers, which attach to the segment by name.
+        ctx = multiprocessing.get_context("spawn")
+        workers = [ctx.Process(target=SharedMemo, args=(store.name,)) for _ in range(2)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join(60)
+        test[all(p.exitcode == 0 for p in workers)]
+        # An unrelated process, which has a resource tracker of its own.
+        toplevel = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ, PYTHONPATH=toplevel)
+        code = f"from unpythonic.sharedmemo import SharedMemo; SharedMemo({store.name!r})['b'] = 2"
+        result = subprocess.run([sys.executable, "-c", code], env=env, timeout=60)
+        test[result.returncode == 0]
+        with SharedMemo(store.name) as other:
+            test[other["a"] == 1]
+            test[other["b"] == 2]
+        store.unlink()
+
+    if "fork" not in multiprocessing.get_all_start_methods():  # pragma: no cover
+        return
+    ctx = multiprocessing.get_context("fork")
+    tmpdir = tempfile.TemporaryDirectory()
+    def evaluations(logfile):
+        with open(logfile) as f:
+            return [int(line) for line in f]
+
+    with testset("memoize across processes, each value computed once"):
+        logfile = os.path.join(tmpdir.name, "once.log")
+        store = SharedMemo()
+        @memoize(store=store)
+        def f(x):
+            fd = os.open(logfile, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+            os.write(fd, f"{x}\n".encode())
+            os.close(fd)
+            time.sleep(0.01)
+            return 2 * x
+        def worker(offset):
+            for x in range(20):
+                assert f((x + offset) % 20) == 2 * ((x + offset) % 20)
+        workers = [ctx.Process(target=worker, args=(k,)) for k in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join(60)
+        test[all(p.exitcode == 0 for p in workers)]
+        test[sorted(evaluations(logfile)) == list(range(20))]
+        test[len(store) == 20]
+        test[f(7) == 14]  # from the store
+        test[len(evaluations(logfile)) == 20]
+        store.unlink()
+
+    with testset("memoize across processes, recursive"):
+        logfile = os.path.join(tmpdir.name, "fib.log")
+        store = SharedMemo(stripes=4)  # few locks, to provoke lock cycles between processes
+        @memoize(store=store)
+        def fib(n):
+            fd = os.open(logfile, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+            os.write(fd, f"{n}\n".encode())
+            os.close(fd)
+            time.sleep(0.001)
+            return n if n < 2 else fib(n - 1) + fib(n - 2)
+        def worker(n):
+            fib(n)
+        workers = [ctx.Process(target=worker, args=(n,)) for n in (60, 45, 50, 55)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join(60)
+        test[all(p.exitcode == 0 for p in workers)]  # no deadlock
+        test[set(evaluations(logfile)) == set(range(61))]
+        test[fib(60) == 1548008755920]
+        store.unlink()
+
+    tmpdir.cleanup()
+
+if __name__ == '__main__':  # pragma: no cover
+    with session(__file__):
+        runtests()
@@ -6,10 +6,12 @@ from ..test.fixtures import session, testset, returns_normally
 from sys import stderr
 import gc
 
-from ..tco import trampolined, jump
+from ..tco import (trampolined, jump, enable_jump_debug, disable_jump_debug,
+                   enable_jump_recycling, disable_jump_recycling,
+                   _jump, _debugjump, _claim, _jump_pool)
 
 from ..ec import call_ec
-from ..fun import withself
+from ..fun import memoize, withself
 from ..let import letrec
 from ..misc import timer
 
@@ -76,8 +78,79 @@ def runtests():
             ec(42)
         test[withec == 42]
 
+    with testset("a jump is passive data"):
+        # By default, a jump record can be returned to a trampoline more than once.
+        @trampolined
+        @memoize
+        def memocountdown(n):
+            if n == 0:
+                return "done"
+            return jump(memocountdown, n - 1)
+        test[memocountdown(3) == "done"]
+        test[memocountdown(3) == "done"]  # the same, memoized, jump records again
+
+        @trampolined
+        def target(x):
+            return x
+        j0 = jump(target, 42)
+        @trampolined
+        def returnsj0():
+            return j0
+        test[returnsj0() == 42]
+        test[returnsj0() == 42]
+        test[jump(target, 23) is not j0]
+        test[j0.args == (42,)]
+
+    with testset("jump record recycling"):
+        enable_jump_recycling()
+        try:
+            # A claimed jump record goes back to the pool, and the next jump reuses it.
+            @trampolined
+            def countdown(n):
+                if n == 0:
+                    return "done"
+                return jump(countdown, n - 1)
+            test[countdown(10000) == "done"]
+            test[len(_jump_pool) > 0]
+            j1 = jump(countdown, 1)
+            test[type(j1) is _jump]
+            test[j1.target is countdown._entrypoint]  # trampoline stripped also from a recycled record
+            test[j1.args == (1,)]
+
+            # Each tail call in flight has its own record.
+            @trampolined
+            def outer(n):
+                if n == 0:
+                    return "outer done"
+                test[countdown(n) == "done"]  # nested trampoline, recycles records too
+                return jump(outer, n - 1)
+            test[outer(5) == "outer done"]
+        finally:
+            disable_jump_recycling()
+        test[len(_jump_pool) == 0]
+        test[countdown(10) == "done"]
+        test[len(_jump_pool) == 0]  # not recycled when disabled
+
+    with testset("jump debug mode"):
+        enable_jump_debug()
+        try:
+            j2 = jump(print)
+            test[type(j2) is _debugjump]
+            _claim(j2)  # handled manually, so it doesn't warn
+            @trampolined
+            def countup(n, acc=0):
+                if n == 0:
+                    return acc
+                return jump(countup, n - 1, acc + 1)
+            test[countup(1000) == 1000]  # claimed jumps print nothing
+        finally:
+            disable_jump_debug()
+        test[type(jump(print)) is _jump]
+
     with testset("error cases"):
         # Printing a warning is the best some of these cases can do, unfortunately, due to how `__del__` works.
+        # The unclaimed-jump warnings are only available in jump debug mode.
+        enable_jump_debug()
         print("*** These error cases SHOULD PRINT A WARNING:", file=stderr)
 
         print("** Attempted jump into an inert data value:", file=stderr)
@@ -101,6 +174,7 @@ def runtests():
             jump(bar2)
         foo3()
         gc.collect()  # Need to request garbage collection on PyPy, because otherwise no guarantee when it'll happen.
+        disable_jump_debug()
 
     # TODO: need some kind of benchmarking tools to do this properly.
     with testset("performance benchmark"):
@@ -3,6 +3,7 @@
 from ..syntax import macros, test, test_raises, warn  # noqa: F401
 from ..test.fixtures import session, testset
 
+import array
 import asyncio
 import collections
 import contextlib
@@ -12,7 +13,8 @@ import sys
 import typing
 
 from ..collections import frozendict
-from ..typecheck import isoftype
+from ..dynassign import dyn
+from ..typecheck import isoftype, compile_typecheck, CheckPolicy, register_arraylike
 
 def runtests():
     with testset("concrete type"):
@@ -478,6 +480,134 @@ def runtests():
         test[not isoftype(42, typing.AsyncGenerator)]
         asyncio.run(ag.aclose())  # prevent RuntimeWarning
 
+    with testset("compile_typecheck"):
+        T = typing.Dict[str, typing.List[int]]
+        pred = compile_typecheck(T)
+        test[pred({"a": [1, 2], "b": [3]})]
+        test[not pred({"a": [1, "x"]})]
+        test[not pred({1: [1]})]
+        test[not pred({})]  # empty dict has no key and value types
+        test[compile_typecheck(T) is pred]  # cached, keyed on the spec
+        test[compile_typecheck(typing.Dict[str, typing.List[int]]) is pred]  # equal spec, same predicate
+
+        # Agrees with `isoftype` (which is implemented in terms of it).
+        specs = [int, typing.Any, typing.Optional[int], typing.Union[int, str],
+                 typing.Tuple[int, ...], typing.Tuple[int, str], typing.FrozenSet[int],
+                 typing.Literal[1, "a"], typing.Type[int], typing.Callable,
+                 typing.Mapping[str, int], typing.Sequence[int], typing.AnyStr]
+        values = [1, "a", None, (1, 2), (1, "a"), (), frozenset({1}), [1, 2],
+                  {"a": 1}, int, bool, len, b"xyz"]
+        test[all(compile_typecheck(T)(v) == isoftype(v, T) for T in specs for v in values)]
+
+        # Unhashable specs are compiled each time, but still work.
+        # (`Literal` deduplicates its arguments by hashing them, so we can't use a list.)
+        class Unhashable:
+            __hash__ = None
+            def __instancecheck__(self, value):
+                return isinstance(value, int)
+        test[compile_typecheck(Unhashable())(42)]
+        test[not compile_typecheck(Unhashable())("hello")]
+
+        # Errors about the spec itself are raised at compile time.
+        class NonRuntimeProto(typing.Protocol):
+            def close(self) -> None: ...
+        test_raises[TypeError, compile_typecheck(NonRuntimeProto)]
+
+    with testset("element check policy"):
+        full = CheckPolicy("full")
+        first2 = CheckPolicy("first", k=2)
+        sample2 = CheckPolicy("sample", k=2)
+        shape = CheckPolicy("shape")
+        bad = [1, 2, "x"]
+        test[not isoftype(bad, typing.List[int], full)]
+        test[isoftype(bad, typing.List[int], first2)]
+        test[not isoftype(["x", 1, 2], typing.List[int], first2)]
+        test[isoftype(bad, typing.List[int], shape)]
+        test[not isoftype(bad, typing.Tuple[int, ...], full)]
+        test[isoftype(tuple(bad), typing.Tuple[int, ...], first2)]
+        test[not isoftype((1, "x"), typing.Tuple[int, int], shape)]  # fixed-length tuples are always checked in full
+        test[isoftype({"a": 1, "b": 2, "c": "x"}, typing.Dict[str, int], first2)]  # dicts preserve insertion order
+        test[isoftype(collections.Counter("aab"), typing.Counter[str], first2)]
+
+        # container type and nonemptiness are still checked
+        test[not isoftype((1, 2), typing.List[int], shape)]
+        test[not isoftype([], typing.List[int], shape)]
+
+        # nested containers use the same policy
+        test[isoftype([[1, 2, "x"], [3, 4], ["y"]], typing.List[typing.List[int]], first2)]
+        test[not isoftype([[1], ["x"]], typing.List[typing.List[int]], first2)]
+
+        # sampling checks k elements (here, of a sequence that is mostly bad)
+        mostlybad = [1] + ["x"] * 99
+        test[not isoftype(mostlybad, typing.List[int], sample2)]
+        test[isoftype([1, 2], typing.List[int], sample2)]  # fewer than k elements: checked in full
+        test[not isoftype([1, "x"], typing.List[int], sample2)]
+        test[isoftype({1, 2, 3}, typing.Set[int], sample2)]  # no random access; checks k elements
+
+        # dynvar
+        test[not isoftype(bad, typing.List[int])]
+        with dyn.let(typecheck_policy=shape):
+            test[isoftype(bad, typing.List[int])]
+            test[isoftype(bad, typing.List[int], full) is False]  # explicit policy wins
+            pred = compile_typecheck(typing.List[int])
+        test[not pred(bad)]  # the dynvar is looked up when the check is performed
+        test[compile_typecheck(int) is compile_typecheck(int)]
+
+        test_raises[ValueError, CheckPolicy("everything")]
+        test_raises[ValueError, CheckPolicy("first")]
+        test_raises[ValueError, CheckPolicy("first", k=0)]
+        test_raises[ValueError, CheckPolicy("full", k=3)]
+        test[CheckPolicy("first", k=3) == CheckPolicy("first", k=3)]
+        test[CheckPolicy("first", k=3) != CheckPolicy("sample", k=3)]
+
+    with testset("array-likes"):
+        a = array.array("d", [1.0, 2.0, 3.0])
+        test[isoftype(a, typing.Sequence[float])]
+        test[isoftype(a, typing.MutableSequence[typing.Union[int, float]])]
+        test[isoftype(a, typing.Sequence[typing.Any])]
+        test[not isoftype(a, typing.Sequence[int])]
+        test[isoftype(array.array("i", [1, 2]), typing.Sequence[int])]
+        test[not isoftype(array.array("i"), typing.Sequence[int])]  # empty
+        test[isoftype(memoryview(b"abc"), typing.Sequence[int])]
+        test[not isoftype(memoryview(b"abc"), typing.Sequence[bytes])]
+        test[isoftype(memoryview(b"abc").cast("c"), typing.Sequence[bytes])]
+
+        # The element type is read off the container; the elements are not walked.
+        class Vector:
+            def __init__(self, n):
+                self.n = n
+            def __len__(self):
+                return self.n
+            def __iter__(self):
+                raise RuntimeError("should not iterate")  # pragma: no cover
+            def __contains__(self, x):  # pragma: no cover
+                return False
+        register_arraylike(Vector, lambda v: float)
+        test[isoftype(Vector(10**9), typing.Collection[float])]
+        test[not isoftype(Vector(10**9), typing.Iterable[int])]
+        test[not isoftype(Vector(0), typing.Collection[float])]
+        class SubVector(Vector):
+            pass
+        test[isoftype(SubVector(3), typing.Collection[float])]  # registration applies to subclasses
+
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover
+            warn["NumPy not installed in this Python, skipping NumPy array tests."]
+        else:
+            x = numpy.linspace(0.0, 1.0, 11)  # float64, whose scalar type is a subclass of `float`
+            test[isoftype(x, typing.Collection[float])]
+            test[isoftype(x, typing.Iterable[numpy.floating])]
+            test[not isoftype(x, typing.Collection[int])]
+            test[not isoftype(x, typing.Sequence[float])]  # NumPy does not register `ndarray` as a `Sequence`
+            test[isoftype(numpy.arange(3), typing.Collection[numpy.integer])]
+            test[not isoftype(numpy.arange(3), typing.Collection[int])]  # `numpy.int64` is not an `int`
+            test[not isoftype(numpy.zeros(0), typing.Collection[float])]  # empty
+            objs = numpy.array([1, "a"], dtype=object)
+            test[isoftype(objs, typing.Collection[typing.Union[int, str]])]  # walked
+            test[not isoftype(objs, typing.Collection[int])]
+            test[isoftype(numpy.zeros((2, 3)), typing.Collection[typing.Collection[float]])]  # rows walked
+
 if __name__ == '__main__':  # pragma: no cover
     with session(__file__):
         runtests()
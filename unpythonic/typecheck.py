@@ -13,19 +13,85 @@ see `typeguard`:
     https://github.com/agronholm/typeguard
 """
 
+from abc import ABCMeta
+import array
 import collections
 import contextlib
+from functools import lru_cache
 import io
+from itertools import islice
+import random
 import re
 import sys
 import types
 import typing
 
+from .dynassign import dyn, make_dynvar
 from .misc import safeissubclass
 
-__all__ = ["isoftype"]
+__all__ = ["isoftype", "compile_typecheck", "CheckPolicy", "register_arraylike"]
 
-def isoftype(value, T):
+class CheckPolicy:
+    """How much of a container `isoftype` checks against the element type.
+
+    For specifications such as `List[T]`, `Dict[K, V]` or `Sequence[T]`, checking
+    every element is O(n). When the arguments are large, a cheaper policy lets
+    type checking stay on without dominating the cost of the call.
+
+    `mode`: one of:
+        - `"full"`: check every element. This is the default.
+        - `"first"`: check the first `k` elements.
+        - `"sample"`: check `k` elements chosen at random. Random access is only
+          used for sequences (except `collections.deque`); for other containers,
+          such as sets and mappings, this checks the first `k` elements.
+        - `"shape"`: check only the container type (and that it is nonempty,
+          as usual; an empty collection has no element type).
+
+    `k`: int, number of elements to check. Required for `"first"` and `"sample"`.
+
+    Fixed-length tuples (`Tuple[T1, T2, ..., TN]`) and `TypedDict`s are always
+    checked in full, because their size is bounded by the specification.
+    Nested containers use the same policy recursively.
+
+    The policy can be given per call (`isoftype(value, T, policy)`), per `@typed`
+    function (`@typed(policy=...)`), or for a dynamic extent, by setting the
+    dynvar `typecheck_policy`::
+
+        with dyn.let(typecheck_policy=CheckPolicy("first", k=10)):
+            ...
+
+    Note that a partial check may accept a value that a full check would reject.
+    For multiple dispatch, this means that e.g. with `"shape"`, any nonempty list
+    matches `List[int]`.
+    """
+    __slots__ = ("mode", "k")
+    _modes = ("full", "first", "sample", "shape")
+
+    def __init__(self, mode="full", k=None):
+        if mode not in self._modes:
+            raise ValueError(f"Unknown mode {repr(mode)}; expected one of {self._modes}")
+        if mode in ("first", "sample"):
+            if not isinstance(k, int) or k < 1:
+                raise ValueError(f"Mode {repr(mode)} needs a positive int `k`, got {repr(k)}")
+        elif k is not None:
+            raise ValueError(f"Mode {repr(mode)} does not take `k`, got {repr(k)}")
+        self.mode = mode
+        self.k = k
+
+    def __eq__(self, other):
+        if not isinstance(other, CheckPolicy):
+            return NotImplemented
+        return self.mode == other.mode and self.k == other.k
+    def __hash__(self):
+        return hash((self.mode, self.k))
+    def __repr__(self):  # pragma: no cover
+        if self.k is None:
+            return f"CheckPolicy({repr(self.mode)})"
+        return f"CheckPolicy({repr(self.mode)}, k={self.k})"
+
+make_dynvar(typecheck_policy=CheckPolicy("full"))
+
+def isoftype(value, T, policy=None):
     """Perform a type check at run time.
 
     Like `isinstance`, but check `value` against a *type specification* `T`.
@@ -74,13 +140,120 @@ def isoftype(value, T):
                Any checks on the type arguments of the meta-utilities are performed
                recursively using `isoftype`, in order to allow compound specifications.
 
+               How many elements of a container are checked is determined by `policy`.
+
                Additionally, the following meta-utilities also work, because the
                `typing` module automatically normalizes them into supported ones:
 
                  - `Optional[T]` (becomes `Union[T, NoneType]`)
                  - `AnyStr` (becomes `TypeVar("AnyStr", str, bytes)`)
 
+        policy: `CheckPolicy`, how much of a container to check against the element
+                type. If `None`, the current value of the dynvar `typecheck_policy`
+                is used; by default, every element is checked.
+
+    For array-like values, whose elements are all of the same concrete type
+    (e.g. NumPy arrays, `array.array`, `memoryview`), the check against a
+    plain element type is done in O(1), using the dtype, typecode or format.
+    See `register_arraylike`.
+
     Returns `True` if `value` matches the type specification; `False` if not.
+
+    This is a shorthand for `compile_typecheck(T, policy)(value)`. If you check many
+    values against the same `T`, you can also get the predicate once and call it directly.
+    """
+    return compile_typecheck(T, policy)(value)
+
+# How many compiled predicates to keep in the cache of `compile_typecheck`.
+_typecheck_cache_size = 1024
+
+def compile_typecheck(T, policy=None):
+    """Compile the type specification `T` into a predicate.
+
+    Return a function `pred(value) -> bool`, where `pred(value)` is equivalent to
+    `isoftype(value, T, policy)`. See `isoftype` for the supported features of `typing`.
+
+    The analysis of `T` (what kind of specification it is, and recursively, what its
+    type arguments are) is done once, here; the predicate then only checks values.
+    For compound specifications, such as `Dict[str, List[int]]`, this saves most
+    of the cost of a check.
+
+    If `policy` is `None`, and `T` has container element checks, the predicate
+    looks up the dynvar `typecheck_policy` each time it is called.
+
+    The predicates are cached (LRU), keyed on `T` and `policy`, so calling `compile_typecheck`
+    again for an equal specification is cheap. An unhashable `T` (e.g. `Literal`
+    with an unhashable value) is compiled each time.
+
+    Raises `TypeError` if `T` is a `Protocol` that is not `@runtime_checkable`,
+    and `NotImplementedError` if `T` uses a `typing` feature that is not supported.
+    """
+    try:
+        hash(T)
+    except TypeError:
+        return _compile_typecheck(T, policy)
+    return _cached_compile_typecheck(T, policy)
+
+def _true(value):
+    return True
+
+def _false(value):
+    return False
+
+class _PolicyDependent(Exception):
+    """Raised while compiling with `policy=None`, when the predicate depends on the policy."""
+
+def _element_selector(policy):
+    """Return a function that selects the elements of a container to check, according to `policy`.
+
+    The container is assumed nonempty and `Sized`.
+
+    Raises `_PolicyDependent` if `policy` is `None`.
+    """
+    if policy is None:
+        raise _PolicyDependent
+    mode, k = policy.mode, policy.k
+    if mode == "full":
+        return lambda value: value
+    if mode == "shape":
+        return _select_none
+    if mode == "first":
+        return lambda value: islice(value, k)
+    def select(value):  # "sample"
+        n = len(value)
+        if n <= k:
+            return value
+        if isinstance(value, collections.abc.Sequence) and not isinstance(value, collections.deque):
+            return (value[j] for j in sorted(random.sample(range(n), k)))
+        return islice(value, k)
+    return select
+
+def _element_selector_for(policy, *predicates):
+    """Like `_element_selector`, but if all element `predicates` accept anything, select nothing."""
+    if all(pred is _true for pred in predicates):
+        return _select_none
+    return _element_selector(policy)
+
+def _select_none(value):
+    return ()
+
+def _compile_typecheck(T, policy):
+    """Compile `T` into a predicate, without caching. See `compile_typecheck`."""
+    if policy is not None:
+        return _compile_typecheck_with(T, policy)
+    try:
+        return _compile_typecheck_with(T, None)
+    except _PolicyDependent:
+        # `T` checks container elements, so the predicate depends on the policy.
+        # Look it up when the check is performed, once per top-level container.
+        def check(value):
+            return compile_typecheck(T, dyn.typecheck_policy)(value)
+        return check
+
+def _compile_typecheck_with(T, policy):
+    """Compile `T` into a predicate, with element checks following `policy`.
+
+    If `policy` is `None`, raise `_PolicyDependent` upon reaching an element check.
     """
     # Many `typing` meta-utilities explicitly raise TypeError from isinstance/issubclass,
     # so we identify them via typing.get_origin, isinstance checks, or identity comparisons.
@@ -90,63 +263,67 @@ def isoftype(value, T):
     # Unsupported typing features:
     #   NamedTuple (specific NamedTuple subclasses work via isinstance fallback),
     #   Generic, ForwardRef
+    #
+    # This function analyzes `T`, and returns a closure that performs the check
+    # for a given value. Type arguments are compiled recursively, via the cache.
 
     if T is typing.Any:
-        return True
+        return _true
 
     # NoReturn means a function never returns — no value has this type.
     # Never (3.11+) is the bottom type; semantically the same for our purposes.
     if T is typing.NoReturn:
-        return False
+        return _false
     if sys.version_info >= (3, 11) and T is typing.Never:
-        return False
+        return _false
 
     # AnyStr normalizes to TypeVar("AnyStr", str, bytes)
     if isinstance(T, typing.TypeVar):
         if not T.__constraints__:  # just an abstract type name
-            return True
-        return any(isoftype(value, U) for U in T.__constraints__)
+            return _true
+        return _anyof([compile_typecheck(U, policy) for U in T.__constraints__])
+
+    origin = typing.get_origin(T)
 
     # typing.Union[X, Y] and the builtin X | Y syntax (types.UnionType, Python 3.10+).
     # Optional[X] normalizes to Union[X, NoneType].
-    if typing.get_origin(T) is typing.Union or isinstance(T, types.UnionType):
-        return any(isoftype(value, U) for U in T.__args__)
+    if origin is typing.Union or isinstance(T, types.UnionType):
+        return _anyof([compile_typecheck(U, policy) for U in T.__args__])
 
     # Bare typing.Union; empty, has no types in it, so no value can match.
     if T is typing.Union:
-        return False  # pragma: no cover
+        return _false  # pragma: no cover
 
-    def isNewType(T):
-        return isinstance(T, typing.NewType)
-    if isNewType(T):
+    if isinstance(T, typing.NewType):
         # This is the best we can do, because the static types created by `typing.NewType`
         # have a constructor that discards the type information at runtime:
         #   UserId = typing.NewType("UserId", int)
         #   i = UserId(42)  # UserId is the identity function, as per `typing` module docs
         #   print(type(i))  # int
-        return isinstance(value, T.__supertype__)
+        supertype = T.__supertype__
+        return lambda value: isinstance(value, supertype)
 
     # Literal[v1, v2, ...] — value must be one of the listed constants.
-    if typing.get_origin(T) is typing.Literal:
-        return value in T.__args__
+    if origin is typing.Literal:
+        literals = T.__args__
+        return lambda value: value in literals
 
     # Type[X] — value must be a class that is X or a subclass of X.
-    if typing.get_origin(T) is type:
-        if not isinstance(value, type):
-            return False
+    if origin is type:
         args = getattr(T, "__args__", None)
         if args is None:
-            return True  # bare Type, any class matches
-        return issubclass(value, args[0])
+            return lambda value: isinstance(value, type)  # bare Type, any class matches
+        X = args[0]
+        return lambda value: isinstance(value, type) and issubclass(value, X)
 
     # ClassVar[T] and Final[T] — these are declaration wrappers. At runtime,
     # we just strip the wrapper and check the inner type.
     for wrapper_origin in (typing.ClassVar, typing.Final):
-        if typing.get_origin(T) is wrapper_origin:
+        if origin is wrapper_origin:
             args = getattr(T, "__args__", None)
             if args is None:
-                return True  # bare ClassVar or Final, no inner type constraint
-            return isoftype(value, args[0])
+                return _true  # bare ClassVar or Final, no inner type constraint
+            return compile_typecheck(args[0], policy)
 
     # Non-generic ABCs, and parametric ABCs where element type can't be checked.
     # Iterator: consumed by iteration. Container: only has __contains__, can't enumerate.
@@ -155,8 +332,8 @@ def isoftype(value, T):
                 collections.abc.Sized,
                 collections.abc.Iterator,
                 collections.abc.Container):
-        if typing.get_origin(T) is abc:
-            return isinstance(value, abc)
+        if origin is abc:
+            return _isinstanceof(abc)
 
     # Parametric ABCs with best-effort element checking.
     # If the value is Sized (a concrete collection), we can safely iterate
@@ -164,19 +341,27 @@ def isoftype(value, T):
     for abc in (collections.abc.Iterable,
                 collections.abc.Collection,
                 collections.abc.Reversible):
-        if typing.get_origin(T) is abc:
-            if not isinstance(value, abc):
-                return False
+        if origin is abc:
             args = getattr(T, "__args__", None)
             if args is None:
-                return True  # bare form, no element type constraint
+                return _isinstanceof(abc)  # bare form, no element type constraint
             assert len(args) == 1
-            if not isinstance(value, collections.abc.Sized):
-                return True  # opaque iterator — can't check elements non-destructively
-            if not value:  # empty sized collection has no element type
-                return False
-            U = args[0]
-            return all(isoftype(elt, U) for elt in value)
+            iselement = compile_typecheck(args[0], policy)
+            select = _element_selector_for(policy, iselement)
+            accepts = _compile_element_type_check(args[0], select)
+            def check(value, abc=abc):
+                if not isinstance(value, abc):
+                    return False
+                if not isinstance(value, collections.abc.Sized):
+                    return True  # opaque iterator — can't check elements non-destructively
+                if not len(value):  # empty sized collection has no element type (`len`, because NumPy arrays have no truth value)
+                    return False
+                if accepts is not None:
+                    E = _arraylike_element_type(value)
+                    if E is not None:
+                        return accepts(E)
+                return all(iselement(elt) for elt in select(value))
+            return check
 
     # "Protocols cannot be used with isinstance()", so:
     for U in (typing.SupportsInt,
@@ -187,68 +372,68 @@ def isoftype(value, T):
               typing.SupportsAbs,
               typing.SupportsRound):
         if U is T:
-            return safeissubclass(type(value), U)
+            return lambda value, U=U: safeissubclass(type(value), U)
 
     # TypedDict — structural check on dict contents.
     # isinstance doesn't work with TypedDict, so we check keys and value types.
     if typing.is_typeddict(T):
-        if not isinstance(value, dict):
-            return False
-        hints = typing.get_type_hints(T)
+        checkers = {k: compile_typecheck(U, policy) for k, U in typing.get_type_hints(T).items()}
         required = T.__required_keys__
         optional = T.__optional_keys__
         allowed = required | optional
-        if not required.issubset(value.keys()):
-            return False
-        if not set(value.keys()).issubset(allowed):
-            return False
-        return all(isoftype(v, hints[k]) for k, v in value.items())
+        def check(value):
+            if not isinstance(value, dict):
+                return False
+            if not required.issubset(value.keys()):
+                return False
+            if not set(value.keys()).issubset(allowed):
+                return False
+            return all(checkers[k](v) for k, v in value.items())
+        return check
 
     # We don't have a match yet, so T might still be one of those meta-utilities
     # that hate `issubclass` with a passion.
     # DEPRECATED: typing.Text is deprecated since Python 3.11 (it's just an alias for str).
     # TODO: Remove this branch when the floor bumps to Python 3.12.
     if safeissubclass(T, typing.Text):
-        return isinstance(value, str)
+        return _isinstanceof(str)
 
     # IO, TextIO, BinaryIO — typing module stubs that don't participate in the
     # MRO of real IO classes. Map to the io module ABCs instead.
     # IO[str] → TextIO, IO[bytes] → BinaryIO when parametric.
-    if T is typing.IO or typing.get_origin(T) is typing.IO:
+    if T is typing.IO or origin is typing.IO:
         args = getattr(T, "__args__", None)
         if args is not None:
             if args[0] is str:
-                return isinstance(value, io.TextIOBase)
+                return _isinstanceof(io.TextIOBase)
             if args[0] is bytes:
-                return isinstance(value, (io.RawIOBase, io.BufferedIOBase))
-        return isinstance(value, io.IOBase)
+                return _isinstanceof((io.RawIOBase, io.BufferedIOBase))
+        return _isinstanceof(io.IOBase)
     if T is typing.TextIO:
-        return isinstance(value, io.TextIOBase)
+        return _isinstanceof(io.TextIOBase)
     if T is typing.BinaryIO:
-        return isinstance(value, (io.RawIOBase, io.BufferedIOBase))
+        return _isinstanceof((io.RawIOBase, io.BufferedIOBase))
 
     # Pattern[T] and Match[T] — the type arg (str or bytes) can be checked.
-    if typing.get_origin(T) is re.Pattern:
-        if not isinstance(value, re.Pattern):
-            return False
+    if origin is re.Pattern:
         args = getattr(T, "__args__", None)
         if args is not None:
-            return isinstance(value.pattern, args[0])
-        return True
-    if typing.get_origin(T) is re.Match:
-        if not isinstance(value, re.Match):
-            return False
+            A = args[0]
+            return lambda value: isinstance(value, re.Pattern) and isinstance(value.pattern, A)
+        return _isinstanceof(re.Pattern)
+    if origin is re.Match:
         args = getattr(T, "__args__", None)
         if args is not None:
-            return isinstance(value.string, args[0])
-        return True
+            A = args[0]
+            return lambda value: isinstance(value, re.Match) and isinstance(value.string, A)
+        return _isinstanceof(re.Match)
 
     # ContextManager and AsyncContextManager — can't check the return type
     # of __enter__ non-destructively, so just check the ABC.
-    if typing.get_origin(T) is contextlib.AbstractContextManager:
-        return isinstance(value, contextlib.AbstractContextManager)
-    if typing.get_origin(T) is contextlib.AbstractAsyncContextManager:
-        return isinstance(value, contextlib.AbstractAsyncContextManager)
+    if origin is contextlib.AbstractContextManager:
+        return _isinstanceof(contextlib.AbstractContextManager)
+    if origin is contextlib.AbstractAsyncContextManager:
+        return _isinstanceof(contextlib.AbstractAsyncContextManager)
 
     # Async ABCs and generator types — type parameters (yield, send, return)
     # can't be checked non-destructively, so just check the ABC.
@@ -258,52 +443,68 @@ def isoftype(value, T):
                         collections.abc.AsyncIterator,
                         collections.abc.Generator,
                         collections.abc.AsyncGenerator):
-        if typing.get_origin(T) is runtimetype:
-            return isinstance(value, runtimetype)
+        if origin is runtimetype:
+            return _isinstanceof(runtimetype)
 
-    if typing.get_origin(T) is tuple:
-        if not isinstance(value, tuple):
-            return False
+    if origin is tuple:
+        args = getattr(T, "__args__", None)
         # bare `typing.Tuple`, no restrictions on length or element type.
-        if not getattr(T, "__args__", None):
-            return True
+        if not args:
+            return _isinstanceof(tuple)
         # homogeneous element type, arbitrary length
-        if len(T.__args__) == 2 and T.__args__[1] is Ellipsis:
-            if not value:  # no elements
-                # An empty tuple has no element type, so to make multiple dispatch
-                # behave predictably (so it doesn't guess), we must reject it.
-                return False
-            U = T.__args__[0]
-            return all(isoftype(elt, U) for elt in value)
+        if len(args) == 2 and args[1] is Ellipsis:
+            iselement = compile_typecheck(args[0], policy)
+            select = _element_selector_for(policy, iselement)
+            def check(value):
+                if not isinstance(value, tuple):
+                    return False
+                if not value:  # no elements
+                    # An empty tuple has no element type, so to make multiple dispatch
+                    # behave predictably (so it doesn't guess), we must reject it.
+                    return False
+                return all(iselement(elt) for elt in select(value))
+            return check
         # heterogeneous element types, exact length
-        if len(value) != len(T.__args__):
-            return False
-        return all(isoftype(elt, U) for elt, U in zip(value, T.__args__))
+        iselements = [compile_typecheck(U, policy) for U in args]
+        n = len(iselements)
+        def check(value):
+            if not isinstance(value, tuple):
+                return False
+            if len(value) != n:
+                return False
+            return all(iselement(elt) for elt, iselement in zip(value, iselements))
+        return check
 
     # Check mapping types that allow non-destructive iteration.
     def ismapping(runtimetype):
-        if not isinstance(value, runtimetype):
-            return False
         args = getattr(T, "__args__", None)
         if args is None:
             args = (typing.TypeVar("KT"), typing.TypeVar("VT"))
         assert len(args) == 2
-        if not value:  # An empty dict has no key and value types.
-            return False
-        K, V = args
-        return all(isoftype(k, K) and isoftype(v, V) for k, v in value.items())
+        iskey, isvalue = (compile_typecheck(U, policy) for U in args)
+        select = _element_selector_for(policy, iskey, isvalue)
+        def check(value):
+            if not isinstance(value, runtimetype):
+                return False
+            if not value:  # An empty dict has no key and value types.
+                return False
+            return all(iskey(k) and isvalue(v) for k, v in select(value.items()))
+        return check
     # Counter[T] is a mapping (keys: T, values: int), but has only one type arg.
-    if typing.get_origin(T) is collections.Counter:
-        if not isinstance(value, collections.Counter):
-            return False
+    if origin is collections.Counter:
         args = getattr(T, "__args__", None)
         if args is None:
             args = (typing.TypeVar("T"),)
         assert len(args) == 1
-        if not value:
-            return False
-        U = args[0]
-        return all(isoftype(k, U) and isinstance(v, int) for k, v in value.items())
+        iskey = compile_typecheck(args[0], policy)
+        select = _element_selector(policy)  # the values are always checked
+        def check(value):
+            if not isinstance(value, collections.Counter):
+                return False
+            if not value:
+                return False
+            return all(iskey(k) and isinstance(v, int) for k, v in select(value.items()))
+        return check
 
     for runtimetype in (dict,
                         collections.defaultdict,
@@ -311,22 +512,25 @@ def isoftype(value, T):
                         collections.ChainMap,
                         collections.abc.MutableMapping,
                         collections.abc.Mapping):
-        if typing.get_origin(T) is runtimetype:
+        if origin is runtimetype:
             return ismapping(runtimetype)
 
     # ItemsView is a special-case mapping in that we must not call
     # `.items()` on `value`.
-    if typing.get_origin(T) is collections.abc.ItemsView:
-        if not isinstance(value, collections.abc.ItemsView):
-            return False
+    if origin is collections.abc.ItemsView:
         args = getattr(T, "__args__", None)
         if args is None:
             args = (typing.TypeVar("KT"), typing.TypeVar("VT"))
         assert len(args) == 2
-        if not value:  # An empty dict has no key and value types.
-            return False
-        K, V = args
-        return all(isoftype(k, K) and isoftype(v, V) for k, v in value)
+        iskey, isvalue = (compile_typecheck(U, policy) for U in args)
+        select = _element_selector_for(policy, iskey, isvalue)
+        def check(value):
+            if not isinstance(value, collections.abc.ItemsView):
+                return False
+            if not value:  # An empty dict has no key and value types.
+                return False
+            return all(iskey(k) and isvalue(v) for k, v in select(value))
+        return check
 
     # Check iterable types that allow non-destructive iteration.
     #
@@ -335,8 +539,6 @@ def isoftype(value, T):
     # them.
     if T not in (str, bytes):
         def iscollection(statictype, runtimetype):
-            if not isinstance(value, runtimetype):
-                return False
             if typing.get_origin(statictype) is collections.abc.ByteString:
                 # DEPRECATED: typing.ByteString is deprecated since Python 3.12.
                 # TODO: Remove this branch and the ByteString entry in the loop below
@@ -353,10 +555,20 @@ def isoftype(value, T):
             # Judging by the docs, List takes one type argument. The rest are similar.
             # https://docs.python.org/3/library/typing.html#typing.List
             assert len(typeargs) == 1
-            if not value:  # An empty collection has no element type.
-                return False
-            U = typeargs[0]
-            return all(isoftype(elt, U) for elt in value)
+            iselement = compile_typecheck(typeargs[0], policy)
+            select = _element_selector_for(policy, iselement)
+            accepts = _compile_element_type_check(typeargs[0], select)
+            def check(value):
+                if not isinstance(value, runtimetype):
+                    return False
+                if not len(value):  # An empty collection has no element type.
+                    return False
+                if accepts is not None:
+                    E = _arraylike_element_type(value)
+                    if E is not None:
+                        return accepts(E)
+                return all(iselement(elt) for elt in select(value))
+            return check
         for statictype, runtimetype in ((typing.List, list),
                                         (typing.FrozenSet, frozenset),
                                         (typing.Set, set),
@@ -372,11 +584,11 @@ def isoftype(value, T):
                                         (typing.MutableSequence, collections.abc.MutableSequence),
                                         (typing.MappingView, collections.abc.MappingView),
                                         (typing.Sequence, collections.abc.Sequence)):
-            if typing.get_origin(T) is runtimetype:
+            if origin is runtimetype:
                 return iscollection(statictype, runtimetype)
 
-    if typing.get_origin(T) is collections.abc.Callable:
-        return callable(value)
+    if origin is collections.abc.Callable:
+        return callable
         # # TODO: analyze Callable[[a0, a1, ...], ret], Callable[..., ret].
         # if T.__args__ is None:  # bare `typing.Callable`, no restrictions on arg/return types.
         #     return True
@@ -409,7 +621,7 @@ def isoftype(value, T):
     # True for some non-Protocol types (e.g. int) on Python 3.10.
     if isinstance(T, type) and T is not typing.Protocol and getattr(T, '_is_protocol', False):
         if getattr(T, '_is_runtime_protocol', False):
-            return isinstance(value, T)
+            return _isinstanceof(T)
         raise TypeError(
             f"isoftype: {T.__qualname__} is a Protocol but not @typing.runtime_checkable, "
             f"so runtime structural checks are not possible. "
@@ -420,10 +632,159 @@ def isoftype(value, T):
         fullname = repr(T.__class__)
         raise NotImplementedError(f"This run-time type checker doesn't currently support {repr(fullname)}")
 
+    def check(value):
+        try:
+            return isinstance(value, T)  # T should be a concrete class, so delegate.
+        except TypeError as err:  # pragma: no cover, for debugging when things go wrong
+            raise NotImplementedError(f"Failed to understand the type, so here's some debug data: {type(T)}, {repr(T.__class__)}, {str(T)}, {repr(T)}") from err
+    return check
+
+_cached_compile_typecheck = lru_cache(maxsize=_typecheck_cache_size)(_compile_typecheck)
+
+def _isinstanceof(cls_or_tuple):
+    """Return a predicate that checks `isinstance(value, cls_or_tuple)`."""
+    return lambda value: isinstance(value, cls_or_tuple)
+
+def _anyof(predicates):
+    """Return a predicate that checks whether any of `predicates` accepts the value."""
+    return lambda value: any(pred(value) for pred in predicates)
+
+def _is_type_determined(T):
+    """Return whether `isoftype(value, T)` depends only on `type(value)`.
+
+    This holds for `typing.Any`, for plain classes whose metaclass does not
+    customize `isinstance` beyond what `type` and `abc.ABCMeta` do, and for
+    unions of such types.
+
+    It does not hold for parametric specifications like `List[int]` (the concrete
+    type `list` does not tell anything about the elements), nor for `Literal`,
+    nor for structural checks such as `TypedDict` and `Protocol`.
+    """
+    if T is typing.Any:
+        return True
+    if typing.get_origin(T) is typing.Union or isinstance(T, types.UnionType):
+        return all(_is_type_determined(U) for U in T.__args__)
+    if not isinstance(T, type):  # `List[int]`, `Literal[...]`, `TypeVar`, ...
+        return False
+    if T.__module__ == "typing":  # `typing.IO` and friends get special handling in `isoftype`
+        return False
+    if getattr(T, "_is_protocol", False) or typing.is_typeddict(T):
+        return False
+    return type(T).__instancecheck__ in (type.__instancecheck__, ABCMeta.__instancecheck__)
+
+def _type_accepts(T, E):
+    """Return whether `isoftype(x, T)` holds for an `x` of concrete type `E`.
+
+    `T` must be type-determined; see `_is_type_determined`.
+    """
+    if T is typing.Any:
+        return True
+    if typing.get_origin(T) is typing.Union or isinstance(T, types.UnionType):
+        return any(_type_accepts(U, E) for U in T.__args__)
+    return issubclass(E, T)
+
+def _compile_element_type_check(T, select):
+    """Return a function `accepts(E)` for the element specification `T` of an array-like, or `None`.
+
+    `None` means that the O(1) check does not apply: either `T` is not type-determined,
+    or `select` (see `_element_selector`) does not check the elements at all.
+    """
+    if select is _select_none or not _is_type_determined(T):
+        return None
+    return lambda E: _type_accepts(T, E)
+
+# --------------------------------------------------------------------------------
+# Array-likes: containers whose elements are all of the same concrete type,
+# which can be read off the container in O(1).
+
+# registered class -> function `element_type(value) -> type or None`
+_arraylike_handlers = {}
+# concrete class -> handler, or `None` if not an array-like (filled in lazily)
+_arraylike_lookup_cache = {}
+
+def register_arraylike(cls, element_type):
+    """Register `cls` as an array-like type for `isoftype`.
+
+    `element_type`: function `element_type(value) -> type or None`. If every element
+                    that iterating over `value` produces is of the same concrete
+                    type, return that type; otherwise, or if not known, return `None`.
+
+    When the element specification is a plain class (or `Any`, or a `Union` of
+    such), `isoftype` then checks a nonempty instance of `cls` against e.g.
+    `Sequence[float]` in O(1), by checking the element type, instead of walking
+    over the elements. When `element_type` returns `None`, the elements are walked,
+    as usual.
+
+    The registration applies to subclasses of `cls`, too. Note that the container
+    type itself is still checked as usual; e.g. NumPy does not register `ndarray`
+    as a `collections.abc.Sequence`, so a NumPy array matches `Collection[float]`
+    and `Iterable[float]`, but not `Sequence[float]`.
+
+    Built in are `array.array`, one-dimensional `memoryview`s of the native
+    single-item formats, and one-dimensional NumPy arrays of any dtype except
+    `object`. NumPy support activates automatically once NumPy has been imported;
+    `unpythonic` does not import it.
+
+    Example::
+
+        register_arraylike(MyVector, lambda v: float)
+    """
+    _arraylike_handlers[cls] = element_type
+    _arraylike_lookup_cache.clear()
+
+def _arraylike_element_type(value):
+    """Return the common concrete type of the elements of `value`, or `None`."""
+    cls = type(value)
     try:
-        return isinstance(value, T)  # T should be a concrete class, so delegate.
-    except TypeError as err:  # pragma: no cover, for debugging when things go wrong
-        raise NotImplementedError(f"Failed to understand the type, so here's some debug data: {type(T)}, {repr(T.__class__)}, {str(T)}, {repr(T)}") from err
+        handler = _arraylike_lookup_cache[cls]
+    except KeyError:
+        handler = _arraylike_lookup_cache[cls] = _find_arraylike_handler(cls)
+    if handler is None:
+        return None
+    return handler(value)
+
+def _find_arraylike_handler(cls):
+    if "numpy" in sys.modules and not _numpy_registered:
+        _register_numpy()
+    for base in cls.__mro__:
+        if base in _arraylike_handlers:
+            return _arraylike_handlers[base]
+    return None
+
+# Element types of `array.array` typecodes, and of `struct` format characters
+# supported by `memoryview` for item access.
+_typecode_element_types = {**{c: int for c in "bBhHiIlLqQ"},
+                           **{c: float for c in "fd"},
+                           **{c: str for c in "uw"}}
+_format_element_types = {**{c: int for c in "bBhHiIlLqQnNP"},
+                         **{c: float for c in "efd"},
+                         "?": bool,
+                         "c": bytes}
+
+def _array_element_type(value):
+    return _typecode_element_types.get(value.typecode, None)
+
+def _memoryview_element_type(value):
+    if value.ndim != 1:
+        return None
+    fmt = value.format
+    if fmt.startswith("@"):  # native byte order, size and alignment; the default
+        fmt = fmt[1:]
+    return _format_element_types.get(fmt, None)
+
+register_arraylike(array.array, _array_element_type)
+register_arraylike(memoryview, _memoryview_element_type)
+
+_numpy_registered = False
+def _register_numpy():
+    global _numpy_registered
+    _numpy_registered = True
+    numpy = sys.modules["numpy"]
+    def _ndarray_element_type(value):
+        if value.ndim != 1 or value.dtype.kind == "O":  # object arrays can contain anything
+            return None
+        return value.dtype.type  # iterating gives NumPy scalars, e.g. `numpy.float64`
+    register_arraylike(numpy.ndarray, _ndarray_element_type)
 
 # TODO: Add an `issubtype` function. It's needed to fully resolve callable types in `isoftype`.
 #